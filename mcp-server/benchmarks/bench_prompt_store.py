@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark compressed, section-shared and lazily loaded prompt storage
+against plain text.
+
+Loads a specs directory with each storage mode and reports the memory
+retained by each collection and its load time. It then reads every
+compressed and lazy prompt twice to report the compression ratio and the
+decompression and load latency.
+
+Usage:
+    python benchmarks/bench_prompt_store.py [specs_dir] [hot_bytes]
+"""
+
+import gc
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Optional
+
+# Add the src directory to the path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from lia_workflow_mcp.compression import DEFAULT_HOT_BYTES, PromptStore
+from lia_workflow_mcp.lazy import LazyPrompts
+from lia_workflow_mcp.models import SpecCollection
+from lia_workflow_mcp.sections import SectionStore
+
+DEFAULT_SPECS_DIR = Path(__file__).parent.parent.parent / "specs"
+
+
+def load(
+    specs_dir: Path,
+    store: Optional[PromptStore] = None,
+    sections: Optional[SectionStore] = None,
+    lazy_bytes: Optional[int] = None,
+) -> tuple[SpecCollection, int, float]:
+    """Load a collection, returning it, the bytes it retains and the seconds taken."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    collection = SpecCollection(prompt_store=store, section_store=sections)
+    if lazy_bytes is not None:
+        collection.lazy_prompts = LazyPrompts(collection.read_prompt, lazy_bytes)
+    start = time.perf_counter()
+    collection.load_from_directory(specs_dir)
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return collection, retained, elapsed
+
+
+def main() -> None:
+    specs_dir = Path(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SPECS_DIR
+    hot_bytes = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_HOT_BYTES
+
+    plain, plain_bytes, plain_seconds = load(specs_dir)
+    shared, shared_bytes, shared_seconds = load(specs_dir, sections=SectionStore())
+    compressed, compressed_bytes, compressed_seconds = load(specs_dir, PromptStore(hot_bytes))
+    lazy, lazy_bytes, lazy_seconds = load(specs_dir, lazy_bytes=hot_bytes)
+    print(f"specs: {len(plain.specs)}")
+    print(f"{'mode':>16}  {'retained (KiB)':>14}  {'load (ms)':>9}")
+    for label, retained, seconds in [
+        ("plain", plain_bytes, plain_seconds),
+        ("shared sections", shared_bytes, shared_seconds),
+        ("compressed", compressed_bytes, compressed_seconds),
+        ("lazy", lazy_bytes, lazy_seconds),
+    ]:
+        print(f"{label:>16}  {retained / 1024:>14.1f}  {seconds * 1000:>9.1f}")
+    section_stats = shared.section_store.stats()
+    print(
+        f"sections: {section_stats['sections']} stored, "
+        f"{section_stats['stored_chars']} of {section_stats['referenced_chars']} chars kept"
+    )
+
+    for _ in range(2):
+        for spec in compressed.specs:
+            spec.prompt
+    stats = compressed.prompt_store.stats()
+    print(f"ratio: {stats['ratio']}  (dictionary {stats['dictionary_bytes']} bytes)")
+    print(
+        f"decompressions: {stats['decompressions']}  "
+        f"mean {stats['mean_decompress_us']} µs  max {stats['max_decompress_us']} µs  "
+        f"hot hits: {stats['hot']['hits']}"
+    )
+
+    for _ in range(2):
+        for spec in lazy.specs:
+            spec.prompt
+    stats = lazy.lazy_prompts.stats()
+    print(
+        f"lazy loads: {stats['loads']} ({stats['parses']} by parsing)  "
+        f"mean {stats['mean_load_us']} µs  max {stats['max_load_us']} µs  "
+        f"resident hits: {stats['resident']['hits']}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Benchmark quick reference generation against library size.
+
+Builds synthetic spec collections of increasing size and times
+`generate_quick_reference`. With single-pass generation the time per spec
+should stay roughly constant as the library grows.
+
+Usage:
+    python benchmarks/bench_quick_reference.py [sizes...]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Add the src directory to the path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from lia_workflow_mcp.models import SpecCategory, WorkflowSpec
+from lia_workflow_mcp.server import generate_quick_reference, spec_collection
+
+DEFAULT_SIZES = [1_000, 10_000]
+CATEGORIES = list(SpecCategory)
+
+
+def make_specs(count: int) -> list[WorkflowSpec]:
+    """Create `count` synthetic specs spread across all categories."""
+    return [
+        WorkflowSpec(
+            name=f"spec-{i:05d}",
+            filename=f"spec-{i:05d}.toml",
+            filepath=Path(f"/tmp/spec-{i:05d}.toml"),
+            category=CATEGORIES[i % len(CATEGORIES)],
+            description=f"Synthetic workflow number {i} used for benchmarking the quick reference",
+            body="",
+        )
+        for i in range(count)
+    ]
+
+
+def time_generation(count: int, repeats: int = 3) -> float:
+    """Return the best generation time in seconds for `count` specs."""
+    spec_collection.specs = make_specs(count)
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        generate_quick_reference()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    print(f"{'specs':>8}  {'total (ms)':>10}  {'per spec (µs)':>13}")
+    for count in sizes:
+        elapsed = time_generation(count)
+        print(f"{count:>8}  {elapsed * 1000:>10.2f}  {elapsed / count * 1e6:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmark the memory footprint of loaded spec models.
+
+Builds synthetic specs, metadata and triggers the way the loaders do, from
+freshly parsed strings, and reports the bytes retained per instance as
+measured by tracemalloc. Prompt bodies are left empty so the figures cover
+the model structure: fields, phases, tags and other categorical strings.
+
+Usage:
+    python benchmarks/bench_spec_memory.py [count]
+"""
+
+import gc
+import sys
+import tracemalloc
+from pathlib import Path
+from typing import Callable
+
+# Add the src directory to the path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from lia_workflow_mcp.models import SpecCategory, WorkflowPhase, WorkflowSpec
+from lia_workflow_mcp.triggers import WorkflowTrigger
+from workflow_specs_mcp.spec_loader import SpecMetadata
+
+DEFAULT_COUNT = 2_000
+CATEGORIES = list(SpecCategory)
+PHASE_NAMES = ["Task Analysis", "Design", "Implementation", "Testing", "Review", "Handover"]
+TAGS = ["development", "testing", "review", "security", "documentation"]
+WORKFLOWS = ["spec", "dev", "test", "review", "docs"]
+
+
+def parsed(text: str) -> str:
+    """Copy a string, as parsing a file yields a new object each time."""
+    return "".join(list(text))
+
+
+def make_spec(i: int) -> WorkflowSpec:
+    """Create one synthetic spec with six phases."""
+    category = CATEGORIES[i % len(CATEGORIES)]
+    return WorkflowSpec(
+        name=f"spec-{i:05d}",
+        filename=f"spec-{i:05d}.toml",
+        filepath=Path(f"/tmp/spec-{i:05d}.toml"),
+        category=category,
+        description=f"Synthetic workflow number {i}",
+        body="",
+        phases=[
+            WorkflowPhase(
+                number=n,
+                name=parsed(name),
+                description="",
+                output_file=parsed(f"{n}-{name.lower().replace(' ', '-')}.md"),
+            )
+            for n, name in enumerate(PHASE_NAMES, 1)
+        ],
+        tags=[parsed(category.value)] + [parsed(tag) for tag in TAGS],
+    )
+
+
+def make_metadata(i: int) -> SpecMetadata:
+    """Create one synthetic metadata record."""
+    return SpecMetadata(
+        name=f"spec-{i:05d}",
+        path=f"specs/development/spec-{i:05d}.toml",
+        category=parsed(CATEGORIES[i % len(CATEGORIES)].value),
+        description=f"Synthetic workflow number {i}",
+        version=parsed("1.0.0"),
+        phases=[parsed(name) for name in PHASE_NAMES],
+        constraints={parsed("MUST"): 5, parsed("SHOULD"): 3},
+        modes=[parsed("Collaboration"), parsed("Silent")],
+        output_directory=parsed(".lia/spec/{task_name}/"),
+        on_complete=[parsed(name) for name in WORKFLOWS[:2]],
+        can_chain_from=[parsed(name) for name in WORKFLOWS[2:]],
+        tags=[parsed(tag) for tag in TAGS],
+    )
+
+
+def make_trigger(i: int) -> WorkflowTrigger:
+    """Create one synthetic trigger definition."""
+    return WorkflowTrigger(
+        name=f"spec-{i:05d}",
+        on_complete=[parsed(name) for name in WORKFLOWS[:2]],
+        can_chain_from=[parsed(name) for name in WORKFLOWS[2:]],
+        typical_outputs=[parsed("requirements.md"), parsed("design.md")],
+        works_well_with=[parsed(name) for name in WORKFLOWS],
+    )
+
+
+def bytes_per_instance(factory: Callable[[int], object], count: int) -> float:
+    """Return the bytes retained per instance built by `factory`."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    instances = [factory(i) for i in range(count)]
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del instances
+    return retained / count
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_COUNT
+    print(f"{'model':>15}  {'bytes per instance':>18}")
+    for label, factory in [
+        ("WorkflowSpec", make_spec),
+        ("SpecMetadata", make_metadata),
+        ("WorkflowTrigger", make_trigger),
+    ]:
+        print(f"{label:>15}  {bytes_per_instance(factory, count):>18.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+Response and data caches.
+
+`LRUCache` bounds entries by count and by an approximate byte size supplied
+by the caller, so long-running servers keep a fixed memory ceiling.
+`GenerationCache` holds values derived from data that is replaced wholesale
+(such as a reloaded spec collection) and drops them when it changes.
+"""
+
+from collections import OrderedDict
+from typing import Any, Callable, Generic, Hashable, Optional, TypeVar
+
+V = TypeVar("V")
+
+
+class LRUCache(Generic[V]):
+    """
+    LRU cache with entry and byte limits and hit/miss/eviction counters.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        max_bytes: Optional[int] = None,
+        on_evict: Optional[Callable[[Hashable, V], Any]] = None,
+    ):
+        """
+        Initialise the cache.
+
+        Args:
+            max_entries: Maximum number of entries kept.
+            max_bytes: Maximum total size of entries, or None for no limit.
+            on_evict: Called with (key, value) when an entry is evicted to
+                make room (not when it is removed explicitly).
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._on_evict = on_evict
+        self._entries: OrderedDict[Hashable, tuple[V, int]] = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        """Total size of all entries."""
+        return self._bytes
+
+    def get(self, key: Hashable, default: Optional[V] = None) -> Optional[V]:
+        """Get an entry, marking it most recently used."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def peek(self, key: Hashable, default: Optional[V] = None) -> Optional[V]:
+        """Get an entry without marking it used or counting a hit or miss."""
+        entry = self._entries.get(key)
+        return default if entry is None else entry[0]
+
+    def put(self, key: Hashable, value: V, size: int = 0) -> None:
+        """
+        Add or replace an entry, evicting the least recently used as needed.
+
+        An entry larger than `max_bytes` on its own is not cached.
+        """
+        self.pop(key)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        self._entries[key] = (value, size)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or (
+            self.max_bytes is not None and self._bytes > self.max_bytes
+        ):
+            old_key, (old_value, old_size) = self._entries.popitem(last=False)
+            self._bytes -= old_size
+            self.evictions += 1
+            if self._on_evict is not None:
+                self._on_evict(old_key, old_value)
+
+    def pop(self, key: Hashable) -> Optional[V]:
+        """Remove an entry, returning its value if present."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return None
+        self._bytes -= entry[1]
+        return entry[0]
+
+    def clear(self) -> None:
+        """Remove all entries (counters are kept)."""
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> dict[str, int]:
+        """Get entry, size and hit/miss/eviction counts."""
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class GenerationCache(Generic[V]):
+    """
+    Values built once per data generation.
+
+    Every entry is tagged implicitly with the generation it was built for;
+    the first lookup for a newer generation drops all entries at once.
+    """
+
+    def __init__(self):
+        self.generation: Optional[int] = None
+        self._values: dict[Hashable, V] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def get_or_build(self, key: Hashable, generation: int, build: Callable[[], V]) -> V:
+        """
+        Get the value for `key`, building it if absent for this generation.
+
+        Args:
+            key: Cache key (e.g. a resource URI).
+            generation: Current generation of the underlying data.
+            build: Called to produce the value on a miss.
+        """
+        if generation != self.generation:
+            self._values.clear()
+            self.generation = generation
+        if key in self._values:
+            self.hits += 1
+            return self._values[key]
+        self.misses += 1
+        value = build()
+        self._values[key] = value
+        return value
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._values.clear()
+        self.generation = None
+
+    def stats(self) -> dict[str, Optional[int]]:
+        """Get entry and hit/miss counts."""
+        return {
+            "entries": len(self._values),
+            "generation": self.generation,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
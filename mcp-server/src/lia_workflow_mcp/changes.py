@@ -0,0 +1,113 @@
+"""
+Spec change log for incremental catalogue sync.
+
+Loaders record which specs were added, modified or removed at each
+generation. Clients keep an opaque cursor and ask for the changes since it,
+so mirroring the catalogue costs O(changes) rather than a full re-read. The
+log is bounded; a cursor older than the retained history, or one issued by
+another server process, asks the client to resynchronise from scratch.
+"""
+
+import secrets
+from collections import deque
+from typing import Iterable, Optional
+
+ADDED = "added"
+MODIFIED = "modified"
+REMOVED = "removed"
+
+
+def diff_versions(old: dict[str, object], new: dict[str, object]) -> list[tuple[str, str]]:
+    """
+    Compare two name-to-version mappings.
+
+    Returns:
+        (name, kind) pairs for specs added, modified or removed.
+    """
+    changes = [
+        (name, ADDED if name not in old else MODIFIED)
+        for name, version in new.items()
+        if name not in old or old[name] != version
+    ]
+    changes.extend((name, REMOVED) for name in old if name not in new)
+    return changes
+
+
+def _coalesce(first: str, last: str) -> Optional[str]:
+    """Combine the first and last change to a spec into one net change."""
+    if first == ADDED:
+        return None if last == REMOVED else ADDED
+    if last == REMOVED:
+        return REMOVED
+    return MODIFIED
+
+
+class ChangeLog:
+    """
+    Bounded log of spec changes keyed by generation.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        """
+        Initialise the log.
+
+        Args:
+            max_entries: Number of individual changes retained.
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        # Distinguishes cursors from different server processes
+        self.epoch = secrets.token_hex(4)
+        self._entries: deque[tuple[int, str, str]] = deque()
+        # Changes after this generation are all still in the log
+        self._floor = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def record(self, generation: int, changes: Iterable[tuple[str, str]]) -> None:
+        """Record (name, kind) changes that produced a generation."""
+        for name, kind in changes:
+            self._entries.append((generation, name, kind))
+        while len(self._entries) > self.max_entries:
+            dropped, _name, _kind = self._entries.popleft()
+            self._floor = max(self._floor, dropped)
+
+    def cursor(self, generation: int) -> str:
+        """Get the opaque cursor for a generation."""
+        return f"{self.epoch}:{generation}"
+
+    def since(self, cursor: Optional[str]) -> Optional[dict[str, str]]:
+        """
+        Get the net change to each spec since a cursor.
+
+        Returns:
+            Mapping of spec name to "added", "modified" or "removed", or None
+            if the cursor cannot be served and the client must resynchronise.
+        """
+        if not cursor:
+            return None
+        epoch, _, generation = cursor.partition(":")
+        if epoch != self.epoch or not generation.isdigit():
+            return None
+        generation = int(generation)
+        if generation < self._floor:
+            return None
+
+        first: dict[str, str] = {}
+        last: dict[str, str] = {}
+        for entry_generation, name, kind in self._entries:
+            if entry_generation > generation:
+                first.setdefault(name, kind)
+                last[name] = kind
+        net = {}
+        for name, kind in first.items():
+            combined = _coalesce(kind, last[name])
+            if combined is not None:
+                net[name] = combined
+        return net
+
+    def stats(self) -> dict[str, int]:
+        """Get the number of retained changes and the oldest servable generation."""
+        return {"entries": len(self._entries), "max_entries": self.max_entries, "floor": self._floor}
@@ -0,0 +1,165 @@
+"""
+Compressed in-memory prompt storage.
+
+Prompt bodies are most of a loaded collection's memory, and a session
+usually reads only a few of them. `PromptStore` keeps prompts
+zlib-compressed, with a preset dictionary trained on lines the corpus shares
+(mode descriptions, execution instructions, notepad templates), and holds
+recently read prompts decompressed in a byte-bounded LRU.
+"""
+
+import time
+import weakref
+import zlib
+from collections import Counter
+from typing import Iterable, Optional
+
+from .cache import LRUCache
+
+# zlib matches at most 32 KiB back, so a longer dictionary is never used
+MAX_DICTIONARY_BYTES = 32 * 1024
+DEFAULT_HOT_BYTES = 4 * 1024 * 1024
+
+
+def train_dictionary(
+    texts: Iterable[str],
+    max_bytes: int = MAX_DICTIONARY_BYTES,
+    min_count: int = 2,
+) -> bytes:
+    """
+    Build a zlib preset dictionary from lines shared between prompts.
+
+    Args:
+        texts: Prompts to train on.
+        max_bytes: Dictionary size limit.
+        min_count: Number of prompts a line must appear in.
+
+    Returns:
+        The dictionary, possibly empty.
+    """
+    counts = Counter(
+        line
+        for text in texts
+        for line in set(text.splitlines(keepends=True))
+        if line.strip()
+    )
+    common = sorted(
+        (line for line, count in counts.items() if count >= min_count),
+        key=lambda line: (counts[line], len(line), line),
+    )
+    # Nearer matches are coded more cheaply, so the most common lines go last
+    return "".join(common).encode("utf-8")[-max_bytes:]
+
+
+class CompressedPrompt:
+    """
+    One compressed prompt; `text()` decompresses it through its store.
+    """
+
+    __slots__ = ("_store", "data", "zdict", "size", "__weakref__")
+
+    def __init__(self, store: "PromptStore", data: bytes, zdict: bytes, size: int):
+        self._store = store
+        self.data = data
+        # The dictionary the data was compressed with, kept after retraining
+        self.zdict = zdict
+        # Length of the encoded text
+        self.size = size
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __eq__(self, other: object) -> bool:
+        return (
+            isinstance(other, CompressedPrompt)
+            and self.data == other.data
+            and self.zdict == other.zdict
+        )
+
+    def __hash__(self) -> int:
+        return hash(self.data)
+
+    def text(self) -> str:
+        """Get the prompt text."""
+        return self._store.text(self)
+
+
+class PromptStore:
+    """
+    Compresses prompts and caches recently read ones decompressed.
+    """
+
+    def __init__(self, max_hot_bytes: int = DEFAULT_HOT_BYTES, level: int = 6):
+        """
+        Initialise the store.
+
+        Args:
+            max_hot_bytes: Memory ceiling for decompressed prompts.
+            level: zlib compression level.
+        """
+        self.level = level
+        self.zdict = b""
+        self._hot: LRUCache[str] = LRUCache(max_entries=4096, max_bytes=max_hot_bytes)
+        self._prompts: weakref.WeakSet[CompressedPrompt] = weakref.WeakSet()
+        self.decompressions = 0
+        self._decompress_seconds = 0.0
+        self._max_decompress_seconds = 0.0
+
+    def train(self, texts: Iterable[str]) -> None:
+        """
+        Train the preset dictionary used for prompts compressed from now on.
+
+        Prompts already compressed keep the dictionary they were made with.
+        """
+        self.zdict = train_dictionary(texts)
+
+    def compress(self, text: str) -> CompressedPrompt:
+        """Compress a prompt."""
+        raw = text.encode("utf-8")
+        if self.zdict:
+            compressor = zlib.compressobj(self.level, zdict=self.zdict)
+        else:
+            compressor = zlib.compressobj(self.level)
+        prompt = CompressedPrompt(
+            self, compressor.compress(raw) + compressor.flush(), self.zdict, len(raw)
+        )
+        self._prompts.add(prompt)
+        return prompt
+
+    def text(self, prompt: CompressedPrompt) -> str:
+        """Get a prompt's text, decompressing it unless it is hot."""
+        text = self._hot.get(prompt)
+        if text is not None:
+            return text
+        start = time.perf_counter()
+        if prompt.zdict:
+            decompressor = zlib.decompressobj(zdict=prompt.zdict)
+        else:
+            decompressor = zlib.decompressobj()
+        text = (decompressor.decompress(prompt.data) + decompressor.flush()).decode("utf-8")
+        elapsed = time.perf_counter() - start
+        self.decompressions += 1
+        self._decompress_seconds += elapsed
+        self._max_decompress_seconds = max(self._max_decompress_seconds, elapsed)
+        self._hot.put(prompt, text, prompt.size)
+        return text
+
+    def stats(self) -> dict[str, object]:
+        """Get compression ratio, decompression latency and hot cache statistics."""
+        prompts = list(self._prompts)
+        raw = sum(prompt.size for prompt in prompts)
+        compressed = sum(len(prompt.data) for prompt in prompts)
+        mean: Optional[float] = None
+        if self.decompressions:
+            mean = round(self._decompress_seconds / self.decompressions * 1e6, 1)
+        return {
+            "prompts": len(prompts),
+            "raw_bytes": raw,
+            "compressed_bytes": compressed,
+            "dictionary_bytes": len(self.zdict),
+            "ratio": round(raw / compressed, 2) if compressed else 0.0,
+            "decompressions": self.decompressions,
+            "mean_decompress_us": mean,
+            "max_decompress_us": round(self._max_decompress_seconds * 1e6, 1),
+            "hot": self._hot.stats(),
+        }
@@ -0,0 +1,281 @@
+"""
+Mermaid workflow diagram parsing.
+
+Every spec embeds a Mermaid diagram under "Workflow Diagram". This module
+parses it once into nodes and edges so clients can render or reason about
+the flow without re-parsing the prompt on every request.
+"""
+
+import json
+import re
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Optional
+
+_BLOCK_PATTERN = re.compile(r"```mermaid[^\n]*\n(.*?)```", re.IGNORECASE | re.DOTALL)
+_HEADER_PATTERN = re.compile(r"^(graph|flowchart|stateDiagram(?:-v2)?)\b\s*(\w+)?", re.IGNORECASE)
+_TEXT_ARROW_PATTERN = re.compile(r"\s(--|==)\s+([^\s|>-][^|>]*?)\s+\1+>")
+_ARROW_PATTERN = re.compile(r"\s*(<?(?:={2,}>|-{2,}[>xo]?|-\.+->?))\s*(?:\|([^|]*)\|)?\s*")
+_NODE_PATTERN = re.compile(
+    r"(?P<id>\[\*\]|[\w][\w.-]*)"
+    r"(?P<shape>\(\(.*?\)\)|\(\[.*?\]\)|\[\[.*?\]\]|\[\(.*?\)\]|\{\{.*?\}\}"
+    r"|\[.*?\]|\(.*?\)|\{.*?\}|>.*?\])?"
+)
+_STATE_ALIAS_PATTERN = re.compile(r'^state\s+"([^"]*)"\s+as\s+(\w+)')
+_SKIP_PATTERN = re.compile(
+    r"^(?:%%|classDef\b|class\b|style\b|linkStyle\b|subgraph\b|end$|direction\b"
+    r"|note\b|click\b|[{}])"
+)
+
+# Opening delimiter of a node shape -> shape name, longest delimiters first
+_SHAPES = [
+    ("((", "circle"),
+    ("([", "stadium"),
+    ("[[", "subroutine"),
+    ("[(", "cylinder"),
+    ("{{", "hexagon"),
+    ("[", "rect"),
+    ("(", "round"),
+    ("{", "diamond"),
+    (">", "asymmetric"),
+]
+
+
+@dataclass
+class DiagramNode:
+    """A node (or state) in a workflow diagram."""
+    id: str
+    label: str
+    shape: str = "rect"
+
+
+@dataclass
+class DiagramEdge:
+    """A directed edge between two diagram nodes."""
+    source: str
+    target: str
+    label: Optional[str] = None
+
+
+@dataclass
+class WorkflowDiagram:
+    """A parsed Mermaid workflow diagram."""
+    kind: str
+    direction: Optional[str] = None
+    nodes: list[DiagramNode] = field(default_factory=list)
+    edges: list[DiagramEdge] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        """Convert diagram to a compact dictionary (empty fields omitted)."""
+        nodes = []
+        for node in self.nodes:
+            entry = {"id": node.id}
+            if node.label != node.id:
+                entry["label"] = node.label
+            if node.shape != "rect":
+                entry["shape"] = node.shape
+            nodes.append(entry)
+
+        edges = []
+        for edge in self.edges:
+            entry = {"from": edge.source, "to": edge.target}
+            if edge.label:
+                entry["label"] = edge.label
+            edges.append(entry)
+
+        result = {"kind": self.kind, "nodes": nodes, "edges": edges}
+        if self.direction:
+            result["direction"] = self.direction
+        return result
+
+    @cached_property
+    def json(self) -> str:
+        """Compact JSON serialisation, computed once."""
+        return json.dumps(self.to_dict(), separators=(",", ":"), ensure_ascii=False)
+
+
+def extract_mermaid_block(prompt: str) -> Optional[str]:
+    """
+    Get the source of the workflow's Mermaid diagram.
+
+    Prefers the block under a "Workflow Diagram" heading, falling back to the
+    first Mermaid block in the prompt.
+    """
+    heading = prompt.find("Workflow Diagram")
+    if heading == -1:
+        heading = prompt.find("WORKFLOW DIAGRAM")
+    if heading != -1:
+        match = _BLOCK_PATTERN.search(prompt, heading)
+        if match:
+            return match.group(1)
+    match = _BLOCK_PATTERN.search(prompt)
+    return match.group(1) if match else None
+
+
+def parse_mermaid(source: str) -> Optional[WorkflowDiagram]:
+    """
+    Parse a Mermaid flowchart or state diagram into nodes and edges.
+
+    Supports the subset used by workflow specs: `graph`/`flowchart` and
+    `stateDiagram` headers, bracketed node shapes, `[*]` terminals, chained
+    arrows, `|label|` and `: label` edge labels, and `ID: description` states.
+
+    Returns:
+        WorkflowDiagram, or None if the source has no recognised header.
+    """
+    lines = [line.strip() for line in source.splitlines()]
+    lines = [line for line in lines if line]
+    if not lines:
+        return None
+
+    header = _HEADER_PATTERN.match(lines[0])
+    if not header:
+        return None
+    kind = header.group(1)
+    is_state = kind.lower().startswith("state")
+    diagram = WorkflowDiagram(
+        kind=kind,
+        direction=header.group(2) if not is_state else None,
+    )
+    nodes: dict[str, DiagramNode] = {}
+
+    def add_node(node_id: str, label: Optional[str], shape: Optional[str]) -> None:
+        if node_id == "[*]":
+            shape = "terminal"
+        node = nodes.get(node_id)
+        if node is None:
+            node = DiagramNode(
+                id=node_id,
+                label=label or node_id,
+                shape=shape or ("state" if is_state else "rect"),
+            )
+            nodes[node_id] = node
+            diagram.nodes.append(node)
+            return
+        if label:
+            node.label = label
+        if shape:
+            node.shape = shape
+
+    for line in lines[1:]:
+        if _SKIP_PATTERN.match(line):
+            continue
+
+        alias = _STATE_ALIAS_PATTERN.match(line)
+        if alias:
+            add_node(alias.group(2), alias.group(1), None)
+            continue
+
+        parts = _split_statement(line)
+        if parts is None:
+            continue
+
+        previous: Optional[str] = None
+        pending_label: Optional[str] = None
+        last_index = len(parts) - 1
+        for i, (text, arrow_label) in enumerate(parts):
+            node_id, label, shape, trailing = _parse_node(text)
+            if node_id is None:
+                previous = None
+                continue
+
+            edge_label = pending_label
+            if trailing is not None:
+                # "B --> [*] : Update" labels the edge; "A: Start --> B" and a
+                # standalone "State : description" label the node
+                if i == last_index and i > 0 and text.split(":", 1)[0].endswith(" "):
+                    edge_label = trailing
+                else:
+                    label = trailing
+
+            add_node(node_id, label, shape)
+            if previous is not None:
+                diagram.edges.append(DiagramEdge(
+                    source=previous,
+                    target=node_id,
+                    label=edge_label or None,
+                ))
+            previous = node_id
+            pending_label = arrow_label
+
+    return diagram
+
+
+def parse_prompt_diagram(prompt: str) -> Optional[WorkflowDiagram]:
+    """Extract and parse the workflow diagram embedded in a spec prompt."""
+    source = extract_mermaid_block(prompt)
+    if source is None:
+        return None
+    return parse_mermaid(source)
+
+
+def _split_statement(line: str) -> Optional[list[tuple[str, Optional[str]]]]:
+    """
+    Split a statement on arrows that appear outside node labels.
+
+    Returns:
+        List of (node text, label of the arrow that follows it) pairs.
+    """
+    # Normalise "A -- text --> B" to "A -->|text| B"
+    line = _TEXT_ARROW_PATTERN.sub(lambda m: f" {m.group(1)}>|{m.group(2)}| ", line)
+    masked = _mask_labels(line)
+    parts: list[tuple[str, Optional[str]]] = []
+    start = 0
+    for match in _ARROW_PATTERN.finditer(masked):
+        text = line[start:match.start()].strip()
+        if not text:
+            return None
+        parts.append((text, match.group(2).strip() if match.group(2) else None))
+        start = match.end()
+    tail = line[start:].strip()
+    if not tail:
+        return None
+    parts.append((tail, None))
+    return parts
+
+
+def _mask_labels(line: str) -> str:
+    """Blank out text inside brackets so arrows in labels are ignored."""
+    depth = 0
+    chars = []
+    for ch in line:
+        if ch in "[({":
+            depth += 1
+            chars.append(ch)
+        elif ch in "])}" and depth:
+            depth -= 1
+            chars.append(ch)
+        else:
+            chars.append(" " if depth else ch)
+    return "".join(chars)
+
+
+def _parse_node(
+    text: str,
+) -> tuple[Optional[str], Optional[str], Optional[str], Optional[str]]:
+    """
+    Parse node text such as `A[Label]`, `[*] : Update` or `B: Description`.
+
+    Returns:
+        (id, shape label, shape name, text after a trailing colon)
+    """
+    match = _NODE_PATTERN.match(text)
+    if not match:
+        return None, None, None, None
+
+    node_id = match.group("id")
+    label = shape = None
+    raw_shape = match.group("shape")
+    if raw_shape:
+        for opener, name in _SHAPES:
+            if raw_shape.startswith(opener):
+                shape = name
+                closer_len = 1 if opener == ">" else len(opener)
+                label = raw_shape[len(opener):-closer_len].strip().strip('"')
+                break
+
+    rest = text[match.end():].strip()
+    if rest.startswith(":::"):
+        rest = ""
+    trailing = rest[1:].strip() if rest.startswith(":") else None
+    return node_id, label, shape, trailing
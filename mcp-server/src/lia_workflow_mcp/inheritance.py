@@ -0,0 +1,160 @@
+"""
+Base workflow inheritance.
+
+A spec can declare `extends = "base-workflow"` (top level or under `[meta]`)
+to inherit the shared tables from `specs/_common/base-workflow.toml`.
+Inheritance is resolved at load time into a single flattened table, and each
+base file is parsed and resolved once no matter how many specs extend it.
+"""
+
+import sys
+from pathlib import Path
+from typing import Callable, Optional
+
+# Directory holding shared bases and configuration rather than specs
+COMMON_DIR = "_common"
+
+
+def get_extends(data: dict) -> Optional[str]:
+    """Get the base a spec extends, if any."""
+    extends = data.get("extends")
+    if extends is None:
+        meta = data.get("meta")
+        if isinstance(meta, dict):
+            extends = meta.get("extends")
+    return extends if isinstance(extends, str) and extends else None
+
+
+def merge_tables(base: dict, override: dict) -> dict:
+    """
+    Merge two TOML tables, with `override` taking precedence.
+
+    Nested tables are merged recursively; arrays and scalar values in
+    `override` replace those in `base`.
+    """
+    merged = dict(base)
+    for key, value in override.items():
+        existing = merged.get(key)
+        if isinstance(existing, dict) and isinstance(value, dict):
+            merged[key] = merge_tables(existing, value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def structured_phases(data: dict) -> Optional[list[dict]]:
+    """
+    Get phases declared as `[[phases]]` tables.
+
+    Each table may set `number`, `name`, `description`, `output_file` and
+    `constraints`; `number` defaults to the table's 1-based position.
+
+    Returns:
+        List of normalised phase tables, or None if the spec declares none.
+    """
+    phases = data.get("phases")
+    if not isinstance(phases, list) or not phases:
+        return None
+
+    result = []
+    for position, phase in enumerate(phases, 1):
+        if not isinstance(phase, dict) or "name" not in phase:
+            continue
+        result.append({
+            "number": int(phase.get("number", position)),
+            "name": str(phase["name"]).strip(),
+            "description": phase.get("description", ""),
+            "output_file": phase.get("output_file"),
+            "constraints": list(phase.get("constraints", [])),
+        })
+    return result or None
+
+
+class BaseResolver:
+    """
+    Resolves `extends` chains against memoised, flattened base tables.
+    """
+
+    def __init__(self, specs_dir: Optional[Path], load: Callable[[Path], Optional[dict]]):
+        """
+        Initialise the resolver.
+
+        Args:
+            specs_dir: Specs directory; bases are looked up in its `_common` folder.
+            load: Function that parses a TOML file, returning None on failure.
+        """
+        self.specs_dir = specs_dir
+        self._load = load
+        self._bases: dict[Path, Optional[dict]] = {}
+
+    def resolve(self, data: dict, spec_path: Path) -> dict:
+        """
+        Flatten a spec's inheritance chain into a single table.
+
+        Args:
+            data: Parsed spec table.
+            spec_path: Path of the spec file, used to resolve relative bases.
+
+        Returns:
+            The merged table, or `data` unchanged if it extends nothing.
+        """
+        extends = get_extends(data)
+        if not extends:
+            return data
+
+        base = self._get_base(self._locate(extends, spec_path), (spec_path.resolve(),))
+        if base is None:
+            print(f"Warning: Base '{extends}' for {spec_path} not found", file=sys.stderr)
+            return data
+        return merge_tables(base, data)
+
+    def bases_for(self, data: dict, spec_path: Path) -> list[Path]:
+        """
+        List the base files a spec inherits from, nearest first.
+
+        Only bases already resolved through `resolve` are followed.
+        """
+        paths: list[Path] = []
+        extends = get_extends(data)
+        current = spec_path
+        while extends:
+            path = self._locate(extends, current).resolve()
+            if path in paths:
+                break
+            paths.append(path)
+            base = self._bases.get(path)
+            if base is None:
+                break
+            extends = get_extends(base)
+            current = path
+        return paths
+
+    def clear(self) -> None:
+        """Forget all memoised bases."""
+        self._bases.clear()
+
+    def _get_base(self, base_path: Path, chain: tuple[Path, ...]) -> Optional[dict]:
+        """Load and flatten a base, memoising the result."""
+        base_path = base_path.resolve()
+        if base_path in self._bases:
+            return self._bases[base_path]
+        if base_path in chain:
+            raise ValueError(f"Circular extends: {' -> '.join(str(p) for p in chain + (base_path,))}")
+
+        data = self._load(base_path) if base_path.exists() else None
+        if data is not None:
+            extends = get_extends(data)
+            if extends:
+                parent = self._get_base(self._locate(extends, base_path), chain + (base_path,))
+                if parent is not None:
+                    data = merge_tables(parent, data)
+
+        self._bases[base_path] = data
+        return data
+
+    def _locate(self, extends: str, spec_path: Path) -> Path:
+        """Map an `extends` value to a file path."""
+        if extends.endswith(".toml"):
+            return spec_path.parent / extends
+        specs_dir = self.specs_dir or spec_path.parent.parent
+        return specs_dir / COMMON_DIR / f"{extends}.toml"
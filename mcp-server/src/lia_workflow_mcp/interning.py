@@ -0,0 +1,42 @@
+"""
+Interning of categorical strings in loaded models.
+
+Category names, tags, phase names, modes and workflow names recur across
+every loaded spec, and across the models of both servers when they share a
+process. Parsing yields a fresh string object for each occurrence; interning
+keeps one copy of each distinct value.
+"""
+
+import sys
+from typing import Iterable, TypeVar
+
+T = TypeVar("T")
+
+
+def intern_str(value: T) -> T:
+    """Intern a plain string, passing any other value through unchanged."""
+    # sys.intern rejects str subclasses such as SpecCategory
+    return sys.intern(value) if type(value) is str else value
+
+
+def intern_list(values: Iterable[T]) -> list[T]:
+    """Get a list with each plain string interned."""
+    return [intern_str(value) for value in values]
+
+
+def intern_fields(instance: object, *names: str) -> None:
+    """
+    Intern string, list-of-string and tuple-of-string fields of a frozen
+    dataclass in place.
+
+    For use from `__post_init__`.
+    """
+    for name in names:
+        value = getattr(instance, name)
+        if isinstance(value, list):
+            value = intern_list(value)
+        elif isinstance(value, tuple):
+            value = tuple(intern_list(value))
+        else:
+            value = intern_str(value)
+        object.__setattr__(instance, name, value)
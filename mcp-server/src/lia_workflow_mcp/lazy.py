@@ -0,0 +1,156 @@
+"""
+Lazily loaded prompt bodies.
+
+Listing, search and recommendation only need spec metadata. In lazy mode a
+loaded spec keeps its metadata, section outline and the byte offset of its
+prompt within the spec file; `LazyPrompts` reads the prompt from disk on
+first access and holds recently read prompts in a byte-bounded LRU, so
+resident memory follows the metadata rather than the corpus size.
+
+A prompt whose file was edited after loading is not served: the spec's
+content hash and section outline describe the old text, so it stays
+unreadable until the file is reloaded.
+"""
+
+import time
+import weakref
+from pathlib import Path
+from typing import Callable, Optional
+
+from .cache import LRUCache
+from .serialise import content_hash
+
+DEFAULT_RESIDENT_BYTES = 4 * 1024 * 1024
+
+
+class StalePromptError(OSError):
+    """A spec file no longer holds the prompt it was loaded with."""
+
+
+class LazyPrompt:
+    """
+    Location of one prompt on disk; `text()` reads it through its source.
+    """
+
+    __slots__ = ("_source", "path", "offset", "length", "digest", "__weakref__")
+
+    def __init__(
+        self,
+        source: "LazyPrompts",
+        path: Path,
+        offset: Optional[int],
+        length: int,
+        digest: str,
+    ):
+        self._source = source
+        self.path = path
+        # Byte offset of the prompt in the file, or None if it does not
+        # appear there verbatim (escapes, or inherited from a base) and the
+        # file must be parsed again to read it
+        self.offset = offset
+        # Length of the encoded text
+        self.length = length
+        # Content hash of the text, to detect files edited since loading
+        self.digest = digest
+
+    def __len__(self) -> int:
+        return self.length
+
+    def text(self) -> str:
+        """Get the prompt text."""
+        return self._source.text(self)
+
+
+class LazyPrompts:
+    """
+    Reads prompts from spec files on demand and keeps the recent ones.
+    """
+
+    def __init__(
+        self,
+        parse: Callable[[Path], str],
+        max_resident_bytes: int = DEFAULT_RESIDENT_BYTES,
+    ):
+        """
+        Initialise the source.
+
+        Args:
+            parse: Parses a spec file and returns its prompt; used for
+                prompts without an offset and files edited since loading.
+            max_resident_bytes: Memory ceiling for loaded prompts.
+        """
+        self._parse = parse
+        self._resident: LRUCache[str] = LRUCache(max_entries=4096, max_bytes=max_resident_bytes)
+        self._prompts: weakref.WeakSet[LazyPrompt] = weakref.WeakSet()
+        self.loads = 0
+        self.parses = 0
+        self._load_seconds = 0.0
+        self._max_load_seconds = 0.0
+
+    def locate(self, path: Path, text: str) -> LazyPrompt:
+        """
+        Record where a freshly parsed prompt is in its spec file.
+
+        Args:
+            path: Spec file the prompt was parsed from.
+            text: The parsed prompt.
+        """
+        raw = text.encode("utf-8")
+        try:
+            offset = path.read_bytes().find(raw) if raw else -1
+        except OSError:
+            offset = -1
+        prompt = LazyPrompt(
+            self, path, offset if offset >= 0 else None, len(raw), content_hash(text)
+        )
+        self._prompts.add(prompt)
+        return prompt
+
+    def text(self, prompt: LazyPrompt) -> str:
+        """
+        Get a prompt's text, reading it from disk unless it is resident.
+
+        Raises:
+            StalePromptError: If the prompt was edited since loading.
+            OSError: If the spec file can no longer be read.
+        """
+        text = self._resident.get(prompt)
+        if text is not None:
+            return text
+        start = time.perf_counter()
+        text = None
+        if prompt.offset is not None:
+            with open(prompt.path, "rb") as f:
+                f.seek(prompt.offset)
+                data = f.read(prompt.length)
+            text = data.decode("utf-8", errors="replace")
+        if text is None or content_hash(text) != prompt.digest:
+            self.parses += 1
+            text = self._parse(prompt.path)
+            if content_hash(text) != prompt.digest:
+                raise StalePromptError(
+                    f"{prompt.path} changed since it was loaded; it is served again once reloaded"
+                )
+        elapsed = time.perf_counter() - start
+        self.loads += 1
+        self._load_seconds += elapsed
+        self._max_load_seconds = max(self._max_load_seconds, elapsed)
+        self._resident.put(prompt, text, prompt.length)
+        return text
+
+    def stats(self) -> dict[str, object]:
+        """Get load counts and latency, and resident prompt statistics."""
+        prompts = list(self._prompts)
+        mean: Optional[float] = None
+        if self.loads:
+            mean = round(self._load_seconds / self.loads * 1e6, 1)
+        return {
+            "prompts": len(prompts),
+            "prompt_bytes": sum(prompt.length for prompt in prompts),
+            "without_offset": sum(1 for prompt in prompts if prompt.offset is None),
+            "loads": self.loads,
+            "parses": self.parses,
+            "mean_load_us": mean,
+            "max_load_us": round(self._max_load_seconds * 1e6, 1),
+            "resident": self._resident.stats(),
+        }
@@ -2,12 +2,31 @@
 Data models for workflow specifications.
 """
 
-from dataclasses import dataclass, field
+from dataclasses import InitVar, dataclass, field
 from enum import Enum
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional, Union
+import os
+import sys
 import tomli
 
+from .changes import ChangeLog, diff_versions
+from .compression import CompressedPrompt, PromptStore
+from .diagram import WorkflowDiagram, parse_prompt_diagram
+from .inheritance import COMMON_DIR, BaseResolver, get_extends, structured_phases
+from .interning import intern_fields
+from .lazy import LazyPrompt, LazyPrompts
+from .sections import Section, SectionPrompt, SectionStore, split_sections
+from .serialise import FragmentCache, content_hash
+from .similarity import SimilarityIndex
+
+
+# Trigger definitions shared by all specs, kept under `_common`
+TRIGGERS_FILE = "workflow-triggers.toml"
+
+# Ways a spec's prompt can be held in memory
+PromptBody = Union[str, CompressedPrompt, SectionPrompt, LazyPrompt]
+
 
 class SpecCategory(str, Enum):
     """Categories of workflow specifications."""
@@ -19,31 +38,188 @@ class SpecCategory(str, Enum):
     STRATEGY = "strategy"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class WorkflowPhase:
     """Represents a phase in a workflow."""
     number: int
     name: str
     description: str
     output_file: Optional[str] = None
-    constraints: list[str] = field(default_factory=list)
+    constraints: tuple[str, ...] = ()
+    
+    def __post_init__(self):
+        object.__setattr__(self, "constraints", tuple(self.constraints))
+        intern_fields(self, "name")
 
 
-@dataclass
+@dataclass(slots=True)
+class PromptCache:
+    """How a spec's prompt is held, and what has been derived from it."""
+    body: PromptBody = ""
+    # (title, level, length, tokens) of each section, kept instead of the
+    # section text so compressed prompts stay compressed
+    outline: Optional[tuple[tuple[str, int, int, int], ...]] = None
+
+
+@dataclass(frozen=True, slots=True)
 class WorkflowSpec:
-    """Represents a workflow specification."""
+    """
+    Represents a workflow specification.
+    
+    Specs are immutable once loaded; a reload replaces them. Names, tags and
+    phase names are interned, so they are shared between specs and with the
+    other server's metadata.
+    
+    `body` may be given as text, a `CompressedPrompt`, a `SectionPrompt`
+    or a `LazyPrompt`; reading `spec.prompt` always gives the text. Specs
+    compare equal when their fields and prompt hashes match.
+    """
     name: str
     filename: str
     filepath: Path
     category: SpecCategory
     description: str
-    prompt: str
-    phases: list[WorkflowPhase] = field(default_factory=list)
-    tags: list[str] = field(default_factory=list)
+    body: InitVar[PromptBody]
+    phases: tuple[WorkflowPhase, ...] = ()
+    tags: tuple[str, ...] = ()
+    diagram: Optional[WorkflowDiagram] = field(default=None, repr=False, compare=False)
+    _hash: str = field(default="", init=False, repr=False)
+    _json: FragmentCache = field(
+        default_factory=FragmentCache, init=False, repr=False, compare=False
+    )
+    _prompt: PromptCache = field(
+        default_factory=PromptCache, init=False, repr=False, compare=False
+    )
+    
+    def __post_init__(self, body: PromptBody):
+        self._prompt.body = body
+        text = body if isinstance(body, str) else body.text()
+        object.__setattr__(self, "_hash", content_hash(text))
+        object.__setattr__(self, "phases", tuple(self.phases))
+        object.__setattr__(self, "tags", tuple(self.tags))
+        intern_fields(self, "name", "tags")
+    
+    @property
+    def prompt(self) -> str:
+        """The prompt text."""
+        body = self._prompt.body
+        return body if isinstance(body, str) else body.text()
+    
+    @property
+    def content_hash(self) -> str:
+        """Hash of the prompt text."""
+        return self._hash
+    
+    @property
+    def sections(self) -> tuple[Section, ...]:
+        """The prompt's heading sections with their token counts."""
+        text = self.prompt
+        outline = self._prompt.outline
+        if outline is None:
+            return self._split_sections(text)
+        sections = []
+        start = 0
+        for title, level, length, tokens in outline:
+            sections.append(Section(title, level, text[start:start + length], tokens))
+            start += length
+        return tuple(sections)
+    
+    def warm(self) -> None:
+        """Split the prompt and count its section tokens if not done yet."""
+        if self._prompt.outline is None:
+            self._split_sections(self.prompt)
+    
+    def _split_sections(self, text: str) -> tuple[Section, ...]:
+        """Split the prompt into sections and record their outline."""
+        sections = tuple(split_sections(text))
+        self._prompt.outline = tuple(
+            (section.title, section.level, len(section.text), section.tokens)
+            for section in sections
+        )
+        return sections
+    
+    def section_items(self) -> list[tuple[str, str]]:
+        """Get (content hash, text) for each section of the prompt."""
+        body = self._prompt.body
+        if isinstance(body, SectionPrompt):
+            return list(body.items())
+        return [(content_hash(section.text), section.text) for section in self.sections]
+    
+    def _set_body(self, body: PromptBody) -> None:
+        """Change how the prompt is held, before the spec is published."""
+        self._prompt.body = body
     
     @classmethod
-    def from_toml_file(cls, filepath: Path) -> "WorkflowSpec":
-        """Load a workflow spec from a TOML file."""
+    def from_toml_file(
+        cls, filepath: Path, resolver: Optional[BaseResolver] = None
+    ) -> "WorkflowSpec":
+        """
+        Load a workflow spec from a TOML file.
+        
+        Args:
+            filepath: Path to the spec file.
+            resolver: Resolver for `extends`; pass a shared one so each base
+                is parsed once across a whole directory load.
+        """
+        data = cls.read_toml(filepath)
+        if get_extends(data):
+            resolver = resolver or BaseResolver(None, cls.read_toml)
+            data = resolver.resolve(data, filepath)
+        
+        # Determine category from [meta] or the parent directory
+        category_name = data.get("meta", {}).get("category") or filepath.parent.name
+        try:
+            category = SpecCategory(category_name)
+        except ValueError:
+            category = SpecCategory.DEVELOPMENT
+        
+        # Extract name from filename
+        name = filepath.stem
+        
+        # Some specs keep the description under [metadata]
+        prompt = cls.prompt_from_data(data)
+        description = data.get("description") or data.get("metadata", {}).get("description", "")
+        
+        # Prefer [[phases]] tables, falling back to parsing the prompt
+        table_phases = structured_phases(data)
+        if table_phases is not None:
+            phases = [WorkflowPhase(**phase) for phase in table_phases]
+        else:
+            phases = cls._extract_phases(prompt)
+        
+        # Extract tags from description, plus any declared in [meta]
+        tags = cls._extract_tags(description, category)
+        for tag in data.get("meta", {}).get("tags", []):
+            if tag not in tags:
+                tags.append(tag)
+        
+        spec = cls(
+            name=name,
+            filename=filepath.name,
+            filepath=filepath,
+            category=category,
+            description=description,
+            body=prompt,
+            phases=phases,
+            tags=tags,
+            diagram=parse_prompt_diagram(prompt),
+        )
+        # Count section tokens at load time rather than on the first request
+        spec.warm()
+        return spec
+    
+    @staticmethod
+    def prompt_from_data(data: dict) -> str:
+        """Get the prompt from parsed spec data."""
+        # Some specs keep the prompt in a [prompt] table with a `content` key
+        prompt = data.get("prompt", "")
+        if isinstance(prompt, dict):
+            prompt = prompt.get("content", "")
+        return prompt
+    
+    @staticmethod
+    def read_toml(filepath: Path) -> dict:
+        """Parse a spec TOML file, tolerating Windows paths in prompts."""
         # Read the file content and fix common TOML escape issues
         with open(filepath, "r", encoding="utf-8") as f:
             content = f.read()
@@ -75,34 +251,7 @@ class WorkflowSpec:
         
         # Parse the fixed content
         import io
-        data = tomli.load(io.BytesIO(content.encode("utf-8")))
-        
-        # Determine category from parent directory
-        category_name = filepath.parent.name
-        try:
-            category = SpecCategory(category_name)
-        except ValueError:
-            category = SpecCategory.DEVELOPMENT
-        
-        # Extract name from filename
-        name = filepath.stem
-        
-        # Parse phases from prompt content
-        phases = cls._extract_phases(data.get("prompt", ""))
-        
-        # Extract tags from description
-        tags = cls._extract_tags(data.get("description", ""), category)
-        
-        return cls(
-            name=name,
-            filename=filepath.name,
-            filepath=filepath,
-            category=category,
-            description=data.get("description", ""),
-            prompt=data.get("prompt", ""),
-            phases=phases,
-            tags=tags,
-        )
+        return tomli.load(io.BytesIO(content.encode("utf-8")))
     
     @staticmethod
     def _extract_phases(prompt: str) -> list[WorkflowPhase]:
@@ -156,9 +305,29 @@ class WorkflowSpec:
                 {"number": p.number, "name": p.name}
                 for p in self.phases
             ],
-            "tags": self.tags,
+            "tags": list(self.tags),
+            "content_hash": self.content_hash,
         }
     
+    def to_json(
+        self,
+        fields: Optional[tuple[str, ...]] = None,
+        compact: bool = False,
+        level: int = 0,
+    ) -> str:
+        """
+        Get the spec's `to_dict()` as a pre-encoded JSON fragment.
+        
+        Fragments are encoded once per projection and layout, so listings
+        can be assembled with `serialise.json_array` without re-encoding.
+        
+        Args:
+            fields: Fields to include, or None for all.
+            compact: Encode without indentation.
+            level: Nesting depth the fragment will be placed at.
+        """
+        return self._json.get(self.to_dict, fields, compact, level)
+    
     def get_summary(self) -> str:
         """Get a concise summary of the spec."""
         phase_list = "\n".join(
@@ -182,34 +351,210 @@ class WorkflowSpec:
 """
 
 
+@dataclass(frozen=True)
+class CollectionSnapshot:
+    """An immutable view of a spec collection at one generation."""
+    generation: int
+    specs: tuple[WorkflowSpec, ...]
+
+
 @dataclass
 class SpecCollection:
-    """Collection of workflow specifications."""
+    """
+    Collection of workflow specifications.
+    
+    `generation` increases every time `specs` is assigned, so anything derived
+    from the collection can be cached against it. Replace the list rather than
+    mutating it in place; `snapshot()` gives handlers a consistent view that
+    later reloads cannot change. Each assignment records the specs added,
+    modified or removed in `changes`.
+    
+    With `lazy_prompts`, loaded prompts are dropped after parsing and read
+    back from their files when needed. Otherwise, with a `section_store`,
+    they are held as references to shared sections, and with a
+    `prompt_store` they are kept compressed. Give the section store the same
+    prompt store to compress each shared section.
+    """
     specs: list[WorkflowSpec] = field(default_factory=list)
     specs_dir: Optional[Path] = None
+    prompt_store: Optional[PromptStore] = None
+    section_store: Optional[SectionStore] = None
+    lazy_prompts: Optional[LazyPrompts] = None
+    generation: int = field(default=0, init=False, repr=False, compare=False)
+    _similarity: SimilarityIndex = field(
+        default_factory=SimilarityIndex, init=False, repr=False, compare=False
+    )
+    _similarity_generation: Optional[int] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _name_index: dict[str, WorkflowSpec] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _name_index_generation: Optional[int] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    
+    _snapshot: Optional[CollectionSnapshot] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    changes: ChangeLog = field(
+        default_factory=ChangeLog, init=False, repr=False, compare=False
+    )
+    
+    def __setattr__(self, name: str, value) -> None:
+        previous = self.__dict__.get("specs") if name == "specs" else None
+        object.__setattr__(self, name, value)
+        if name == "specs":
+            changes = self.__dict__.get("changes")
+            if changes is not None:
+                # Unchanged specs are usually the same objects, so most
+                # comparisons short-circuit on identity
+                changes.record(self.generation + 1, diff_versions(
+                    {spec.name: spec for spec in previous or ()},
+                    {spec.name: spec for spec in value},
+                ))
+            # Bump after publishing and logging so a reader never pairs the
+            # new generation with the old specs or an incomplete change log
+            object.__setattr__(self, "generation", self.generation + 1)
+    
+    def snapshot(self) -> CollectionSnapshot:
+        """Get an immutable view of the current specs and generation."""
+        # Read the generation before the specs: a concurrent swap can then
+        # only pair newer specs with an older generation, never the reverse
+        generation = self.generation
+        snapshot = self._snapshot
+        if snapshot is None or snapshot.generation != generation:
+            snapshot = CollectionSnapshot(generation, tuple(self.specs))
+            self._snapshot = snapshot
+        return snapshot
     
     def load_from_directory(self, specs_dir: Path) -> None:
-        """Load all specs from a directory."""
+        """Load all specs from a directory, replacing the current ones."""
         self.specs_dir = specs_dir
-        self.specs = []
+        specs: list[WorkflowSpec] = []
         
         if not specs_dir.exists():
+            self.specs = specs
             return
         
+        # Bases are parsed once per load and shared by every spec extending them
+        resolver = BaseResolver(specs_dir, WorkflowSpec.read_toml)
         for toml_file in specs_dir.rglob("*.toml"):
+            # Shared bases and trigger definitions are not specs
+            if COMMON_DIR in toml_file.relative_to(specs_dir).parts:
+                continue
             try:
-                spec = WorkflowSpec.from_toml_file(toml_file)
-                self.specs.append(spec)
+                spec = WorkflowSpec.from_toml_file(toml_file, resolver)
+                specs.append(spec)
             except Exception as e:
                 # Log error but continue loading other specs
-                print(f"Warning: Failed to load {toml_file}: {e}")
+                print(f"Warning: Failed to load {toml_file}: {e}", file=sys.stderr)
+        
+        if self.prompt_store is not None and self.lazy_prompts is None:
+            # Train on the whole corpus before compressing any of it
+            self.prompt_store.train(spec.prompt for spec in specs)
+        self._store_prompts(specs)
+        
+        # Swap in the new list in one step so readers never see a partial load
+        self.specs = specs
+        self._release_sections()
+    
+    def _store_prompts(self, specs: list[WorkflowSpec]) -> None:
+        """Move freshly loaded prompts out of memory or into a store."""
+        for spec in specs:
+            if self.lazy_prompts is not None:
+                if spec._prompt.body:
+                    spec._set_body(self.lazy_prompts.locate(spec.filepath, spec.prompt))
+            elif self.section_store is not None:
+                spec._set_body(self.section_store.put(spec.sections))
+            elif self.prompt_store is not None:
+                spec._set_body(self.prompt_store.compress(spec.prompt))
+    
+    def read_prompt(self, filepath: Path) -> str:
+        """Parse a spec file and return only its prompt."""
+        data = WorkflowSpec.read_toml(filepath)
+        if get_extends(data):
+            data = BaseResolver(self.specs_dir, WorkflowSpec.read_toml).resolve(data, filepath)
+        return WorkflowSpec.prompt_from_data(data)
+    
+    def _release_sections(self) -> None:
+        """Drop stored sections that no current spec refers to."""
+        if self.section_store is not None:
+            self.section_store.retain(spec._prompt.body for spec in self.specs)
+    
+    def reload_paths(self, paths: Iterable[Path]) -> bool:
+        """
+        Re-parse only the given spec files and publish the result.
+        
+        Changed files are re-parsed, deleted ones dropped and new ones added;
+        untouched specs are reused. A change to a shared base under `_common`
+        reloads the whole directory, since any spec may inherit from it.
+        The new list is swapped in with a single assignment.
+        
+        Args:
+            paths: Files reported as added, modified or deleted.
+        
+        Returns:
+            True if the collection was replaced.
+        """
+        if self.specs_dir is None:
+            return False
+        root = Path(os.path.abspath(self.specs_dir))
+        targets: set[Path] = set()
+        for path in paths:
+            path = Path(os.path.abspath(path))
+            if path.suffix != ".toml" or not path.is_relative_to(root):
+                continue
+            relative = path.relative_to(root)
+            if COMMON_DIR in relative.parts:
+                if path.name != TRIGGERS_FILE:
+                    self.load_from_directory(self.specs_dir)
+                    return True
+                continue
+            targets.add(relative)
+        if not targets:
+            return False
+        
+        specs = list(self.specs)
+        positions = {
+            Path(os.path.abspath(spec.filepath)): i for i, spec in enumerate(specs)
+        }
+        removed: set[int] = set()
+        resolver = BaseResolver(self.specs_dir, WorkflowSpec.read_toml)
+        for relative in sorted(targets):
+            path = self.specs_dir / relative
+            position = positions.get(root / relative)
+            if not path.exists():
+                if position is not None:
+                    removed.add(position)
+                continue
+            try:
+                spec = WorkflowSpec.from_toml_file(path, resolver)
+            except Exception as e:
+                # Keep serving the previous version of a spec that fails to parse
+                print(f"Warning: Failed to reload {path}: {e}", file=sys.stderr)
+                continue
+            self._store_prompts([spec])
+            if position is None:
+                specs.append(spec)
+            else:
+                specs[position] = spec
+        
+        self.specs = [spec for i, spec in enumerate(specs) if i not in removed]
+        self._release_sections()
+        return True
     
     def get_by_name(self, name: str) -> Optional[WorkflowSpec]:
-        """Get a spec by name."""
-        for spec in self.specs:
-            if spec.name == name or spec.filename == name:
-                return spec
-        return None
+        """Get a spec by name or filename."""
+        if self._name_index_generation != self.generation:
+            # The first spec to claim a name or filename wins, as in a linear scan
+            index: dict[str, WorkflowSpec] = {}
+            for spec in self.specs:
+                index.setdefault(spec.name, spec)
+                index.setdefault(spec.filename, spec)
+            self._name_index = index
+            self._name_index_generation = self.generation
+        return self._name_index.get(name)
     
     def get_by_category(self, category: SpecCategory) -> list[WorkflowSpec]:
         """Get all specs in a category."""
@@ -228,6 +573,39 @@ class SpecCollection:
         
         return results
     
+    def similarity_index(self) -> SimilarityIndex:
+        """
+        Get the prompt similarity index, bringing it up to date first.
+        
+        Only specs whose prompt changed since the last call are re-signed,
+        and nothing is checked if the collection has not been replaced.
+        """
+        if self._similarity_generation == self.generation:
+            return self._similarity
+        # Prompt hashes are compared first, so only changed prompts are read
+        for spec in self.specs:
+            if spec._prompt.body and self._similarity.digest(spec.name) != spec.content_hash:
+                self._similarity.update(spec.name, spec.prompt, spec.content_hash)
+        self._similarity.retain(spec.name for spec in self.specs if spec._prompt.body)
+        self._similarity_generation = self.generation
+        return self._similarity
+    
+    def similarity(self, name1: str, name2: str) -> Optional[float]:
+        """Estimate how similar two specs' prompts are (0.0 to 1.0)."""
+        return self.similarity_index().similarity(name1, name2)
+    
+    def get_related(self, name: str, limit: int = 5) -> list[tuple[WorkflowSpec, float]]:
+        """Get the specs whose prompts are most similar to the named spec."""
+        spec = self.get_by_name(name)
+        if not spec:
+            return []
+        related = self.similarity_index().related(spec.name, limit)
+        return [
+            (other, score)
+            for other_name, score in related
+            if (other := self.get_by_name(other_name)) is not None
+        ]
+    
     def get_categories(self) -> dict[str, list[str]]:
         """Get all categories and their spec names."""
         categories: dict[str, list[str]] = {}
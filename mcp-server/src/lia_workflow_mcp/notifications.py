@@ -0,0 +1,135 @@
+"""
+Resource change notifications.
+
+Clients subscribe to resource URIs instead of polling them. After specs
+change on disk the server computes a content hash for every resource and
+`ResourceNotifier` sends `notifications/resources/updated` only for
+subscribed URIs whose hash differs from the last published one, plus
+`notifications/resources/list_changed` when URIs were added or removed.
+"""
+
+import sys
+import weakref
+from typing import Any, Optional
+
+from mcp.server.lowlevel import NotificationOptions, Server
+from mcp.server.models import InitializationOptions
+from pydantic import AnyUrl
+
+
+def subscribable_options(server: Server) -> InitializationOptions:
+    """
+    Build initialisation options advertising resource subscriptions.
+
+    The low-level server always reports `subscribe=False`, even with a
+    subscribe handler registered, so the capability is set here.
+    """
+    options = server.create_initialization_options(
+        notification_options=NotificationOptions(resources_changed=True),
+    )
+    if options.capabilities.resources is not None:
+        options.capabilities.resources.subscribe = True
+    return options
+
+
+class ResourceNotifier:
+    """
+    Tracks subscriptions and published content hashes per resource URI.
+    """
+
+    def __init__(self):
+        # Published content hash of every resource, None until the first publish
+        self._hashes: dict[str, str] | None = None
+        self._subscribers: dict[str, weakref.WeakSet] = {}
+        self._sessions: weakref.WeakSet = weakref.WeakSet()
+
+    def track(self, session: Any) -> None:
+        """Remember a session so it is told when the resource list changes."""
+        self._sessions.add(session)
+
+    def subscribe(self, uri: str, session: Any) -> None:
+        """Subscribe a session to updates of one resource."""
+        self.track(session)
+        self._subscribers.setdefault(str(uri), weakref.WeakSet()).add(session)
+
+    def unsubscribe(self, uri: str, session: Any) -> None:
+        """Remove a session's subscription to a resource."""
+        subscribers = self._subscribers.get(str(uri))
+        if subscribers is not None:
+            subscribers.discard(session)
+            if not subscribers:
+                del self._subscribers[str(uri)]
+
+    def subscribers(self, uri: str) -> list[Any]:
+        """Get the sessions subscribed to a resource."""
+        return list(self._subscribers.get(str(uri), ()))
+
+    def diff(self, hashes: dict[str, str]) -> tuple[set[str], bool]:
+        """
+        Record new content hashes and compare them with the previous ones.
+
+        The first call only records a baseline.
+
+        Returns:
+            (URIs whose content changed or that were removed,
+            whether the set of URIs changed)
+        """
+        previous, self._hashes = self._hashes, dict(hashes)
+        if previous is None:
+            return set(), False
+        changed = {uri for uri, digest in hashes.items() if previous.get(uri, digest) != digest}
+        changed.update(uri for uri in previous if uri not in hashes)
+        return changed, previous.keys() != hashes.keys()
+
+    async def publish(self, hashes: dict[str, str]) -> set[str]:
+        """
+        Notify sessions about resources whose content hash changed.
+
+        Args:
+            hashes: Content hash of every resource, keyed by URI.
+
+        Returns:
+            URIs for which `resources/updated` was sent.
+        """
+        changed, list_changed = self.diff(hashes)
+        notified = set()
+        for uri in sorted(changed):
+            for session in self.subscribers(uri):
+                if await self._send(session, "send_resource_updated", AnyUrl(uri)):
+                    notified.add(uri)
+        if list_changed:
+            for session in list(self._sessions):
+                await self._send(session, "send_resource_list_changed")
+        return notified
+
+    async def _send(self, session: Any, method: str, *args) -> bool:
+        """Send one notification, forgetting sessions that have gone away."""
+        try:
+            await getattr(session, method)(*args)
+        except Exception as e:
+            print(f"Warning: Dropping session after failed notification: {e}", file=sys.stderr)
+            self._forget(session)
+            return False
+        return True
+
+    def _forget(self, session: Any) -> None:
+        """Drop every subscription held by a session."""
+        self._sessions.discard(session)
+        for uri in list(self._subscribers):
+            self.unsubscribe(uri, session)
+
+    def stats(self) -> dict[str, int]:
+        """Get subscription counts."""
+        return {
+            "sessions": len(self._sessions),
+            "subscribed_uris": len(self._subscribers),
+            "subscriptions": sum(len(s) for s in self._subscribers.values()),
+        }
+
+
+def request_session(server: Server) -> Optional[Any]:
+    """Get the session of the request being handled, or None outside a request."""
+    try:
+        return server.request_context.session
+    except LookupError:
+        return None
@@ -0,0 +1,142 @@
+"""
+Cursor pagination for listings and tool results.
+
+Each listing is sorted once per data generation and kept as a snapshot, so
+a client paging through it sees one consistent ordering even if specs are
+reloaded part-way. Cursors are opaque to clients; they record the listing,
+the generation it was taken at, the offset and the last key served. If that
+generation's snapshot has been evicted, paging resumes after the last key
+in the current snapshot, so nothing is repeated and unchanged entries are
+not skipped.
+"""
+
+import base64
+import binascii
+import json
+from bisect import bisect_right
+from typing import Any, Callable, Hashable, Iterable, Optional, TypeVar
+
+from .cache import LRUCache
+
+T = TypeVar("T")
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def encode_cursor(listing: str, generation: int, offset: int, last_key: str) -> str:
+    """Encode a page position as an opaque cursor."""
+    payload = json.dumps([listing, generation, offset, last_key], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> tuple[str, int, int, str]:
+    """
+    Decode a cursor produced by `encode_cursor`.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        listing, generation, offset, last_key = json.loads(base64.urlsafe_b64decode(cursor))
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+    if not (
+        isinstance(listing, str)
+        and isinstance(generation, int)
+        and isinstance(offset, int)
+        and isinstance(last_key, str)
+        and offset >= 0
+    ):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return listing, generation, offset, last_key
+
+
+def normalise_limit(limit: Any, default: int = DEFAULT_PAGE_SIZE) -> int:
+    """
+    Validate a `limit` tool argument, clamping it to MAX_PAGE_SIZE.
+
+    Raises:
+        ValueError: If `limit` is not a positive integer.
+    """
+    if limit is None:
+        return default
+    if isinstance(limit, bool) or not isinstance(limit, int) or limit < 1:
+        raise ValueError("limit must be a positive integer")
+    return min(limit, MAX_PAGE_SIZE)
+
+
+class Paginator:
+    """
+    Serves pages of sorted listing snapshots.
+    """
+
+    def __init__(self, page_size: int = DEFAULT_PAGE_SIZE, max_snapshots: int = 16):
+        """
+        Initialise the paginator.
+
+        Args:
+            page_size: Entries per page when the caller gives no limit.
+            max_snapshots: Number of (listing, generation) snapshots kept.
+        """
+        self.page_size = page_size
+        self._snapshots: LRUCache[tuple[list, list[str]]] = LRUCache(max_snapshots)
+
+    def _snapshot(
+        self,
+        key: Hashable,
+        build: Callable[[], Iterable[T]],
+        sort_key: Callable[[T], str],
+    ) -> tuple[list[T], list[str]]:
+        """Get or build a sorted snapshot and its keys."""
+        snapshot = self._snapshots.get(key)
+        if snapshot is None:
+            items = sorted(build(), key=sort_key)
+            snapshot = (items, [sort_key(item) for item in items])
+            self._snapshots.put(key, snapshot)
+        return snapshot
+
+    def page(
+        self,
+        listing: str,
+        generation: int,
+        build: Callable[[], Iterable[T]],
+        sort_key: Callable[[T], str],
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> tuple[list[T], Optional[str]]:
+        """
+        Get one page of a listing.
+
+        Args:
+            listing: Name identifying the listing, including any query.
+            generation: Current generation of the underlying data.
+            build: Produces the listing's entries on a snapshot miss.
+            sort_key: Unique, stable key to order entries by.
+            cursor: Cursor from the previous page, or None for the first.
+            limit: Page size, or None for the default.
+
+        Returns:
+            (entries, cursor for the next page or None on the last page)
+
+        Raises:
+            ValueError: If the cursor is malformed or for another listing.
+        """
+        limit = limit or self.page_size
+        offset = 0
+        if cursor:
+            cursor_listing, cursor_generation, offset, last_key = decode_cursor(cursor)
+            if cursor_listing != listing:
+                raise ValueError("Cursor belongs to a different listing")
+            if (listing, cursor_generation) in self._snapshots:
+                generation = cursor_generation
+            else:
+                _items, keys = self._snapshot((listing, generation), build, sort_key)
+                offset = bisect_right(keys, last_key)
+
+        items, keys = self._snapshot((listing, generation), build, sort_key)
+        page = items[offset:offset + limit]
+        end = offset + len(page)
+        if end >= len(items) or not page:
+            return page, None
+        return page, encode_cursor(listing, generation, end, keys[end - 1])
@@ -0,0 +1,304 @@
+"""
+Splitting spec prompts into heading sections.
+
+Prompts are markdown; a section runs from one heading to the next heading
+of the same or a higher level. Headings inside fenced code blocks (such as
+the notepad template) do not start sections. Joining the text of every
+section reproduces the prompt exactly.
+
+Each section carries an approximate token count so prompts can be trimmed
+to a client's token budget, keeping the most important sections.
+
+Sections are addressed by content hash. `SectionStore` keeps each distinct
+section once and holds prompts as references to them, and multi-spec
+responses send sections shared between specs once.
+"""
+
+import re
+import weakref
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Optional, Sequence, Union
+
+from .compression import CompressedPrompt, PromptStore
+from .serialise import content_hash
+
+_HEADING = re.compile(r"(#{1,6})[ \t]+(.*?)[ \t#]*$")
+_TOKEN = re.compile(r"\w+|[^\w\s]")
+_PHASE = re.compile(r"^(?:phase\s*)?(\d+)\s*[.:]", re.IGNORECASE)
+
+# Section priorities by title, most important first; unmatched sections
+# get DEFAULT_PRIORITY and phases other than the current one PHASE_PRIORITY
+CURRENT_PHASE_PRIORITY = 1
+DEFAULT_PRIORITY = 4
+PHASE_PRIORITY = 5
+_PRIORITIES = [
+    (re.compile(r"^(system prompt|goal|your role)", re.IGNORECASE), 0),
+    (re.compile(r"important execution|constraint|abort conditions|scope check", re.IGNORECASE), 2),
+    (re.compile(r"^(workflow modes|overview|executing instructions|tasks|output)$|workflow to execute|^systematic", re.IGNORECASE), 3),
+    (re.compile(r"mindset|self-development|troubleshooting|integration with other", re.IGNORECASE), 6),
+    (re.compile(r"notepad", re.IGNORECASE), 8),
+    (re.compile(r"diagram", re.IGNORECASE), 9),
+]
+
+# A section reference in a deduplicated prompt
+SectionRef = dict[str, str]
+
+
+@dataclass(frozen=True)
+class Section:
+    """One heading section of a prompt."""
+    title: str
+    level: int
+    text: str
+    tokens: int = 0
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Approximate the number of tokens a model's tokenizer would produce.
+
+    Counts words and punctuation marks, charging long words one extra
+    token per eight characters. This runs offline and needs no vocabulary;
+    it is meant for budgeting, not exact accounting.
+    """
+    return sum(1 + len(token) // 8 for token in _TOKEN.findall(text))
+
+
+def section_priority(section: Section, phase: Optional[int] = None) -> int:
+    """
+    Get a section's priority for budgeted delivery (lower is kept first).
+
+    The goal comes first, then the current phase and the constraints; the
+    notepad template and the diagram come last.
+    """
+    if section.level == 0:
+        return 0
+    match = _PHASE.match(section.title)
+    if match:
+        return CURRENT_PHASE_PRIORITY if phase is not None and int(match.group(1)) == phase else PHASE_PRIORITY
+    for pattern, priority in _PRIORITIES:
+        if pattern.search(section.title):
+            return priority
+    return DEFAULT_PRIORITY
+
+
+def fit_sections(
+    sections: Sequence[Section],
+    max_tokens: int,
+    phase: Optional[int] = None,
+) -> tuple[str, list[str]]:
+    """
+    Pick the highest-priority sections that fit a token budget.
+
+    Args:
+        sections: Sections of one prompt, in order.
+        max_tokens: Token budget for the returned text.
+        phase: Current phase number, whose section is kept early.
+
+    Returns:
+        (text of the kept sections in their original order, titles of the
+        omitted sections)
+    """
+    ranked = sorted(range(len(sections)), key=lambda i: (section_priority(sections[i], phase), i))
+    kept: set[int] = set()
+    remaining = max_tokens
+    for i in ranked:
+        if sections[i].tokens <= remaining:
+            kept.add(i)
+            remaining -= sections[i].tokens
+    text = "".join(section.text for i, section in enumerate(sections) if i in kept)
+    omitted = [section.title for i, section in enumerate(sections) if i not in kept]
+    return text, omitted
+
+
+def split_sections(text: str, max_level: int = 3) -> list[Section]:
+    """
+    Split a prompt at markdown headings.
+
+    Args:
+        text: Prompt text.
+        max_level: Deepest heading level that starts a new section; deeper
+            headings stay inside their parent section.
+
+    Returns:
+        Sections in order. Text before the first heading forms a section
+        with an empty title and level 0.
+    """
+    sections: list[Section] = []
+    title, level, lines = "", 0, []
+    in_fence = False
+    for line in text.splitlines(keepends=True):
+        stripped = line.strip()
+        if stripped.startswith("```"):
+            in_fence = not in_fence
+        elif not in_fence and (match := _HEADING.match(stripped)) and len(match.group(1)) <= max_level:
+            if lines:
+                sections.append(_section(title, level, lines))
+            title, level, lines = match.group(2), len(match.group(1)), []
+        lines.append(line)
+    if lines:
+        sections.append(_section(title, level, lines))
+    return sections
+
+
+def _section(title: str, level: int, lines: list[str]) -> Section:
+    """Build a section, counting its tokens."""
+    text = "".join(lines)
+    return Section(title, level, text, estimate_tokens(text))
+
+
+def section_items(text: str) -> list[tuple[str, str]]:
+    """Split a prompt into (content hash, text) pairs, one per section."""
+    return [(content_hash(section.text), section.text) for section in split_sections(text)]
+
+
+def dedupe_sections(
+    prompts: dict[str, str],
+) -> tuple[dict[str, list[Union[str, SectionRef]]], dict[str, str]]:
+    """
+    Factor out sections that appear in more than one of the given prompts.
+
+    Args:
+        prompts: Prompt text keyed by spec name.
+
+    Returns:
+        See `dedupe_items`.
+    """
+    return dedupe_items({name: section_items(text) for name, text in prompts.items()})
+
+
+def dedupe_items(
+    prompts: dict[str, Sequence[tuple[str, str]]],
+) -> tuple[dict[str, list[Union[str, SectionRef]]], dict[str, str]]:
+    """
+    Factor out sections that appear in more than one prompt.
+
+    Args:
+        prompts: (content hash, text) pairs for each prompt's sections,
+            keyed by spec name.
+
+    Returns:
+        (parts per spec, shared sections keyed by content hash). Each spec's
+        parts are literal strings and `{"ref": <hash>}` references to shared
+        sections; concatenating them in order reproduces the prompt.
+    """
+    seen: dict[str, int] = {}
+    for items in prompts.values():
+        for digest in {digest for digest, _text in items}:
+            seen[digest] = seen.get(digest, 0) + 1
+
+    shared: dict[str, str] = {}
+    parts: dict[str, list[Union[str, SectionRef]]] = {}
+    for name, items in prompts.items():
+        spec_parts: list[Union[str, SectionRef]] = []
+        for digest, text in items:
+            if seen[digest] > 1:
+                shared[digest] = text
+                spec_parts.append({"ref": digest})
+            elif spec_parts and isinstance(spec_parts[-1], str):
+                spec_parts[-1] += text
+            else:
+                spec_parts.append(text)
+        parts[name] = spec_parts
+    return parts, shared
+
+
+class SectionPrompt:
+    """
+    A prompt held as references to sections in a `SectionStore`.
+    """
+
+    __slots__ = ("digests", "parts", "size", "__weakref__")
+
+    def __init__(
+        self,
+        digests: tuple[str, ...],
+        parts: tuple[Union[str, CompressedPrompt], ...],
+        size: int,
+    ):
+        self.digests = digests
+        # The stored sections themselves, so a prompt stays readable after
+        # the store drops sections no longer in use
+        self.parts = parts
+        # Length of the text
+        self.size = size
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, SectionPrompt) and self.digests == other.digests
+
+    def __hash__(self) -> int:
+        return hash(self.digests)
+
+    def items(self) -> Iterator[tuple[str, str]]:
+        """Get (content hash, text) for each section."""
+        for digest, part in zip(self.digests, self.parts):
+            yield digest, part if isinstance(part, str) else part.text()
+
+    def text(self) -> str:
+        """Get the prompt text."""
+        return "".join(text for _digest, text in self.items())
+
+
+class SectionStore:
+    """
+    Content-addressed store keeping each distinct prompt section once.
+    """
+
+    def __init__(self, prompt_store: Optional[PromptStore] = None):
+        """
+        Initialise the store.
+
+        Args:
+            prompt_store: Store to compress each section with, or None to
+                keep sections as text.
+        """
+        self.prompt_store = prompt_store
+        # Content hash -> (the same hash object, stored section, text length)
+        self._sections: dict[str, tuple[str, Union[str, CompressedPrompt], int]] = {}
+        self._prompts: weakref.WeakSet[SectionPrompt] = weakref.WeakSet()
+
+    def __len__(self) -> int:
+        return len(self._sections)
+
+    def put(self, sections: Iterable[Section]) -> SectionPrompt:
+        """Store a prompt's sections, reusing any already stored."""
+        digests = []
+        parts = []
+        size = 0
+        for section in sections:
+            digest = content_hash(section.text)
+            entry = self._sections.get(digest)
+            if entry is None:
+                part = section.text
+                if self.prompt_store is not None:
+                    part = self.prompt_store.compress(part)
+                entry = (digest, part, len(section.text))
+                self._sections[digest] = entry
+            digests.append(entry[0])
+            parts.append(entry[1])
+            size += entry[2]
+        prompt = SectionPrompt(tuple(digests), tuple(parts), size)
+        self._prompts.add(prompt)
+        return prompt
+
+    def retain(self, prompts: Iterable[object]) -> None:
+        """Drop sections not referenced by any of the given prompt bodies."""
+        live = {
+            digest
+            for prompt in prompts
+            if isinstance(prompt, SectionPrompt)
+            for digest in prompt.digests
+        }
+        self._sections = {digest: entry for digest, entry in self._sections.items() if digest in live}
+
+    def stats(self) -> dict[str, int]:
+        """Get section counts and the bytes saved by sharing sections."""
+        return {
+            "prompts": len(self._prompts),
+            "sections": len(self._sections),
+            "stored_chars": sum(size for _digest, _part, size in self._sections.values()),
+            "referenced_chars": sum(prompt.size for prompt in self._prompts),
+        }
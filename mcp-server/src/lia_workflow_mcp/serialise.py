@@ -0,0 +1,158 @@
+"""
+JSON serialisation helpers for spec listings.
+
+Each spec keeps its own pre-encoded JSON fragments; listings are assembled
+from those fragments textually rather than re-encoding every spec. The
+assembled text is identical to `json.dumps(..., indent=2)` (or the compact
+form) of the equivalent list.
+"""
+
+import hashlib
+import json
+from typing import Any, Iterable, Optional, Sequence
+from urllib.parse import parse_qs, urlsplit
+
+_COMPACT_SEPARATORS = (",", ":")
+
+
+def normalise_fields(fields: Any) -> Optional[tuple[str, ...]]:
+    """
+    Validate a `fields` tool argument.
+
+    Returns:
+        Tuple of field names, or None to include every field.
+
+    Raises:
+        ValueError: If `fields` is not a list of strings.
+    """
+    if fields is None:
+        return None
+    if isinstance(fields, str):
+        fields = [f.strip() for f in fields.split(",") if f.strip()]
+    if not isinstance(fields, (list, tuple)) or not all(isinstance(f, str) for f in fields):
+        raise ValueError("fields must be a list of field names")
+    return tuple(fields) or None
+
+
+def project(data: dict, fields: Optional[Sequence[str]]) -> dict:
+    """Keep only the requested fields, in the requested order."""
+    if fields is None:
+        return data
+    return {name: data[name] for name in fields if name in data}
+
+
+def encode(data: Any, compact: bool = False, level: int = 0) -> str:
+    """
+    Encode a value as it would appear nested `level` deep in indented JSON.
+
+    Args:
+        data: Value to encode.
+        compact: Use no indentation or spaces.
+        level: Nesting depth at which the value will be placed.
+    """
+    if compact:
+        return json.dumps(data, separators=_COMPACT_SEPARATORS, ensure_ascii=False)
+    text = json.dumps(data, indent=2)
+    if level:
+        text = text.replace("\n", "\n" + "  " * level)
+    return text
+
+
+def json_array(fragments: Iterable[str], compact: bool = False, level: int = 0) -> str:
+    """
+    Join pre-encoded elements into a JSON array.
+
+    Args:
+        fragments: Elements encoded with `encode(..., level=level + 1)`.
+        compact: Whether the fragments are compact.
+        level: Nesting depth of the array itself.
+    """
+    fragments = list(fragments)
+    if not fragments:
+        return "[]"
+    if compact:
+        return "[" + ",".join(fragments) + "]"
+    inner = "  " * (level + 1)
+    return "[\n" + inner + (",\n" + inner).join(fragments) + "\n" + "  " * level + "]"
+
+
+def json_object(items: Iterable[tuple[str, str]], compact: bool = False, level: int = 0) -> str:
+    """
+    Join pre-encoded values into a JSON object.
+
+    Args:
+        items: (key, value) pairs, values encoded for depth `level + 1`.
+        compact: Whether the values are compact.
+        level: Nesting depth of the object itself.
+    """
+    members = [(json.dumps(key), value) for key, value in items]
+    if not members:
+        return "{}"
+    if compact:
+        return "{" + ",".join(f"{key}:{value}" for key, value in members) + "}"
+    inner = "  " * (level + 1)
+    body = (",\n" + inner).join(f"{key}: {value}" for key, value in members)
+    return "{\n" + inner + body + "\n" + "  " * level + "}"
+
+
+def content_hash(text: str | bytes) -> str:
+    """Get a short, stable hash of a serialised body."""
+    if isinstance(text, str):
+        text = text.encode("utf-8")
+    return hashlib.blake2b(text, digest_size=16).hexdigest()
+
+
+def split_conditional_uri(uri: str) -> tuple[str, Optional[str]]:
+    """
+    Split an `if_none_match` query off a resource URI.
+
+    Returns:
+        (URI without the query, expected content hash or None)
+    """
+    uri = str(uri)
+    if "?" not in uri:
+        return uri, None
+    base, _, query = uri.partition("?")
+    values = parse_qs(urlsplit("?" + query).query).get("if_none_match")
+    return base, values[0] if values else None
+
+
+def not_modified(digest: str) -> str:
+    """Get the body returned instead of content whose hash the client already has."""
+    return json.dumps({"not_modified": True, "content_hash": digest}, separators=_COMPACT_SEPARATORS)
+
+
+class FragmentCache:
+    """
+    Per-object cache of encoded projections, keyed by fields and layout.
+
+    Clients choose the `fields` they send, so only the most recently used
+    `MAX_ENTRIES` projections are kept.
+    """
+
+    __slots__ = ("_fragments",)
+
+    MAX_ENTRIES = 8
+
+    def __init__(self):
+        # Insertion-ordered, least recently used first
+        self._fragments: dict[tuple, str] = {}
+
+    def get(self, data_factory, fields: Optional[tuple[str, ...]], compact: bool, level: int) -> str:
+        """
+        Get the encoded projection, encoding it on first use.
+
+        Args:
+            data_factory: Called to produce the full dictionary on a miss.
+            fields: Fields to keep, or None for all.
+            compact: Whether to encode compactly.
+            level: Nesting depth the fragment will be placed at.
+        """
+        key = (fields, compact, 0 if compact else level)
+        fragment = self._fragments.pop(key, None)
+        if fragment is None:
+            fragment = encode(project(data_factory(), fields), compact, level)
+            if len(self._fragments) >= self.MAX_ENTRIES:
+                del self._fragments[next(iter(self._fragments))]
+        self._fragments[key] = fragment
+        return fragment
@@ -32,11 +32,15 @@ import json
 import os
 import re
 from pathlib import Path
-from typing import Any, Sequence
+from typing import Any, Callable, Optional, Sequence
 
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import (
+    ListPromptsRequest,
+    ListPromptsResult,
+    ListResourcesRequest,
+    ListResourcesResult,
     Resource,
     ResourceContents,
     TextResourceContents,
@@ -47,8 +51,26 @@ from mcp.types import (
     PromptArgument,
 )
 
-from .models import SpecCollection, SpecCategory, WorkflowSpec
+from .cache import GenerationCache, LRUCache
+from .compression import DEFAULT_HOT_BYTES, PromptStore
+from .lazy import LazyPrompts
+from .models import TRIGGERS_FILE, SpecCollection, SpecCategory, WorkflowSpec
+from .notifications import ResourceNotifier, request_session, subscribable_options
+from .pagination import Paginator, normalise_limit
+from .sections import SectionStore, dedupe_items, estimate_tokens, fit_sections
+from .serialise import (
+    content_hash,
+    encode,
+    json_array,
+    json_object,
+    normalise_fields,
+    not_modified,
+    split_conditional_uri,
+)
+from .similarity import normalise_threshold
+from .template import PromptRenderer
 from .triggers import TriggerManager
+from .watcher import SpecWatcher
 
 
 # Initialise MCP server
@@ -58,6 +80,52 @@ server = Server("lia-workflow-specs")
 spec_collection = SpecCollection()
 trigger_manager = TriggerManager()
 
+# Serialised resource bodies, valid until the spec collection is replaced
+_resource_cache: GenerationCache[str] = GenerationCache()
+
+# Resource and prompt listings and resource content hashes, valid until the
+# spec collection is replaced
+_listing_cache: GenerationCache[Any] = GenerationCache()
+
+# Parts of a spec that get_specs_batch can return
+BATCH_PARTS = ("prompt", "metadata", "phases")
+
+# Sorted listing snapshots for cursor pagination
+_paginator = Paginator()
+
+# Resource subscriptions and the content hashes last announced to clients
+notifier = ResourceNotifier()
+
+# Compiled spec prompts and recent renders for prompt requests
+_renderer = PromptRenderer()
+
+# Tools whose output depends only on their arguments, the loaded specs and
+# the trigger definitions
+CACHEABLE_TOOLS = frozenset({
+    "search_specs",
+    "recommend_workflow",
+    "get_spec_details",
+    "get_specs_batch",
+    "list_specs_by_category",
+    "get_workflow_phases",
+    "get_workflow_diagram",
+    "validate_spec",
+    "compare_specs",
+    "related_specs",
+    "find_near_duplicates",
+    "get_execution_guide",
+    "get_phase_checklist",
+    "suggest_workflow_sequence",
+    "get_workflow_chain",
+    "list_workflow_chains",
+    "plan_workflow_for_outputs",
+})
+
+# Rendered tool results keyed by (tool, normalised arguments, spec
+# generation, trigger generation)
+_tool_cache: LRUCache[list[TextContent]] = LRUCache(max_entries=512, max_bytes=16 * 1024 * 1024)
+_tool_cache_counts: dict[str, list[int]] = {}
+
 
 def get_specs_directory() -> Path:
     """Get the specs directory path from environment or default."""
@@ -86,20 +154,95 @@ def initialise_specs():
     Loads all workflow specs from the specs directory and configures
     the trigger manager for workflow chaining recommendations.
     """
-    global trigger_manager
     specs_dir = get_specs_directory()
+    hot_bytes = int(os.environ.get("LIA_HOT_PROMPT_BYTES", DEFAULT_HOT_BYTES))
+    if os.environ.get("LIA_LAZY_PROMPTS") == "1" and spec_collection.lazy_prompts is None:
+        spec_collection.lazy_prompts = LazyPrompts(spec_collection.read_prompt, hot_bytes)
+    if os.environ.get("LIA_COMPRESS_PROMPTS") == "1" and spec_collection.prompt_store is None:
+        spec_collection.prompt_store = PromptStore(hot_bytes)
+    if os.environ.get("LIA_SHARE_SECTIONS") == "1" and spec_collection.section_store is None:
+        spec_collection.section_store = SectionStore(spec_collection.prompt_store)
     spec_collection.load_from_directory(specs_dir)
-    trigger_manager = TriggerManager(specs_dir)
+    trigger_manager.reload(specs_dir)
+    notifier.diff(resource_hashes())
+
+
+async def apply_spec_changes(paths: set[Path]) -> None:
+    """
+    Apply on-disk changes reported by the spec watcher.
+    
+    Only the affected specs are re-parsed, off the event loop, and the new
+    collection is published in one step. Trigger definitions are reloaded
+    when workflow-triggers.toml changes. Subscribers are then notified of
+    resources whose content actually changed.
+    """
+    await asyncio.to_thread(spec_collection.reload_paths, paths)
+    if any(path.name == TRIGGERS_FILE for path in paths):
+        trigger_manager.reload(get_specs_directory())
+    await notifier.publish(resource_hashes())
+
+
+def resource_hashes() -> dict[str, str]:
+    """
+    Get the content hash of every resource, keyed by URI.
+    
+    Hashes are computed once per collection generation.
+    """
+    return _listing_cache.get_or_build("hashes", spec_collection.generation, _build_resource_hashes)
+
+
+def _build_resource_hashes() -> dict[str, str]:
+    """Hash every resource body; derived bodies come from the resource cache."""
+    hashes = {
+        "specs://index": content_hash(_cached_resource_text("specs://index", _build_index_text)),
+        "specs://categories": content_hash(
+            _cached_resource_text("specs://categories", _build_categories_text)
+        ),
+        "specs://summary": content_hash(_cached_resource_text("specs://summary", generate_quick_reference)),
+    }
+    for spec in spec_collection.snapshot().specs:
+        uri = f"specs://{spec.category.value}/{spec.name}"
+        hashes[uri] = spec.content_hash
+        hashes[f"{uri}/metadata"] = content_hash(spec.to_json())
+    return hashes
 
 
 # ============================================================================
 # RESOURCES
 # ============================================================================
 
-@server.list_resources()
 async def list_resources() -> list[Resource]:
-    """List all available resources."""
+    """List all available resources, built once per collection generation."""
+    return list(_listing_cache.get_or_build(
+        "resources", spec_collection.generation, _build_resources
+    ))
+
+
+@server.list_resources()
+async def list_resources_page(request: ListResourcesRequest) -> ListResourcesResult:
+    """
+    Serve one page of the resource listing, sorted by URI.
+    
+    Pages come from a snapshot of the listing taken when the first page was
+    requested, so iteration is unaffected by reloads.
+    """
+    session = request_session(server)
+    if session is not None:
+        notifier.track(session)
+    resources, next_cursor = _paginator.page(
+        "resources",
+        spec_collection.generation,
+        lambda: _listing_cache.get_or_build("resources", spec_collection.generation, _build_resources),
+        lambda resource: str(resource.uri),
+        request.params.cursor if request.params else None,
+    )
+    return ListResourcesResult(resources=resources, nextCursor=next_cursor)
+
+
+def _build_resources() -> list[Resource]:
+    """Build the resource listing for the current spec collection."""
     resources = []
+    hashes = resource_hashes()
     
     # Add index resource
     resources.append(Resource(
@@ -107,6 +250,7 @@ async def list_resources() -> list[Resource]:
         name="Workflow Specs Index",
         description="Complete index of all available workflow specifications",
         mimeType="application/json",
+        _meta={"content_hash": hashes["specs://index"]},
     ))
     
     # Add categories resource
@@ -115,23 +259,27 @@ async def list_resources() -> list[Resource]:
         name="Spec Categories",
         description="List of all spec categories and their workflows",
         mimeType="application/json",
+        _meta={"content_hash": hashes["specs://categories"]},
     ))
     
     # Add individual spec resources
-    for spec in spec_collection.specs:
+    for spec in spec_collection.snapshot().specs:
+        uri = f"specs://{spec.category.value}/{spec.name}"
         resources.append(Resource(
-            uri=f"specs://{spec.category.value}/{spec.name}",
+            uri=uri,
             name=f"{spec.name} Workflow Spec",
             description=spec.description[:100] + "..." if len(spec.description) > 100 else spec.description,
             mimeType="text/plain",
+            _meta={"content_hash": hashes.get(uri)},
         ))
         
         # Add metadata resource for each spec
         resources.append(Resource(
-            uri=f"specs://{spec.category.value}/{spec.name}/metadata",
+            uri=f"{uri}/metadata",
             name=f"{spec.name} Metadata",
             description=f"Metadata and structure for {spec.name} workflow",
             mimeType="application/json",
+            _meta={"content_hash": hashes.get(f"{uri}/metadata")},
         ))
     
     # Add summary resource
@@ -140,6 +288,7 @@ async def list_resources() -> list[Resource]:
         name="Quick Reference Guide",
         description="Brief overview of all workflows and when to use them",
         mimeType="text/markdown",
+        _meta={"content_hash": hashes["specs://summary"]},
     ))
     
     return resources
@@ -147,43 +296,49 @@ async def list_resources() -> list[Resource]:
 
 @server.read_resource()
 async def read_resource(uri: str) -> ResourceContents:
-    """Read a resource by URI."""
+    """
+    Read a resource by URI.
+    
+    A `?if_none_match=<content_hash>` query returns a short "not modified"
+    body instead of the content when the hash still matches.
+    """
     
     # Parse URI
+    uri, expected_hash = split_conditional_uri(uri)
     if not uri.startswith("specs://"):
         raise ValueError(f"Invalid URI scheme: {uri}")
     
+    if expected_hash is not None and resource_hashes().get(uri) == expected_hash:
+        return TextResourceContents(
+            uri=uri,
+            mimeType="application/json",
+            text=not_modified(expected_hash),
+        )
+    
     path = uri[8:]  # Remove "specs://"
     
     # Handle index
     if path == "index":
-        index_data = {
-            "total_specs": len(spec_collection.specs),
-            "categories": spec_collection.get_categories(),
-            "specs": [spec.to_dict() for spec in spec_collection.specs],
-        }
         return TextResourceContents(
             uri=uri,
             mimeType="application/json",
-            text=json.dumps(index_data, indent=2),
+            text=_cached_resource_text(uri, _build_index_text),
         )
     
     # Handle categories
     if path == "categories":
-        categories_data = spec_collection.get_categories()
         return TextResourceContents(
             uri=uri,
             mimeType="application/json",
-            text=json.dumps(categories_data, indent=2),
+            text=_cached_resource_text(uri, _build_categories_text),
         )
     
     # Handle summary
     if path == "summary":
-        summary = generate_quick_reference()
         return TextResourceContents(
             uri=uri,
             mimeType="text/markdown",
-            text=summary,
+            text=_cached_resource_text(uri, generate_quick_reference),
         )
     
     # Handle individual specs
@@ -202,7 +357,7 @@ async def read_resource(uri: str) -> ResourceContents:
             return TextResourceContents(
                 uri=uri,
                 mimeType="application/json",
-                text=json.dumps(spec.to_dict(), indent=2),
+                text=_cached_resource_text(uri, lambda: json.dumps(spec.to_dict(), indent=2)),
             )
         else:
             return TextResourceContents(
@@ -214,15 +369,139 @@ async def read_resource(uri: str) -> ResourceContents:
     raise ValueError(f"Unknown resource: {uri}")
 
 
+@server.subscribe_resource()
+async def subscribe_resource(uri) -> None:
+    """Send the requesting session `resources/updated` when a resource changes."""
+    session = request_session(server)
+    if session is not None:
+        notifier.subscribe(str(uri), session)
+
+
+@server.unsubscribe_resource()
+async def unsubscribe_resource(uri) -> None:
+    """Stop sending the requesting session updates for a resource."""
+    session = request_session(server)
+    if session is not None:
+        notifier.unsubscribe(str(uri), session)
+
+
+def _cached_resource_text(uri: str, build) -> str:
+    """
+    Get a resource body, building it at most once per collection generation.
+    
+    Reloading the collection bumps its generation, which invalidates every
+    cached body at once.
+    """
+    return _resource_cache.get_or_build(uri, spec_collection.generation, build)
+
+
+def _build_index_text() -> str:
+    """Serialise the specs://index resource from per-spec fragments."""
+    specs = spec_collection.snapshot().specs
+    categories: dict[str, list[str]] = {}
+    for spec in specs:
+        categories.setdefault(spec.category.value, []).append(spec.name)
+    return json_object([
+        ("total_specs", encode(len(specs))),
+        ("categories", encode(categories, level=1)),
+        ("specs", json_array((spec.to_json(level=2) for spec in specs), level=1)),
+    ])
+
+
+def _build_categories_text() -> str:
+    """Serialise the specs://categories resource."""
+    return json.dumps(spec_collection.get_categories(), indent=2)
+
+
+def _spec_listing(
+    specs: list[WorkflowSpec],
+    arguments: dict[str, Any],
+    paged: bool = False,
+    next_cursor: Optional[str] = None,
+) -> str:
+    """
+    Assemble a JSON listing of specs honouring `fields` and `compact`.
+    
+    A paged listing is wrapped in an object with the next page's cursor.
+    """
+    fields = normalise_fields(arguments.get("fields"))
+    compact = bool(arguments.get("compact", False))
+    if not paged:
+        return json_array((spec.to_json(fields, compact, level=1) for spec in specs), compact)
+    return json_object([
+        ("specs", json_array((spec.to_json(fields, compact, level=2) for spec in specs), compact, level=1)),
+        ("next_cursor", encode(next_cursor, compact)),
+    ], compact)
+
+
+def _page_specs(
+    listing: str,
+    build: Callable[[], list[WorkflowSpec]],
+    arguments: dict[str, Any],
+) -> tuple[list[WorkflowSpec], Optional[str], bool]:
+    """
+    Apply `limit` and `cursor` tool arguments to a spec listing.
+    
+    Returns:
+        (specs, next page cursor, whether the listing was paged)
+    """
+    if "limit" not in arguments and "cursor" not in arguments:
+        return build(), None, False
+    specs, next_cursor = _paginator.page(
+        listing,
+        spec_collection.generation,
+        build,
+        lambda spec: f"{spec.category.value}/{spec.name}",
+        arguments.get("cursor"),
+        normalise_limit(arguments.get("limit")),
+    )
+    return specs, next_cursor, True
+
+
+def budgeted_prompt(spec: WorkflowSpec, max_tokens: int, phase: int | None = None) -> str:
+    """
+    Get as much of a spec's prompt as fits a token budget.
+    
+    Sections are kept in priority order using the token counts computed
+    when the spec was loaded: goal, current phase and constraints first,
+    the notepad template and diagram last. Omitted sections are listed in
+    a closing note.
+    """
+    text, omitted = fit_sections(spec.sections, max_tokens, phase)
+    if not omitted:
+        return text
+    # Refit with room for the note, which lists every section at most
+    note = _omitted_note(spec, [section.title for section in spec.sections])
+    text, omitted = fit_sections(spec.sections, max_tokens - estimate_tokens(note), phase)
+    return text.rstrip("\n") + _omitted_note(spec, omitted)
+
+
+def _omitted_note(spec: WorkflowSpec, omitted: list[str]) -> str:
+    """Build the note listing sections left out of a budgeted prompt."""
+    titles = ", ".join(title or "Introduction" for title in omitted)
+    return (
+        f"\n\n> Omitted to fit the token budget: {titles}. "
+        f"Use the get_spec_prompt tool with spec_name '{spec.name}' for the full workflow."
+    )
+
+
 def generate_quick_reference() -> str:
-    """Generate a quick reference guide for all workflows."""
-    categories = spec_collection.get_categories()
+    """
+    Generate a quick reference guide for all workflows.
+    
+    Built in a single pass over the collection; the specs://summary resource
+    caches the result per collection generation.
+    """
+    specs = spec_collection.snapshot().specs
+    by_category: dict[str, list[WorkflowSpec]] = {}
+    for spec in specs:
+        by_category.setdefault(spec.category.value, []).append(spec)
     
     lines = [
         "# Lia Workflow Specs Quick Reference",
         "",
         "## Overview",
-        f"Total workflows available: {len(spec_collection.specs)}",
+        f"Total workflows available: {len(specs)}",
         "",
     ]
     
@@ -235,16 +514,14 @@ def generate_quick_reference() -> str:
         "strategy": "Drive innovation and integration initiatives",
     }
     
-    for category, spec_names in sorted(categories.items()):
+    for category, specs in sorted(by_category.items()):
         lines.append(f"## {category.replace('-', ' ').title()}")
         lines.append(category_descriptions.get(category, ""))
         lines.append("")
         
-        for spec_name in sorted(spec_names):
-            spec = spec_collection.get_by_name(spec_name)
-            if spec:
-                short_desc = spec.description[:80] + "..." if len(spec.description) > 80 else spec.description
-                lines.append(f"- **{spec_name}**: {short_desc}")
+        for spec in sorted(specs, key=lambda s: s.name):
+            short_desc = spec.description[:80] + "..." if len(spec.description) > 80 else spec.description
+            lines.append(f"- **{spec.name}**: {short_desc}")
         
         lines.append("")
     
@@ -277,13 +554,32 @@ def generate_quick_reference() -> str:
 # PROMPTS
 # ============================================================================
 
-@server.list_prompts()
 async def list_prompts() -> list[Prompt]:
-    """List all available prompt templates."""
+    """List all available prompt templates, built once per collection generation."""
+    return list(_listing_cache.get_or_build(
+        "prompts", spec_collection.generation, _build_prompts
+    ))
+
+
+@server.list_prompts()
+async def list_prompts_page(request: ListPromptsRequest) -> ListPromptsResult:
+    """Serve one page of the prompt listing, sorted by name."""
+    prompts, next_cursor = _paginator.page(
+        "prompts",
+        spec_collection.generation,
+        lambda: _listing_cache.get_or_build("prompts", spec_collection.generation, _build_prompts),
+        lambda prompt: prompt.name,
+        request.params.cursor if request.params else None,
+    )
+    return ListPromptsResult(prompts=prompts, nextCursor=next_cursor)
+
+
+def _build_prompts() -> list[Prompt]:
+    """Build the prompt listing for the current spec collection."""
     prompts = []
     
     # Add workflow starter prompts for each spec
-    for spec in spec_collection.specs:
+    for spec in spec_collection.snapshot().specs:
         prompts.append(Prompt(
             name=f"start-{spec.name}",
             description=f"Start a {spec.name} workflow session",
@@ -298,6 +594,29 @@ async def list_prompts() -> list[Prompt]:
                     description="Execution mode: 'collaboration' or 'silent'",
                     required=False,
                 ),
+                PromptArgument(
+                    name="task_name",
+                    description="Task name (directory name under .lia/), filled in for {task_name}",
+                    required=False,
+                ),
+                PromptArgument(
+                    name="workspace",
+                    description="Workspace root, filled in for ${WORKSPACE} and used to root .lia/ paths",
+                    required=False,
+                ),
+                PromptArgument(
+                    name="max_tokens",
+                    description=(
+                        "Token budget; lower-priority sections of the workflow are left out to fit. "
+                        "The task, mode and closing instructions around the workflow are never trimmed"
+                    ),
+                    required=False,
+                ),
+                PromptArgument(
+                    name="phase",
+                    description="Phase to start or continue from (default: 1)",
+                    required=False,
+                ),
             ],
         ))
     
@@ -339,6 +658,11 @@ async def list_prompts() -> list[Prompt]:
                     description="Task name (directory name under .lia/)",
                     required=True,
                 ),
+                PromptArgument(
+                    name="workspace",
+                    description="Workspace root, filled in for ${WORKSPACE} and used to root .lia/ paths",
+                    required=False,
+                ),
             ],
         ),
     ])
@@ -367,9 +691,28 @@ async def get_prompt(name: str, arguments: dict[str, str] | None = None) -> list
         
         task = args.get("task", "")
         mode = args.get("mode", "collaboration")
+        try:
+            max_tokens = int(args["max_tokens"]) if args.get("max_tokens") else None
+            phase = int(args["phase"]) if args.get("phase") else None
+        except ValueError:
+            return [PromptMessage(
+                role="user",
+                content=TextContent(
+                    type="text",
+                    text="Error: max_tokens and phase must be whole numbers.",
+                ),
+            )]
+        if max_tokens is not None and max_tokens < 1:
+            return [PromptMessage(
+                role="user",
+                content=TextContent(
+                    type="text",
+                    text="Error: max_tokens must be a positive whole number.",
+                ),
+            )]
         
         # Build the prompt
-        prompt_text = f"""# Starting {spec.name} Workflow
+        head = f"""# Starting {spec.name} Workflow
 
 ## Task
 {task}
@@ -380,12 +723,25 @@ async def get_prompt(name: str, arguments: dict[str, str] | None = None) -> list
 ## Instructions
 You are now operating as a {spec.name} workflow agent. Follow the systematic workflow defined below.
 
-{spec.prompt}
+"""
+        tail = f"""
 
 ---
 
-**Begin the workflow now.** Start with Phase 1, creating the necessary directory structure and `0-notepad.md` file.
+**Begin the workflow now.** Start with Phase {phase or 1}, creating the necessary directory structure and `0-notepad.md` file.
 """
+        values = {
+            "task": task,
+            "task_name": args.get("task_name", ""),
+            "workflow": spec.name,
+            "workspace": args.get("workspace", ""),
+        }
+        if max_tokens is None:
+            body = _renderer.render(spec.prompt, values, spec.content_hash)
+        else:
+            budgeted = budgeted_prompt(spec, max_tokens - estimate_tokens(head + tail), phase)
+            body = _renderer.render(budgeted, values)
+        prompt_text = head + body + tail
         
         return [PromptMessage(
             role="user",
@@ -451,6 +807,7 @@ Please help me refine this workflow sequence for my project. Consider:
     elif name == "resume-workflow":
         workflow = args.get("workflow", "")
         task_name = args.get("task_name", "")
+        workspace = args.get("workspace", "")
         
         spec = spec_collection.get_by_name(workflow)
         if not spec:
@@ -462,6 +819,12 @@ Please help me refine this workflow sequence for my project. Consider:
                 ),
             )]
         
+        lia_dir = workspace.rstrip("/") + "/.lia" if workspace else ".lia"
+        body = _renderer.render(
+            spec.prompt,
+            {"task_name": task_name, "workflow": spec.name, "workspace": workspace},
+            spec.content_hash,
+        )
         prompt_text = f"""# Resume {workflow} Workflow
 
 ## Task
@@ -470,7 +833,7 @@ Please help me refine this workflow sequence for my project. Consider:
 ## Instructions
 You are resuming an interrupted {workflow} workflow session.
 
-1. First, read the existing files in `.lia/{workflow}/{task_name}/`:
+1. First, read the existing files in `{lia_dir}/{workflow}/{task_name}/`:
    - `0-notepad.md` - Review captured insights and assumptions
    - Any phase documents (1-*.md, 2-*.md, etc.)
 
@@ -479,7 +842,7 @@ You are resuming an interrupted {workflow} workflow session.
 3. Resume from the next incomplete phase
 
 ## Workflow Definition
-{spec.prompt}
+{body}
 
 ---
 
@@ -508,6 +871,11 @@ You are resuming an interrupted {workflow} workflow session.
 @server.list_tools()
 async def list_tools() -> list[Tool]:
     """List all available tools."""
+    return list(_TOOLS)
+
+
+def _build_tools() -> list[Tool]:
+    """Build the tool definitions; they do not depend on the loaded specs."""
     return [
         Tool(
             name="search_specs",
@@ -519,6 +887,23 @@ async def list_tools() -> list[Tool]:
                         "type": "string",
                         "description": "Search keyword or phrase to find relevant specs",
                     },
+                    "fields": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Return a JSON list with only these fields (e.g. ['name', 'category']) instead of markdown",
+                    },
+                    "compact": {
+                        "type": "boolean",
+                        "description": "Return unindented JSON instead of markdown (default: false)",
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": "Return at most this many specs, with a cursor for the next page",
+                    },
+                    "cursor": {
+                        "type": "string",
+                        "description": "Cursor from a previous page",
+                    },
                 },
                 "required": ["query"],
             },
@@ -562,6 +947,23 @@ async def list_tools() -> list[Tool]:
                         "description": "Category name (development, quality, problem-solving, research, knowledge, strategy)",
                         "enum": ["development", "quality", "problem-solving", "research", "knowledge", "strategy"],
                     },
+                    "fields": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Return a JSON list with only these fields (e.g. ['name', 'category']) instead of markdown",
+                    },
+                    "compact": {
+                        "type": "boolean",
+                        "description": "Return unindented JSON instead of markdown (default: false)",
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": "Return at most this many specs, with a cursor for the next page",
+                    },
+                    "cursor": {
+                        "type": "string",
+                        "description": "Cursor from a previous page",
+                    },
                 },
                 "required": ["category"],
             },
@@ -580,6 +982,20 @@ async def list_tools() -> list[Tool]:
                 "required": ["spec_name"],
             },
         ),
+        Tool(
+            name="get_workflow_diagram",
+            description="Get a workflow's Mermaid diagram parsed into nodes and edges, as compact JSON.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "spec_name": {
+                        "type": "string",
+                        "description": "Name of the spec to get the diagram for",
+                    },
+                },
+                "required": ["spec_name"],
+            },
+        ),
         Tool(
             name="validate_spec",
             description="Validate a workflow spec file for required sections and formatting.",
@@ -604,10 +1020,38 @@ async def list_tools() -> list[Tool]:
                         "type": "string",
                         "description": "Name of the spec to get the prompt for",
                     },
+                    "if_none_match": {
+                        "type": "string",
+                        "description": "Content hash of a cached copy; returns a short 'not modified' response if it is still current",
+                    },
                 },
                 "required": ["spec_name"],
             },
         ),
+        Tool(
+            name="get_specs_batch",
+            description="Get prompts, metadata and/or phases for several workflow specs in one call, e.g. a whole workflow chain. Optionally sends sections shared between the prompts only once.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "spec_names": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Names of the specs to fetch (e.g., ['spec', 'dev', 'test'])",
+                    },
+                    "include": {
+                        "type": "array",
+                        "items": {"type": "string", "enum": list(BATCH_PARTS)},
+                        "description": "Parts to return for each spec (default: ['prompt'])",
+                    },
+                    "dedupe": {
+                        "type": "boolean",
+                        "description": "Return prompts as parts referencing a shared_sections table, so sections common to several specs are sent once (default: false)",
+                    },
+                },
+                "required": ["spec_names"],
+            },
+        ),
         Tool(
             name="compare_specs",
             description="Compare two workflow specs to understand their differences and use cases.",
@@ -626,6 +1070,37 @@ async def list_tools() -> list[Tool]:
                 "required": ["spec1", "spec2"],
             },
         ),
+        Tool(
+            name="related_specs",
+            description="Find the workflow specs whose prompts are most similar to a given spec.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "spec_name": {
+                        "type": "string",
+                        "description": "Name of the spec to find related specs for",
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": "Maximum number of related specs to return (default: 5)",
+                    },
+                },
+                "required": ["spec_name"],
+            },
+        ),
+        Tool(
+            name="find_near_duplicates",
+            description="Report pairs of workflow specs whose prompts are nearly identical, to help spec authors spot duplication.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "threshold": {
+                        "type": "number",
+                        "description": "Minimum estimated similarity between 0 and 1 (default: 0.7)",
+                    },
+                },
+            },
+        ),
         Tool(
             name="get_execution_guide",
             description="Get a step-by-step execution guide for a workflow, including what to do at each phase and how to handle approvals.",
@@ -703,16 +1178,229 @@ async def list_tools() -> list[Tool]:
                 "properties": {},
             },
         ),
+        Tool(
+            name="changes_since",
+            description="Get the specs added, modified or removed since a cursor, for keeping a local copy of the catalogue in sync. Omit the cursor for a full listing.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "cursor": {
+                        "type": "string",
+                        "description": "Cursor returned by a previous call",
+                    },
+                },
+            },
+        ),
+        Tool(
+            name="get_cache_stats",
+            description="Get hit rates and sizes of the server's tool result and resource caches.",
+            inputSchema={
+                "type": "object",
+                "properties": {},
+            },
+        ),
+        Tool(
+            name="plan_workflow_for_outputs",
+            description="Find the shortest workflow sequence whose typical outputs cover all the requested artefacts, following trigger chaining order.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "outputs": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Artefacts to produce (e.g., 'requirements.md', 'implementation', 'test_suite')",
+                    },
+                    "start_workflow": {
+                        "type": "string",
+                        "description": "Optional workflow the sequence must start with",
+                    },
+                },
+                "required": ["outputs"],
+            },
+        ),
     ]
 
 
+_TOOLS = _build_tools()
+
+
 @server.call_tool()
 async def call_tool(name: str, arguments: dict[str, Any]) -> Sequence[TextContent]:
-    """Handle tool calls."""
+    """
+    Handle tool calls.
+    
+    Results of tools in CACHEABLE_TOOLS are memoised against the tool name,
+    the normalised arguments and the generations of the spec collection
+    and the trigger definitions, so a reload never serves stale output.
+    """
+    arguments = arguments or {}
+    try:
+        normalise_fields(arguments.get("fields"))
+    except ValueError as e:
+        return [TextContent(type="text", text=str(e))]
+    if name not in CACHEABLE_TOOLS:
+        return await _dispatch_tool(name, arguments)
+    
+    try:
+        normalised = json.dumps(arguments, sort_keys=True, separators=(",", ":"))
+    except (TypeError, ValueError):
+        return await _dispatch_tool(name, arguments)
+    
+    key = (name, normalised, spec_collection.generation, trigger_manager.generation)
+    counts = _tool_cache_counts.setdefault(name, [0, 0])
+    cached = _tool_cache.get(key)
+    if cached is not None:
+        counts[0] += 1
+        return list(cached)
+    
+    counts[1] += 1
+    result = list(await _dispatch_tool(name, arguments))
+    size = sum(len(item.text) for item in result if isinstance(item, TextContent))
+    _tool_cache.put(key, result, size)
+    return list(result)
+
+
+def batch_read(names: list[str], include: Sequence[str] = ("prompt",), dedupe: bool = False) -> dict:
+    """
+    Read several specs at once.
+    
+    Args:
+        names: Spec names or filenames, in the order to return them. Names
+            that resolve to the same spec return it once.
+        include: Any of "prompt", "metadata" and "phases".
+        dedupe: Replace prompt sections shared by two or more of the specs
+            with references into a `shared_sections` table.
+    
+    Raises:
+        ValueError: If `names` or `include` is not a list of strings, or
+            `include` names an unknown part.
+    """
+    if not isinstance(names, (list, tuple)) or not all(isinstance(n, str) for n in names):
+        raise ValueError("spec_names must be a list of spec names")
+    if not isinstance(include, (list, tuple)) or not all(isinstance(p, str) for p in include):
+        raise ValueError(f"include must be a list of parts. Valid parts: {', '.join(BATCH_PARTS)}")
+    unknown = [part for part in include if part not in BATCH_PARTS]
+    if unknown:
+        raise ValueError(f"Unknown parts: {', '.join(unknown)}. Valid parts: {', '.join(BATCH_PARTS)}")
+    
+    found: list[WorkflowSpec] = []
+    missing: list[str] = []
+    seen: set[int] = set()
+    for name in dict.fromkeys(names):
+        spec = spec_collection.get_by_name(name)
+        if spec is None:
+            missing.append(name)
+        elif id(spec) not in seen:
+            seen.add(id(spec))
+            found.append(spec)
+    
+    parts, shared = {}, {}
+    if dedupe and "prompt" in include:
+        parts, shared = dedupe_items({spec.name: spec.section_items() for spec in found})
+    
+    entries = []
+    for spec in found:
+        entry: dict[str, Any] = {
+            "name": spec.name,
+            "category": spec.category.value,
+            "content_hash": spec.content_hash,
+        }
+        if "prompt" in include:
+            if dedupe:
+                entry["prompt_parts"] = parts[spec.name]
+            else:
+                entry["prompt"] = spec.prompt
+        if "metadata" in include:
+            entry["metadata"] = spec.to_dict()
+        if "phases" in include:
+            entry["phases"] = [
+                {
+                    "number": phase.number,
+                    "name": phase.name,
+                    "description": phase.description,
+                    "output_file": phase.output_file,
+                    "constraints": phase.constraints,
+                }
+                for phase in spec.phases
+            ]
+        entries.append(entry)
+    
+    result: dict[str, Any] = {"specs": entries, "missing": missing}
+    if dedupe and "prompt" in include:
+        result["shared_sections"] = shared
+    return result
+
+
+def changes_since(cursor: str | None) -> dict:
+    """
+    Get the net spec changes since a cursor.
+    
+    Added and modified specs are listed with their category and content
+    hash. If the cursor is missing, expired or from another server process,
+    `reset` is true and every current spec is listed as added.
+    """
+    snapshot = spec_collection.snapshot()
+    net = spec_collection.changes.since(cursor)
+    by_name = {spec.name: spec for spec in snapshot.specs}
+    
+    def entry(spec: WorkflowSpec) -> dict:
+        return {"name": spec.name, "category": spec.category.value, "content_hash": spec.content_hash}
+    
+    result = {
+        "cursor": spec_collection.changes.cursor(snapshot.generation),
+        "reset": net is None,
+        "added": [],
+        "modified": [],
+        "removed": [],
+    }
+    if net is None:
+        result["added"] = [entry(spec) for spec in snapshot.specs]
+        return result
+    for name, kind in sorted(net.items()):
+        if kind == "removed":
+            result["removed"].append(name)
+        elif name in by_name:
+            # Changes newer than the snapshot are reported on the next call
+            result[kind].append(entry(by_name[name]))
+    return result
+
+
+def get_cache_stats() -> dict:
+    """Get statistics for the tool result, resource and template caches and prompt storage."""
+    def hit_rate(hits: int, misses: int) -> float:
+        total = hits + misses
+        return round(hits / total, 3) if total else 0.0
+    
+    tool_stats = _tool_cache.stats()
+    tool_stats["hit_rate"] = hit_rate(tool_stats["hits"], tool_stats["misses"])
+    tool_stats["by_tool"] = {
+        tool: {"hits": hits, "misses": misses, "hit_rate": hit_rate(hits, misses)}
+        for tool, (hits, misses) in sorted(_tool_cache_counts.items())
+    }
+    resource_stats = _resource_cache.stats()
+    resource_stats["hit_rate"] = hit_rate(resource_stats["hits"], resource_stats["misses"])
+    return {
+        "generation": spec_collection.generation,
+        "tools": tool_stats,
+        "resources": resource_stats,
+        "templates": _renderer.stats(),
+        "prompt_store": spec_collection.prompt_store.stats() if spec_collection.prompt_store else None,
+        "section_store": spec_collection.section_store.stats() if spec_collection.section_store else None,
+        "lazy_prompts": spec_collection.lazy_prompts.stats() if spec_collection.lazy_prompts else None,
+    }
+
+
+async def _dispatch_tool(name: str, arguments: dict[str, Any]) -> Sequence[TextContent]:
+    """Run a tool without consulting the result cache."""
     
     if name == "search_specs":
         query = arguments.get("query", "")
-        results = spec_collection.search(query)
+        results, next_cursor, paged = _page_specs(
+            f"search_specs:{query}", lambda: spec_collection.search(query), arguments
+        )
+        
+        if "fields" in arguments or "compact" in arguments:
+            return [TextContent(type="text", text=_spec_listing(results, arguments, paged, next_cursor))]
         
         if not results:
             return [TextContent(
@@ -725,6 +1413,8 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> Sequence[TextConten
             output.append(f"**{spec.name}** ({spec.category.value})")
             output.append(f"  {spec.description[:100]}...")
             output.append("")
+        if next_cursor:
+            output.append(f"More results: pass cursor `{next_cursor}`")
         
         return [TextContent(type="text", text="\n".join(output))]
     
@@ -769,7 +1459,14 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> Sequence[TextConten
                 text=f"Invalid category: {category_name}. Valid categories: {', '.join(c.value for c in SpecCategory)}",
             )]
         
-        specs = spec_collection.get_by_category(category)
+        specs, next_cursor, paged = _page_specs(
+            f"list_specs_by_category:{category.value}",
+            lambda: spec_collection.get_by_category(category),
+            arguments,
+        )
+        
+        if "fields" in arguments or "compact" in arguments:
+            return [TextContent(type="text", text=_spec_listing(specs, arguments, paged, next_cursor))]
         
         if not specs:
             return [TextContent(
@@ -780,6 +1477,8 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> Sequence[TextConten
         output = [f"Specs in category '{category_name}':\n"]
         for spec in specs:
             output.append(f"- **{spec.name}**: {spec.description[:80]}...")
+        if next_cursor:
+            output.append(f"\nMore results: pass cursor `{next_cursor}`")
         
         return [TextContent(type="text", text="\n".join(output))]
     
@@ -805,6 +1504,24 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> Sequence[TextConten
         
         return [TextContent(type="text", text="\n".join(output))]
     
+    elif name == "get_workflow_diagram":
+        spec_name = arguments.get("spec_name", "")
+        spec = spec_collection.get_by_name(spec_name)
+        
+        if not spec:
+            return [TextContent(
+                type="text",
+                text=f"Spec '{spec_name}' not found.",
+            )]
+        
+        if not spec.diagram:
+            return [TextContent(
+                type="text",
+                text=f"No Mermaid workflow diagram found in '{spec_name}'.",
+            )]
+        
+        return [TextContent(type="text", text=spec.diagram.json)]
+    
     elif name == "validate_spec":
         spec_name = arguments.get("spec_name", "")
         spec = spec_collection.get_by_name(spec_name)
@@ -828,8 +1545,22 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> Sequence[TextConten
                 text=f"Spec '{spec_name}' not found.",
             )]
         
+        if arguments.get("if_none_match") == spec.content_hash:
+            return [TextContent(type="text", text=not_modified(spec.content_hash))]
+        
         return [TextContent(type="text", text=spec.prompt)]
     
+    elif name == "get_specs_batch":
+        try:
+            result = batch_read(
+                arguments.get("spec_names", []),
+                arguments.get("include") or ("prompt",),
+                bool(arguments.get("dedupe", False)),
+            )
+        except ValueError as e:
+            return [TextContent(type="text", text=str(e))]
+        return [TextContent(type="text", text=json.dumps(result, indent=2))]
+    
     elif name == "compare_specs":
         spec1_name = arguments.get("spec1", "")
         spec2_name = arguments.get("spec2", "")
@@ -842,9 +1573,55 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> Sequence[TextConten
         if not spec2:
             return [TextContent(type="text", text=f"Spec '{spec2_name}' not found.")]
         
-        comparison = compare_specs(spec1, spec2)
+        similarity = spec_collection.similarity(spec1.name, spec2.name)
+        comparison = compare_specs(spec1, spec2, similarity)
         return [TextContent(type="text", text=comparison)]
     
+    elif name == "related_specs":
+        spec_name = arguments.get("spec_name", "")
+        try:
+            limit = normalise_limit(arguments.get("limit"), default=5)
+        except ValueError as e:
+            return [TextContent(type="text", text=str(e))]
+        
+        spec = spec_collection.get_by_name(spec_name)
+        if not spec:
+            return [TextContent(type="text", text=f"Spec '{spec_name}' not found.")]
+        
+        related = spec_collection.get_related(spec.name, limit)
+        if not related:
+            return [TextContent(type="text", text=f"No related specs found for '{spec_name}'.")]
+        
+        output = [f"Specs related to {spec.name}:\n"]
+        for other, score in related:
+            output.append(f"- **{other.name}** ({other.category.value}): {score:.0%} similar")
+        
+        return [TextContent(type="text", text="\n".join(output))]
+    
+    elif name == "find_near_duplicates":
+        try:
+            threshold = normalise_threshold(arguments.get("threshold"))
+        except ValueError as e:
+            return [TextContent(type="text", text=str(e))]
+        pairs = spec_collection.similarity_index().near_duplicates(threshold)
+        
+        if not pairs:
+            return [TextContent(
+                type="text",
+                text=f"No spec pairs are at least {threshold:.0%} similar.",
+            )]
+        
+        output = [
+            "# Near-Duplicate Specs",
+            "",
+            "| Spec | Spec | Similarity |",
+            "|------|------|------------|",
+        ]
+        for name1, name2, score in pairs:
+            output.append(f"| {name1} | {name2} | {score:.0%} |")
+        
+        return [TextContent(type="text", text="\n".join(output))]
+    
     elif name == "get_execution_guide":
         spec_name = arguments.get("spec_name", "")
         mode = arguments.get("mode", "collaboration")
@@ -929,6 +1706,50 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> Sequence[TextConten
         
         return [TextContent(type="text", text="\n".join(output))]
     
+    elif name == "changes_since":
+        return [TextContent(type="text", text=json.dumps(changes_since(arguments.get("cursor")), indent=2))]
+    
+    elif name == "get_cache_stats":
+        return [TextContent(type="text", text=json.dumps(get_cache_stats(), indent=2))]
+    
+    elif name == "plan_workflow_for_outputs":
+        outputs = arguments.get("outputs", [])
+        start = arguments.get("start_workflow")
+        
+        unknown = trigger_manager.unknown_outputs(outputs)
+        if unknown:
+            return [TextContent(
+                type="text",
+                text=f"No workflow typically produces: {', '.join(unknown)}",
+            )]
+        
+        plan = trigger_manager.plan_for_outputs(outputs, start)
+        if plan is None:
+            start_note = f" starting from '{start}'" if start else ""
+            return [TextContent(
+                type="text",
+                text=f"No workflow chain{start_note} produces all of: {', '.join(outputs)}",
+            )]
+        
+        output = [
+            "# Workflow Plan",
+            "",
+            f"**Goal**: {', '.join(outputs)}",
+            f"**Sequence**: {' → '.join(plan)}",
+            "",
+            "## Plan Details",
+            "",
+        ]
+        
+        for wf in plan:
+            output.append(f"### {wf}")
+            provides = trigger_manager.get_typical_outputs(wf)
+            if provides:
+                output.append(f"- **Provides**: {', '.join(provides)}")
+            output.append("")
+        
+        return [TextContent(type="text", text="\n".join(output))]
+    
     else:
         return [TextContent(
             type="text",
@@ -1000,8 +1821,13 @@ def validate_spec_content(spec: WorkflowSpec) -> str:
     return "\n".join(output)
 
 
-def compare_specs(spec1: WorkflowSpec, spec2: WorkflowSpec) -> str:
+def compare_specs(
+    spec1: WorkflowSpec,
+    spec2: WorkflowSpec,
+    similarity: float | None = None,
+) -> str:
     """Compare two specs and return a comparison."""
+    similarity_text = f"{similarity:.0%}" if similarity is not None else "n/a"
     output = [
         f"# Comparison: {spec1.name} vs {spec2.name}",
         "",
@@ -1013,6 +1839,8 @@ def compare_specs(spec1: WorkflowSpec, spec2: WorkflowSpec) -> str:
         f"| Phases | {len(spec1.phases)} | {len(spec2.phases)} |",
         f"| Tags | {', '.join(spec1.tags[:3])} | {', '.join(spec2.tags[:3])} |",
         "",
+        f"**Prompt similarity**: {similarity_text}",
+        "",
         "## Descriptions",
         "",
         f"**{spec1.name}**: {spec1.description[:150]}...",
@@ -1287,14 +2115,22 @@ def main():
     
     print(f"Loaded {len(spec_collection.specs)} workflow specs", file=__import__("sys").stderr)
     
-    # Run the server
+    # Run the server, watching for spec edits unless LIA_WATCH_SPECS=0
     async def run():
-        async with stdio_server() as (read_stream, write_stream):
-            await server.run(
-                read_stream,
-                write_stream,
-                server.create_initialization_options(),
-            )
+        watcher = None
+        if os.environ.get("LIA_WATCH_SPECS", "1") != "0":
+            watcher = SpecWatcher(get_specs_directory(), apply_spec_changes)
+            watcher.start()
+        try:
+            async with stdio_server() as (read_stream, write_stream):
+                await server.run(
+                    read_stream,
+                    write_stream,
+                    subscribable_options(server),
+                )
+        finally:
+            if watcher is not None:
+                await watcher.stop()
     
     asyncio.run(run())
 
@@ -0,0 +1,231 @@
+"""
+Prompt similarity estimation.
+
+Computes MinHash signatures over word shingles of each spec prompt and
+keeps a banded LSH index so related and near-duplicate specs can be found
+without comparing every pair. Signatures are only recomputed when a
+prompt's content changes.
+"""
+
+import hashlib
+import re
+import struct
+from itertools import combinations
+from typing import Any, Iterable, Optional
+
+from .serialise import content_hash
+
+_WORD_PATTERN = re.compile(r"\w+")
+# One 64-byte BLAKE2b digest yields 16 independent 32-bit hash values
+_HASHES_PER_DIGEST = 16
+_UNPACK_DIGEST = struct.Struct(f"<{_HASHES_PER_DIGEST}I").unpack
+
+DEFAULT_THRESHOLD = 0.7
+
+
+def normalise_threshold(threshold: Any, default: float = DEFAULT_THRESHOLD) -> float:
+    """
+    Validate a `threshold` tool argument.
+
+    Raises:
+        ValueError: If `threshold` is not a number between 0 and 1.
+    """
+    if threshold is None:
+        return default
+    if (
+        isinstance(threshold, bool)
+        or not isinstance(threshold, (int, float))
+        or not 0 <= threshold <= 1
+    ):
+        raise ValueError("threshold must be a number between 0 and 1")
+    return float(threshold)
+
+
+def _shingles(text: str, shingle_size: int) -> set[bytes]:
+    """Collect every run of `shingle_size` consecutive words in the text."""
+    words = _WORD_PATTERN.findall(text.lower())
+    if len(words) < shingle_size:
+        return {" ".join(words).encode("utf-8")} if words else set()
+    return {
+        " ".join(words[i:i + shingle_size]).encode("utf-8")
+        for i in range(len(words) - shingle_size + 1)
+    }
+
+
+class SimilarityIndex:
+    """
+    MinHash signatures with a locality-sensitive hashing index.
+
+    Keys are spec names. Call `update` whenever a spec is loaded; it is a
+    no-op when the prompt has not changed since the last call.
+    """
+
+    def __init__(self, num_perm: int = 64, bands: int = 16, shingle_size: int = 5):
+        """
+        Initialise the index.
+
+        Args:
+            num_perm: Number of hash functions per signature (multiple of 16).
+            bands: Number of LSH bands; must divide num_perm.
+            shingle_size: Number of words per shingle.
+        """
+        if num_perm % bands or num_perm % _HASHES_PER_DIGEST:
+            raise ValueError("num_perm must be a multiple of 16 and divisible by bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        # Each personalisation string selects an independent family of 16 hashes
+        self._persons = [
+            f"lia-mh{i}".encode("ascii")
+            for i in range(num_perm // _HASHES_PER_DIGEST)
+        ]
+        self._digests: dict[str, str] = {}
+        self._signatures: dict[str, tuple[int, ...]] = {}
+        self._buckets: dict[tuple[int, tuple[int, ...]], set[str]] = {}
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._signatures
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def keys(self) -> list[str]:
+        """Get all indexed keys."""
+        return list(self._signatures)
+
+    def digest(self, key: str) -> Optional[str]:
+        """Get the digest of the text indexed under a key."""
+        return self._digests.get(key)
+
+    def update(self, key: str, text: str, digest: Optional[str] = None) -> bool:
+        """
+        Index a prompt, recomputing its signature only if the text changed.
+
+        Args:
+            key: Spec name.
+            text: Prompt content.
+            digest: The text's `serialise.content_hash`, computed if not given.
+
+        Returns:
+            True if the signature was (re)computed.
+        """
+        if digest is None:
+            digest = content_hash(text)
+        if self._digests.get(key) == digest:
+            return False
+
+        self.remove(key)
+        signature = self._signature(text)
+        self._digests[key] = digest
+        self._signatures[key] = signature
+        for band in self._band_keys(signature):
+            self._buckets.setdefault(band, set()).add(key)
+        return True
+
+    def remove(self, key: str) -> None:
+        """Drop a key from the index."""
+        signature = self._signatures.pop(key, None)
+        self._digests.pop(key, None)
+        if signature is None:
+            return
+        for band in self._band_keys(signature):
+            bucket = self._buckets.get(band)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band]
+
+    def retain(self, keys: Iterable[str]) -> None:
+        """Drop every key not in `keys` (e.g. after specs were deleted)."""
+        keep = set(keys)
+        for key in [k for k in self._signatures if k not in keep]:
+            self.remove(key)
+
+    def similarity(self, key1: str, key2: str) -> Optional[float]:
+        """
+        Estimate the Jaccard similarity of two indexed prompts.
+
+        Returns:
+            Similarity between 0.0 and 1.0, or None if either key is unknown.
+        """
+        sig1 = self._signatures.get(key1)
+        sig2 = self._signatures.get(key2)
+        if sig1 is None or sig2 is None:
+            return None
+        return self._compare(sig1, sig2)
+
+    def related(self, key: str, limit: int = 5) -> list[tuple[str, float]]:
+        """
+        Find the prompts most similar to the given one.
+
+        LSH candidates are ranked first; if they do not fill `limit`, the
+        remaining signatures are scanned so small libraries still get results.
+
+        Returns:
+            List of (key, similarity) pairs, most similar first.
+        """
+        signature = self._signatures.get(key)
+        if signature is None:
+            return []
+
+        candidates: set[str] = set()
+        for band in self._band_keys(signature):
+            candidates.update(self._buckets.get(band, ()))
+        candidates.discard(key)
+        if len(candidates) < limit:
+            candidates = set(self._signatures) - {key}
+
+        scored = [(other, self._compare(signature, self._signatures[other])) for other in candidates]
+        scored.sort(key=lambda x: (-x[1], x[0]))
+        return scored[:limit]
+
+    def near_duplicates(self, threshold: float = 0.7) -> list[tuple[str, str, float]]:
+        """
+        Find pairs of prompts whose estimated similarity meets the threshold.
+
+        Only pairs sharing at least one LSH bucket are compared.
+
+        Returns:
+            List of (key1, key2, similarity) triples, most similar first.
+        """
+        pairs: set[tuple[str, str]] = set()
+        for bucket in self._buckets.values():
+            if len(bucket) > 1:
+                pairs.update(combinations(sorted(bucket), 2))
+
+        results = []
+        for key1, key2 in pairs:
+            score = self._compare(self._signatures[key1], self._signatures[key2])
+            if score >= threshold:
+                results.append((key1, key2, score))
+        results.sort(key=lambda x: (-x[2], x[0], x[1]))
+        return results
+
+    def _signature(self, text: str) -> tuple[int, ...]:
+        """Compute the MinHash signature of a prompt."""
+        shingles = _shingles(text, self.shingle_size)
+        if not shingles:
+            return tuple([0xFFFFFFFF] * self.num_perm)
+        blake2b = hashlib.blake2b
+        rows = [
+            sum(
+                (_UNPACK_DIGEST(blake2b(shingle, person=person).digest()) for person in self._persons),
+                (),
+            )
+            for shingle in shingles
+        ]
+        # Column-wise minimum gives one MinHash value per hash function
+        return tuple(map(min, zip(*rows)))
+
+    def _band_keys(self, signature: tuple[int, ...]) -> list[tuple[int, tuple[int, ...]]]:
+        """Split a signature into its LSH band keys."""
+        return [
+            (band, signature[band * self.rows:(band + 1) * self.rows])
+            for band in range(self.bands)
+        ]
+
+    @staticmethod
+    def _compare(sig1: tuple[int, ...], sig2: tuple[int, ...]) -> float:
+        """Fraction of matching signature slots."""
+        return sum(1 for a, b in zip(sig1, sig2) if a == b) / len(sig1)
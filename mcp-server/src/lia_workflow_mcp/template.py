@@ -0,0 +1,139 @@
+"""
+Compiled prompt templates.
+
+Spec prompts refer to the task and workspace through placeholders such as
+`{task_name}`, `{workflow}` and `${WORKSPACE}`, and to their output
+directories as relative `.lia/...` paths. A prompt is compiled once into
+literal segments and placeholder slots, so rendering it for a task is a
+single join. Placeholders without a value are left as written, as are
+placeholders this module does not know (such as `{date}`), which the
+workflow itself asks the agent to fill in.
+"""
+
+import re
+from typing import Hashable, Mapping, Optional
+
+from .cache import LRUCache
+from .serialise import content_hash
+
+# Slot names, in the order the matching groups appear in _PLACEHOLDER
+TASK = "task"
+TASK_NAME = "task_name"
+WORKFLOW = "workflow"
+WORKSPACE = "workspace"
+LIA_DIR = "lia_dir"
+
+_PLACEHOLDER = re.compile(
+    r"(\{task\})|(\{task_name\})|(\{workflow\})|(\$\{WORKSPACE\})|((?<![\w./-])\.lia/)"
+)
+_SLOTS = (TASK, TASK_NAME, WORKFLOW, WORKSPACE, LIA_DIR)
+
+
+class PromptTemplate:
+    """
+    A prompt split into literal segments and placeholder slots.
+    """
+
+    __slots__ = ("_parts", "_slots")
+
+    def __init__(self, text: str):
+        """
+        Compile a prompt.
+
+        Args:
+            text: Prompt text containing placeholders.
+        """
+        parts: list[str] = []
+        slots: list[tuple[int, str]] = []
+        start = 0
+        for match in _PLACEHOLDER.finditer(text):
+            parts.append(text[start:match.start()])
+            slots.append((len(parts), _SLOTS[match.lastindex - 1]))
+            parts.append(match.group())
+            start = match.end()
+        parts.append(text[start:])
+        self._parts = parts
+        self._slots = slots
+
+    @property
+    def slot_names(self) -> set[str]:
+        """Names of the placeholders that occur in the prompt."""
+        return {name for _index, name in self._slots}
+
+    def render(self, values: Mapping[str, str]) -> str:
+        """
+        Fill in the placeholders.
+
+        Args:
+            values: Slot values by name. `workspace` also roots `.lia/`
+                paths unless `lia_dir` is given.
+
+        Returns:
+            The rendered prompt.
+        """
+        workspace = values.get(WORKSPACE)
+        if workspace:
+            workspace = workspace.rstrip("/") or "/"
+            values = {**values, WORKSPACE: workspace}
+            if not values.get(LIA_DIR):
+                values[LIA_DIR] = workspace.rstrip("/") + "/.lia/"
+        parts = self._parts.copy()
+        for index, name in self._slots:
+            value = values.get(name)
+            if value:
+                parts[index] = value
+        return "".join(parts)
+
+
+class PromptRenderer:
+    """
+    Renders prompts through cached compiled templates and cached results.
+    """
+
+    def __init__(self, max_templates: int = 64, max_renders: int = 32):
+        """
+        Initialise the renderer.
+
+        Args:
+            max_templates: Number of compiled prompts kept.
+            max_renders: Number of rendered prompts kept.
+        """
+        self._templates: LRUCache[PromptTemplate] = LRUCache(max_templates)
+        self._renders: LRUCache[str] = LRUCache(max_renders)
+
+    def render(
+        self,
+        text: str,
+        values: Mapping[str, str],
+        key: Optional[Hashable] = None,
+    ) -> str:
+        """
+        Render a prompt.
+
+        Args:
+            text: Prompt text.
+            values: Slot values by name; empty values are ignored.
+            key: Identifies the text, such as its content hash; computed
+                from the text if not given.
+
+        Returns:
+            The rendered prompt.
+        """
+        if key is None:
+            key = content_hash(text)
+        filled = tuple(sorted((name, value) for name, value in values.items() if value))
+        rendered = self._renders.get((key, filled))
+        if rendered is not None:
+            return rendered
+
+        template = self._templates.get(key)
+        if template is None:
+            template = PromptTemplate(text)
+            self._templates.put(key, template)
+        rendered = template.render(dict(filled))
+        self._renders.put((key, filled), rendered)
+        return rendered
+
+    def stats(self) -> dict[str, dict]:
+        """Get the template and render cache statistics."""
+        return {"templates": self._templates.stats(), "renders": self._renders.stats()}
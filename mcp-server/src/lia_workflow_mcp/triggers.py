@@ -8,17 +8,22 @@ IMPORTANT: Every spec is fully independent. These are suggestions only,
 not dependencies. See docs/workflow-composition.md for full explanation.
 """
 
+import re
+import sys
+from collections import deque
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional
 
+from .interning import intern_fields
+
 try:
     import tomli
 except ImportError:
     import tomllib as tomli
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class WorkflowTrigger:
     """
     Defines composition hints for a workflow.
@@ -32,6 +37,9 @@ class WorkflowTrigger:
     can_chain_from: list[str] = field(default_factory=list)  # Often follows these
     typical_outputs: list[str] = field(default_factory=list)  # Common artefacts
     works_well_with: list[str] = field(default_factory=list)  # Helpful context (NOT required)
+    
+    def __post_init__(self):
+        intern_fields(self, "name", "on_complete", "can_chain_from", "typical_outputs", "works_well_with")
 
 
 @dataclass
@@ -61,13 +69,29 @@ class TriggerManager:
         """
         self.triggers: dict[str, WorkflowTrigger] = {}
         self.chains: dict[str, WorkflowChain] = {}
+        self._plan_index: Optional[_PlanIndex] = None
+        # Bumped on every reload, so caches of trigger-derived output expire
+        self.generation = 0
         
         if specs_dir:
             self._load_triggers(specs_dir)
     
+    def reload(self, specs_dir: Path) -> None:
+        """
+        Re-read workflow-triggers.toml, replacing the current definitions.
+        
+        The new definitions are loaded in full before being swapped in.
+        """
+        fresh = TriggerManager(specs_dir)
+        self.triggers = fresh.triggers
+        self.chains = fresh.chains
+        self._plan_index = None
+        self.generation += 1
+    
     def _load_triggers(self, specs_dir: Path) -> None:
         """Load trigger definitions from workflow-triggers.toml."""
         triggers_file = specs_dir / "_common" / "workflow-triggers.toml"
+        self._plan_index = None
         
         if not triggers_file.exists():
             return
@@ -101,7 +125,7 @@ class TriggerManager:
                         works_well_with=trigger_info.get("works_well_with", trigger_info.get("requires", [])),
                     )
         except Exception as e:
-            print(f"Warning: Failed to load triggers: {e}")
+            print(f"Warning: Failed to load triggers: {e}", file=sys.stderr)
     
     def get_suggested_next(self, current: str) -> list[str]:
         """
@@ -248,6 +272,102 @@ class TriggerManager:
         
         return chain
     
+    def plan_for_outputs(
+        self,
+        outputs: list[str],
+        start: Optional[str] = None,
+    ) -> Optional[list[str]]:
+        """
+        Find the shortest workflow sequence that produces all requested artefacts.
+        
+        Each step must follow the previous one in the trigger graph (the next
+        workflow lists the previous one in `can_chain_from`, or the previous
+        one lists it in `on_complete`). The search is a breadth-first walk over
+        (last workflow, covered artefacts) states with artefacts encoded as
+        bitmasks, so the state space is bounded by workflows × 2^len(outputs).
+        
+        Args:
+            outputs: Artefact names to produce (e.g. "requirements.md", "test-suite").
+            start: Optional workflow the sequence must begin with.
+            
+        Returns:
+            List of workflow names, or None if the artefacts are unknown or
+            cannot all be produced along a single chain.
+        """
+        index = self._get_plan_index()
+        
+        goal = 0
+        for output in outputs:
+            bit = index.artefact_bits.get(_normalise_artefact(output))
+            if bit is None:
+                return None
+            goal |= bit
+        
+        if start is not None:
+            if start not in index.position:
+                return None
+            starts = [index.position[start]]
+        else:
+            if not goal:
+                return []
+            starts = range(len(index.workflows))
+        
+        # parents maps (workflow, mask) -> previous state, None for a start state
+        parents: dict[tuple[int, int], Optional[tuple[int, int]]] = {}
+        queue: deque[tuple[int, int]] = deque()
+        for i in starts:
+            state = (i, index.output_masks[i] & goal)
+            if state not in parents:
+                parents[state] = None
+                queue.append(state)
+        
+        while queue:
+            state = queue.popleft()
+            current, mask = state
+            if mask == goal:
+                return self._unwind_plan(index, parents, state)
+            for nxt in index.successors[current]:
+                next_state = (nxt, mask | (index.output_masks[nxt] & goal))
+                if next_state not in parents:
+                    parents[next_state] = state
+                    queue.append(next_state)
+        
+        return None
+    
+    def unknown_outputs(self, outputs: list[str]) -> list[str]:
+        """
+        Get the requested artefacts that no workflow typically produces.
+        
+        Args:
+            outputs: Artefact names to check.
+            
+        Returns:
+            Artefact names with no producing workflow.
+        """
+        index = self._get_plan_index()
+        return [o for o in outputs if _normalise_artefact(o) not in index.artefact_bits]
+    
+    def _get_plan_index(self) -> "_PlanIndex":
+        """Compile the trigger graph into bitmask form on first use."""
+        if self._plan_index is None:
+            self._plan_index = _PlanIndex.build(self.triggers)
+        return self._plan_index
+    
+    @staticmethod
+    def _unwind_plan(
+        index: "_PlanIndex",
+        parents: dict[tuple[int, int], Optional[tuple[int, int]]],
+        state: tuple[int, int],
+    ) -> list[str]:
+        """Rebuild the workflow sequence from BFS parent pointers."""
+        sequence = []
+        current: Optional[tuple[int, int]] = state
+        while current is not None:
+            sequence.append(index.workflows[current[0]])
+            current = parents[current]
+        sequence.reverse()
+        return sequence
+    
     def get_all_chains(self) -> list[WorkflowChain]:
         """Get all predefined workflow chains."""
         return list(self.chains.values())
@@ -255,3 +375,57 @@ class TriggerManager:
     def format_chain_info(self, chain: WorkflowChain) -> str:
         """Format a chain as a readable string."""
         return f"{chain.description}\n  Sequence: {' → '.join(chain.sequence)}"
+
+
+def _normalise_artefact(name: str) -> str:
+    """Normalise an artefact name so "Test-Suite" and "test_suite" match."""
+    name = name.strip().lower()
+    if name.endswith(".md"):
+        name = name[:-3]
+    return re.sub(r"[\s\-]+", "_", name)
+
+
+@dataclass
+class _PlanIndex:
+    """Trigger graph compiled for goal-directed planning."""
+    
+    workflows: list[str]
+    position: dict[str, int]
+    artefact_bits: dict[str, int]
+    output_masks: list[int]
+    successors: list[list[int]]
+    
+    @classmethod
+    def build(cls, triggers: dict[str, WorkflowTrigger]) -> "_PlanIndex":
+        """Assign a bit to every known artefact and resolve chaining edges."""
+        workflows = list(triggers)
+        position = {name: i for i, name in enumerate(workflows)}
+        
+        artefact_bits: dict[str, int] = {}
+        output_masks = []
+        for name in workflows:
+            mask = 0
+            for output in triggers[name].typical_outputs:
+                key = _normalise_artefact(output)
+                if key not in artefact_bits:
+                    artefact_bits[key] = 1 << len(artefact_bits)
+                mask |= artefact_bits[key]
+            output_masks.append(mask)
+        
+        edges: list[set[int]] = [set() for _ in workflows]
+        for name, trigger in triggers.items():
+            i = position[name]
+            for successor in trigger.on_complete:
+                if successor in position:
+                    edges[i].add(position[successor])
+            for predecessor in trigger.can_chain_from:
+                if predecessor in position:
+                    edges[position[predecessor]].add(i)
+        
+        return cls(
+            workflows=workflows,
+            position=position,
+            artefact_bits=artefact_bits,
+            output_masks=output_masks,
+            successors=[sorted(e) for e in edges],
+        )
@@ -0,0 +1,158 @@
+"""
+Spec directory watching.
+
+Uses `watchfiles` (inotify/FSEvents/ReadDirectoryChangesW) when it is
+installed and falls back to polling file stats otherwise. Bursts of changes,
+such as an editor writing a temporary file and renaming it, are debounced
+into a single callback with the set of affected `.toml` files.
+"""
+
+import asyncio
+import inspect
+import os
+import sys
+from pathlib import Path
+from typing import Awaitable, Callable, Optional, Union
+
+try:
+    import watchfiles
+except ImportError:  # pragma: no cover - depends on the environment
+    watchfiles = None
+
+ChangeCallback = Callable[[set[Path]], Union[None, Awaitable[None]]]
+
+
+def snapshot_tree(directory: Path) -> dict[Path, tuple[int, int, int]]:
+    """
+    Stat every `.toml` file under a directory.
+
+    Returns:
+        Mapping of path to (mtime_ns, size, inode).
+    """
+    snapshot = {}
+    for root, _dirs, files in os.walk(directory):
+        for name in files:
+            if not name.endswith(".toml"):
+                continue
+            path = Path(root) / name
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            snapshot[path] = (st.st_mtime_ns, st.st_size, st.st_ino)
+    return snapshot
+
+
+def diff_snapshots(
+    old: dict[Path, tuple[int, int, int]],
+    new: dict[Path, tuple[int, int, int]],
+) -> set[Path]:
+    """Get the paths added, removed or modified between two snapshots."""
+    changed = {path for path, stamp in new.items() if old.get(path) != stamp}
+    changed.update(path for path in old if path not in new)
+    return changed
+
+
+class SpecWatcher:
+    """
+    Watches a specs directory and reports changed spec files.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        on_change: ChangeCallback,
+        debounce: float = 0.2,
+        poll_interval: float = 0.5,
+        force_polling: bool = False,
+    ):
+        """
+        Initialise the watcher.
+
+        Args:
+            directory: Directory to watch recursively.
+            on_change: Called with the set of changed `.toml` paths; may be
+                a coroutine function.
+            debounce: Seconds the tree must be quiet before reporting.
+            poll_interval: Seconds between scans when polling.
+            force_polling: Poll even if `watchfiles` is available.
+        """
+        self.directory = directory
+        self.on_change = on_change
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.use_polling = force_polling or watchfiles is None
+        self._snapshot: Optional[dict[Path, tuple[int, int, int]]] = None
+        self._stop = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> asyncio.Task:
+        """Start watching in a background task."""
+        if self._task is None or self._task.done():
+            self._stop.clear()
+            self._task = asyncio.create_task(self.run())
+        return self._task
+
+    async def stop(self) -> None:
+        """Stop watching and wait for the background task to finish."""
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def run(self) -> None:
+        """Watch until stopped, invoking the callback for each batch of changes."""
+        if self.use_polling:
+            await self._run_polling()
+        else:
+            await self._run_watchfiles()
+
+    def check(self) -> set[Path]:
+        """
+        Scan once and return files changed since the previous scan.
+
+        The first call records a baseline and returns an empty set.
+        """
+        current = snapshot_tree(self.directory)
+        previous, self._snapshot = self._snapshot, current
+        if previous is None:
+            return set()
+        return diff_snapshots(previous, current)
+
+    async def _run_polling(self) -> None:
+        """Poll file stats, waiting for the tree to settle before reporting."""
+        self.check()
+        while not self._stop.is_set():
+            await asyncio.sleep(self.poll_interval)
+            changed = self.check()
+            while changed and not self._stop.is_set():
+                await asyncio.sleep(self.debounce)
+                more = self.check()
+                if not more:
+                    break
+                changed |= more
+            if changed:
+                await self._emit(changed)
+
+    async def _run_watchfiles(self) -> None:
+        """Receive change events from the operating system via watchfiles."""
+        async for changes in watchfiles.awatch(
+            self.directory,
+            debounce=int(self.debounce * 1000),
+            watch_filter=lambda _change, path: path.endswith(".toml"),
+            stop_event=self._stop,
+        ):
+            await self._emit({Path(path) for _change, path in changes})
+
+    async def _emit(self, changed: set[Path]) -> None:
+        """Invoke the callback, logging rather than propagating failures."""
+        try:
+            result = self.on_change(changed)
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            print(f"Warning: Failed to apply spec changes: {e}", file=sys.stderr)
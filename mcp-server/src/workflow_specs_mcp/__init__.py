@@ -3,6 +3,9 @@ Workflow Specs MCP Server
 
 MCP (Model Context Protocol) server that provides remote agent access to
 Lia Workflow Specifications for systematic AI-powered development workflows.
+
+The server reuses the caching, serialisation and change-tracking helpers of
+`lia_workflow_mcp`, which ships in the same distribution.
 """
 
 __version__ = "1.0.0"
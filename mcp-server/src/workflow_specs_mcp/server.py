@@ -9,12 +9,16 @@ import asyncio
 import json
 import os
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Optional
 
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import (
     GetPromptResult,
+    ListPromptsRequest,
+    ListPromptsResult,
+    ListResourcesRequest,
+    ListResourcesResult,
     Prompt,
     PromptArgument,
     PromptMessage,
@@ -23,7 +27,24 @@ from mcp.types import (
     Tool,
 )
 
-from .spec_loader import SpecLoader
+from lia_workflow_mcp.cache import GenerationCache
+from lia_workflow_mcp.notifications import ResourceNotifier, request_session, subscribable_options
+from lia_workflow_mcp.pagination import Paginator, normalise_limit
+from lia_workflow_mcp.sections import dedupe_sections
+from lia_workflow_mcp.serialise import (
+    content_hash,
+    encode,
+    json_array,
+    json_object,
+    normalise_fields,
+    not_modified,
+    split_conditional_uri,
+)
+from lia_workflow_mcp.similarity import normalise_threshold
+from lia_workflow_mcp.template import PromptRenderer
+from lia_workflow_mcp.watcher import SpecWatcher
+
+from .spec_loader import SpecLoader, SpecMetadata
 
 # Default specs directory - can be overridden via environment variable
 DEFAULT_SPECS_DIR = Path(__file__).parent.parent.parent.parent / "specs"
@@ -35,16 +56,65 @@ server = Server("workflow-specs-mcp")
 # Initialise spec loader
 spec_loader = SpecLoader(SPECS_DIR)
 
+# Sorted listing snapshots for cursor pagination
+_paginator = Paginator()
+
+# Resource subscriptions and the content hashes last announced to clients
+notifier = ResourceNotifier()
+
+# Compiled spec prompts and recent renders for prompt requests
+_renderer = PromptRenderer()
+
+# Resource and prompt listings and resource content hashes, keyed by the
+# loader's cache generation
+_listing_cache: GenerationCache[Any] = GenerationCache()
+
+# Default fields returned by the listing tools
+LIST_FIELDS = ("name", "description", "content_hash")
+SEARCH_FIELDS = ("name", "category", "description", "path")
+
+# Parts of a spec that get_specs can return
+BATCH_PARTS = ("prompt", "metadata", "phases")
+
 
 # =============================================================================
 # RESOURCES - For reading and listing specs
 # =============================================================================
 
 
-@server.list_resources()
 async def list_resources() -> list[Resource]:
-    """List all available workflow spec resources."""
+    """List all available workflow spec resources, rebuilt only after changes."""
+    return list(_listing_cache.get_or_build(
+        "resources", spec_loader.refresh(), _build_resources
+    ))
+
+
+@server.list_resources()
+async def list_resources_page(request: ListResourcesRequest) -> ListResourcesResult:
+    """
+    Serve one page of the resource listing, sorted by URI.
+
+    Pages come from a snapshot of the listing taken when the first page was
+    requested, so iteration is unaffected by reloads.
+    """
+    session = request_session(server)
+    if session is not None:
+        notifier.track(session)
+    generation = spec_loader.refresh()
+    resources, next_cursor = _paginator.page(
+        "resources",
+        generation,
+        lambda: _listing_cache.get_or_build("resources", generation, _build_resources),
+        lambda resource: str(resource.uri),
+        request.params.cursor if request.params else None,
+    )
+    return ListResourcesResult(resources=resources, nextCursor=next_cursor)
+
+
+def _build_resources() -> list[Resource]:
+    """Build the resource listing for the current specs."""
     resources = []
+    hashes = resource_hashes()
 
     # Add a resource for the specs catalogue
     resources.append(
@@ -53,6 +123,7 @@ async def list_resources() -> list[Resource]:
             name="Workflow Specs Catalogue",
             description="Complete catalogue of all available workflow specifications organised by category",
             mimeType="application/json",
+            _meta={"content_hash": hashes.get("specs://catalogue")},
         )
     )
 
@@ -64,6 +135,7 @@ async def list_resources() -> list[Resource]:
                 name=f"Category: {category}",
                 description=f"All workflow specs in the '{category}' category",
                 mimeType="application/json",
+                _meta={"content_hash": hashes.get(f"specs://category/{category}")},
             )
         )
 
@@ -77,6 +149,7 @@ async def list_resources() -> list[Resource]:
                     name=f"{metadata.name}.toml",
                     description=metadata.description[:200] if metadata.description else "",
                     mimeType="text/plain",
+                    _meta={"content_hash": metadata.content_hash},
                 )
             )
 
@@ -85,43 +158,27 @@ async def list_resources() -> list[Resource]:
 
 @server.read_resource()
 async def read_resource(uri: str) -> str:
-    """Read a specific workflow spec resource."""
+    """
+    Read a specific workflow spec resource.
+
+    A `?if_none_match=<content_hash>` query returns a short "not modified"
+    body instead of the content when the hash still matches.
+    """
+    uri, expected_hash = split_conditional_uri(uri)
+    if expected_hash is not None and resource_hashes().get(uri) == expected_hash:
+        return not_modified(expected_hash)
+
     # Parse the URI
     if uri == "specs://catalogue":
         # Return full catalogue
-        catalogue = spec_loader.get_specs_by_category()
-        result = {}
-        for category, specs in catalogue.items():
-            result[category] = [
-                {
-                    "name": s.name,
-                    "description": s.description,
-                    "phases": s.phases,
-                    "modes": s.modes,
-                    "output_directory": s.output_directory,
-                }
-                for s in specs
-            ]
-        return json.dumps(result, indent=2)
+        return spec_loader.get_catalogue_view().catalogue_json
 
     if uri.startswith("specs://category/"):
         # Return specs for a specific category
         category = uri.replace("specs://category/", "")
-        specs_by_category = spec_loader.get_specs_by_category()
-        if category in specs_by_category:
-            specs = specs_by_category[category]
-            result = [
-                {
-                    "name": s.name,
-                    "description": s.description,
-                    "path": s.path,
-                    "phases": s.phases,
-                    "constraints": s.constraints,
-                    "modes": s.modes,
-                }
-                for s in specs
-            ]
-            return json.dumps(result, indent=2)
+        category_json = spec_loader.get_catalogue_view().category_json
+        if category in category_json:
+            return category_json[category]
         return json.dumps({"error": f"Category '{category}' not found"})
 
     if uri.startswith("specs://spec/"):
@@ -138,6 +195,40 @@ async def read_resource(uri: str) -> str:
     return f"Unknown resource: {uri}"
 
 
+@server.subscribe_resource()
+async def subscribe_resource(uri) -> None:
+    """Send the requesting session `resources/updated` when a resource changes."""
+    session = request_session(server)
+    if session is not None:
+        notifier.subscribe(str(uri), session)
+
+
+@server.unsubscribe_resource()
+async def unsubscribe_resource(uri) -> None:
+    """Stop sending the requesting session updates for a resource."""
+    session = request_session(server)
+    if session is not None:
+        notifier.unsubscribe(str(uri), session)
+
+
+def resource_hashes() -> dict[str, str]:
+    """Get the content hash of every resource, keyed by URI, once per generation."""
+    return _listing_cache.get_or_build("hashes", spec_loader.refresh(), _build_resource_hashes)
+
+
+def _build_resource_hashes() -> dict[str, str]:
+    """Hash every resource body."""
+    view = spec_loader.get_catalogue_view()
+    hashes = {"specs://catalogue": content_hash(view.catalogue_json)}
+    for category in spec_loader.get_categories():
+        hashes[f"specs://category/{category}"] = content_hash(view.category_json.get(category, ""))
+    for spec_path in spec_loader.discover_specs():
+        metadata = spec_loader.extract_metadata(spec_path)
+        if metadata and metadata.content_hash:
+            hashes[f"specs://spec/{metadata.category}/{metadata.name}"] = metadata.content_hash
+    return hashes
+
+
 # =============================================================================
 # TOOLS - For operations on specs
 # =============================================================================
@@ -146,6 +237,11 @@ async def read_resource(uri: str) -> str:
 @server.list_tools()
 async def list_tools() -> list[Tool]:
     """List all available tools for working with workflow specs."""
+    return list(_TOOLS)
+
+
+def _build_tools() -> list[Tool]:
+    """Build the tool definitions; they do not depend on the specs."""
     return [
         Tool(
             name="list_specs",
@@ -156,7 +252,24 @@ async def list_tools() -> list[Tool]:
                     "category": {
                         "type": "string",
                         "description": "Optional: Filter by category (development, quality, research, etc.)",
-                    }
+                    },
+                    "fields": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Optional: Spec fields to include (e.g. ['name', 'phases']); defaults to name and description",
+                    },
+                    "compact": {
+                        "type": "boolean",
+                        "description": "Optional: Return unindented JSON (default: false)",
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": "Optional: Return at most this many specs, with a cursor for the next page",
+                    },
+                    "cursor": {
+                        "type": "string",
+                        "description": "Optional: Cursor from a previous page",
+                    },
                 },
             },
         ),
@@ -174,6 +287,10 @@ async def list_tools() -> list[Tool]:
                         "type": "string",
                         "description": "Category of the spec (e.g., 'development', 'quality')",
                     },
+                    "if_none_match": {
+                        "type": "string",
+                        "description": "Optional: Content hash of a cached copy; returns a short 'not modified' response if it is still current",
+                    },
                 },
                 "required": ["name"],
             },
@@ -196,6 +313,30 @@ async def list_tools() -> list[Tool]:
                 "required": ["name"],
             },
         ),
+        Tool(
+            name="get_specs",
+            description="Get prompts, metadata and/or phases for several workflow specifications in one call, e.g. a whole workflow chain",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "names": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Names of the specs (e.g., ['spec', 'dev', 'test'])",
+                    },
+                    "include": {
+                        "type": "array",
+                        "items": {"type": "string", "enum": list(BATCH_PARTS)},
+                        "description": "Optional: Parts to return for each spec (default: ['prompt'])",
+                    },
+                    "dedupe": {
+                        "type": "boolean",
+                        "description": "Optional: Return prompts as parts referencing a shared_sections table, so sections common to several specs are sent once (default: false)",
+                    },
+                },
+                "required": ["names"],
+            },
+        ),
         Tool(
             name="validate_spec",
             description="Validate a workflow specification for correctness and completeness",
@@ -228,6 +369,23 @@ async def list_tools() -> list[Tool]:
                         "type": "string",
                         "description": "Optional: Limit search to a specific category",
                     },
+                    "fields": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Optional: Spec fields to include (e.g. ['name', 'phases']); defaults to name, category, description and path",
+                    },
+                    "compact": {
+                        "type": "boolean",
+                        "description": "Optional: Return unindented JSON (default: false)",
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": "Optional: Return at most this many specs, with a cursor for the next page",
+                    },
+                    "cursor": {
+                        "type": "string",
+                        "description": "Optional: Cursor from a previous page",
+                    },
                 },
                 "required": ["query"],
             },
@@ -250,6 +408,24 @@ async def list_tools() -> list[Tool]:
                 "required": ["name"],
             },
         ),
+        Tool(
+            name="get_workflow_diagram",
+            description="Get a specification's Mermaid workflow diagram parsed into nodes and edges, as compact JSON",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "name": {
+                        "type": "string",
+                        "description": "Name of the spec",
+                    },
+                    "category": {
+                        "type": "string",
+                        "description": "Category of the spec",
+                    },
+                },
+                "required": ["name"],
+            },
+        ),
         Tool(
             name="get_categories",
             description="Get all available workflow spec categories",
@@ -258,6 +434,19 @@ async def list_tools() -> list[Tool]:
                 "properties": {},
             },
         ),
+        Tool(
+            name="changes_since",
+            description="Get the specs added, modified or removed since a cursor, for keeping a local copy of the catalogue in sync. Omit the cursor for a full listing.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "cursor": {
+                        "type": "string",
+                        "description": "Optional: Cursor returned by a previous call",
+                    },
+                },
+            },
+        ),
         Tool(
             name="compare_specs",
             description="Compare two workflow specifications, showing their differences in structure and capabilities",
@@ -284,6 +473,37 @@ async def list_tools() -> list[Tool]:
                 "required": ["spec1_name", "spec2_name"],
             },
         ),
+        Tool(
+            name="related_specs",
+            description="Find the workflow specifications whose prompts are most similar to a given spec",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "name": {
+                        "type": "string",
+                        "description": "Name of the spec",
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": "Maximum number of related specs to return (default: 5)",
+                    },
+                },
+                "required": ["name"],
+            },
+        ),
+        Tool(
+            name="find_near_duplicates",
+            description="Report pairs of workflow specifications whose prompts are nearly identical",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "threshold": {
+                        "type": "number",
+                        "description": "Minimum estimated similarity between 0 and 1 (default: 0.7)",
+                    }
+                },
+            },
+        ),
         Tool(
             name="suggest_workflow",
             description="Suggest the most appropriate workflow specification based on a task description",
@@ -333,35 +553,68 @@ async def list_tools() -> list[Tool]:
     ]
 
 
+_TOOLS = _build_tools()
+
+
 @server.call_tool()
 async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
     """Handle tool calls."""
 
+    try:
+        normalise_fields(arguments.get("fields"))
+    except ValueError as e:
+        return [TextContent(type="text", text=json.dumps({"error": str(e)}, indent=2))]
+
     if name == "list_specs":
         category = arguments.get("category")
-        specs_by_cat = spec_loader.get_specs_by_category()
+        fields = normalise_fields(arguments.get("fields")) or LIST_FIELDS
+        compact = bool(arguments.get("compact", False))
+        specs_by_cat = spec_loader.get_catalogue_view().by_category
+
+        if "limit" in arguments or "cursor" in arguments:
+            if category and category not in specs_by_cat:
+                return [TextContent(type="text", text=json.dumps(
+                    {"error": f"Category '{category}' not found"}, indent=2
+                ))]
+            specs, next_cursor = _page_specs(
+                f"list_specs:{category or ''}",
+                lambda: [s for cat, specs in specs_by_cat.items() if not category or cat == category for s in specs],
+                arguments,
+            )
+            return [TextContent(type="text", text=_paged_listing(specs, next_cursor, fields, compact))]
 
         if category:
-            if category in specs_by_cat:
-                specs = specs_by_cat[category]
-                result = {
-                    "category": category,
-                    "specs": [{"name": s.name, "description": s.description} for s in specs],
-                }
-            else:
-                result = {"error": f"Category '{category}' not found"}
+            if category not in specs_by_cat:
+                return [TextContent(type="text", text=json.dumps(
+                    {"error": f"Category '{category}' not found"}, indent=2
+                ))]
+            specs = json_array(
+                (s.to_json(fields, compact, level=2) for s in specs_by_cat[category]),
+                compact,
+                level=1,
+            )
+            text = json_object(
+                [("category", encode(category, compact)), ("specs", specs)], compact
+            )
         else:
-            result = {}
-            for cat, specs in specs_by_cat.items():
-                result[cat] = [{"name": s.name, "description": s.description} for s in specs]
+            text = json_object(
+                [
+                    (cat, json_array((s.to_json(fields, compact, level=2) for s in specs), compact, level=1))
+                    for cat, specs in specs_by_cat.items()
+                ],
+                compact,
+            )
 
-        return [TextContent(type="text", text=json.dumps(result, indent=2))]
+        return [TextContent(type="text", text=text)]
 
     if name == "get_spec":
         spec_name = arguments.get("name")
         category = arguments.get("category")
 
         spec_path = _find_spec(spec_name, category)
+        expected_hash = arguments.get("if_none_match")
+        if spec_path and expected_hash and spec_loader.content_hash(spec_path) == expected_hash:
+            return [TextContent(type="text", text=not_modified(expected_hash))]
         if spec_path:
             content = spec_loader.get_spec_content(spec_path)
             if content:
@@ -376,9 +629,28 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
         if spec_path:
             data = spec_loader.load_spec(spec_path)
             if data and "prompt" in data:
-                return [TextContent(type="text", text=data["prompt"])]
+                return [TextContent(type="text", text=spec_loader.prompt_text(data))]
         return [TextContent(type="text", text=f"Spec '{spec_name}' not found or has no prompt")]
 
+    if name == "get_specs":
+        include = arguments.get("include") or ("prompt",)
+        names = arguments.get("names", [])
+        if not isinstance(names, list) or not all(isinstance(n, str) for n in names):
+            return [TextContent(type="text", text=json.dumps(
+                {"error": "names must be a list of spec names"}, indent=2
+            ))]
+        if not isinstance(include, (list, tuple)) or not all(isinstance(p, str) for p in include):
+            return [TextContent(type="text", text=json.dumps(
+                {"error": "include must be a list of parts", "valid_parts": list(BATCH_PARTS)}, indent=2
+            ))]
+        unknown = [part for part in include if part not in BATCH_PARTS]
+        if unknown:
+            return [TextContent(type="text", text=json.dumps(
+                {"error": f"Unknown parts: {', '.join(unknown)}", "valid_parts": list(BATCH_PARTS)}, indent=2
+            ))]
+        result = batch_read(names, include, bool(arguments.get("dedupe", False)))
+        return [TextContent(type="text", text=json.dumps(result, indent=2))]
+
     if name == "validate_spec":
         spec_name = arguments.get("name")
         category = arguments.get("category")
@@ -399,17 +671,20 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
         query = arguments.get("query", "")
         category = arguments.get("category")
 
+        fields = normalise_fields(arguments.get("fields")) or SEARCH_FIELDS
+        compact = bool(arguments.get("compact", False))
+
+        if "limit" in arguments or "cursor" in arguments:
+            specs, next_cursor = _page_specs(
+                f"search_specs:{category or ''}:{query}",
+                lambda: [meta for _, meta in spec_loader.search_specs(query, category)],
+                arguments,
+            )
+            return [TextContent(type="text", text=_paged_listing(specs, next_cursor, fields, compact))]
+
         results = spec_loader.search_specs(query, category)
-        output = [
-            {
-                "name": meta.name,
-                "category": meta.category,
-                "description": meta.description,
-                "path": meta.path,
-            }
-            for _, meta in results
-        ]
-        return [TextContent(type="text", text=json.dumps(output, indent=2))]
+        text = json_array((meta.to_json(fields, compact, level=1) for _, meta in results), compact)
+        return [TextContent(type="text", text=text)]
 
     if name == "get_spec_metadata":
         spec_name = arguments.get("name")
@@ -444,15 +719,24 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
                 return [TextContent(type="text", text=json.dumps(output, indent=2))]
         return [TextContent(type="text", text=f"Spec '{spec_name}' not found")]
 
+    if name == "get_workflow_diagram":
+        spec_name = arguments.get("name")
+        category = arguments.get("category")
+
+        spec_path = _find_spec(spec_name, category)
+        if not spec_path:
+            return [TextContent(type="text", text=f"Spec '{spec_name}' not found")]
+
+        diagram = spec_loader.get_diagram(spec_path)
+        if not diagram:
+            return [TextContent(type="text", text=f"Spec '{spec_name}' has no Mermaid workflow diagram")]
+        return [TextContent(type="text", text=diagram.json)]
+
     if name == "get_categories":
-        categories = spec_loader.get_categories()
-        specs_by_cat = spec_loader.get_specs_by_category()
-        output = {
-            "categories": [
-                {"name": cat, "spec_count": len(specs_by_cat.get(cat, []))} for cat in categories
-            ]
-        }
-        return [TextContent(type="text", text=json.dumps(output, indent=2))]
+        return [TextContent(type="text", text=spec_loader.get_catalogue_view().categories_json)]
+
+    if name == "changes_since":
+        return [TextContent(type="text", text=json.dumps(changes_since(arguments.get("cursor")), indent=2))]
 
     if name == "compare_specs":
         spec1_name = arguments.get("spec1_name")
@@ -472,6 +756,7 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
         meta2 = spec_loader.extract_metadata(spec2_path)
 
         if meta1 and meta2:
+            similarity = spec_loader.get_similarity_index().similarity(meta1.name, meta2.name)
             comparison = {
                 "spec1": {
                     "name": meta1.name,
@@ -495,11 +780,45 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
                     - meta2.constraints.get("MUST", 0),
                     "same_category": meta1.category == meta2.category,
                     "same_modes": set(meta1.modes) == set(meta2.modes),
+                    "prompt_similarity": similarity,
                 },
             }
             return [TextContent(type="text", text=json.dumps(comparison, indent=2))]
         return [TextContent(type="text", text="Could not extract metadata for comparison")]
 
+    if name == "related_specs":
+        spec_name = arguments.get("name")
+        try:
+            limit = normalise_limit(arguments.get("limit"), default=5)
+        except ValueError as e:
+            return [TextContent(type="text", text=json.dumps({"error": str(e)}, indent=2))]
+
+        if not _find_spec(spec_name, None):
+            return [TextContent(type="text", text=f"Spec '{spec_name}' not found")]
+
+        related = spec_loader.get_similarity_index().related(spec_name, limit)
+        output = {
+            "spec": spec_name,
+            "related": [{"name": other, "similarity": score} for other, score in related],
+        }
+        return [TextContent(type="text", text=json.dumps(output, indent=2))]
+
+    if name == "find_near_duplicates":
+        try:
+            threshold = normalise_threshold(arguments.get("threshold"))
+        except ValueError as e:
+            return [TextContent(type="text", text=json.dumps({"error": str(e)}, indent=2))]
+
+        pairs = spec_loader.get_similarity_index().near_duplicates(threshold)
+        output = {
+            "threshold": threshold,
+            "pairs": [
+                {"spec1": name1, "spec2": name2, "similarity": score}
+                for name1, name2, score in pairs
+            ],
+        }
+        return [TextContent(type="text", text=json.dumps(output, indent=2))]
+
     if name == "suggest_workflow":
         task_desc = arguments.get("task_description", "").lower()
 
@@ -561,35 +880,20 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
         start_spec = arguments.get("start_spec")
         depth = arguments.get("depth", 3)
 
-        spec_path = _find_spec(start_spec, None)
-        if not spec_path:
+        graph = spec_loader.get_trigger_graph()
+        if start_spec not in graph.nodes:
             return [TextContent(type="text", text=f"Spec '{start_spec}' not found")]
 
-        # Build the chain
-        chain = []
-        visited = set()
-        current_specs = [start_spec]
-
-        for level in range(depth):
-            next_specs = []
-            for spec_name in current_specs:
-                if spec_name in visited:
-                    continue
-                visited.add(spec_name)
-
-                spec_path = _find_spec(spec_name, None)
-                if spec_path:
-                    metadata = spec_loader.extract_metadata(spec_path)
-                    if metadata:
-                        chain.append({
-                            "level": level,
-                            "spec": spec_name,
-                            "category": metadata.category,
-                            "on_complete": metadata.on_complete,
-                            "provides": metadata.provides,
-                        })
-                        next_specs.extend(metadata.on_complete)
-            current_specs = next_specs
+        chain = [
+            {
+                "level": level,
+                "spec": node.name,
+                "category": node.category,
+                "on_complete": node.on_complete,
+                "provides": node.provides,
+            }
+            for level, node in graph.walk(start_spec, depth)
+        ]
 
         output = {
             "start": start_spec,
@@ -620,18 +924,131 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
     return [TextContent(type="text", text=f"Unknown tool: {name}")]
 
 
+def _page_specs(
+    listing: str,
+    build: Callable[[], list[SpecMetadata]],
+    arguments: dict[str, Any],
+) -> tuple[list[SpecMetadata], Optional[str]]:
+    """Apply `limit` and `cursor` tool arguments to a spec listing."""
+    return _paginator.page(
+        listing,
+        spec_loader.refresh(),
+        build,
+        lambda metadata: f"{metadata.category}/{metadata.name}",
+        arguments.get("cursor"),
+        normalise_limit(arguments.get("limit")),
+    )
+
+
+def _paged_listing(
+    specs: list[SpecMetadata],
+    next_cursor: Optional[str],
+    fields: tuple[str, ...],
+    compact: bool,
+) -> str:
+    """Assemble one page of specs and the next page's cursor as JSON."""
+    return json_object(
+        [
+            ("specs", json_array((s.to_json(fields, compact, level=2) for s in specs), compact, level=1)),
+            ("next_cursor", encode(next_cursor, compact)),
+        ],
+        compact,
+    )
+
+
+def batch_read(names: list[str], include: tuple[str, ...], dedupe: bool) -> dict:
+    """
+    Read several specs at once.
+
+    Names that resolve to the same spec file return it once. With
+    `dedupe`, prompt sections shared by two or more of the specs are
+    replaced with references into a `shared_sections` table.
+    """
+    found = []
+    missing = []
+    seen: set[Path] = set()
+    for name in dict.fromkeys(names):
+        spec_path = _find_spec(name, None)
+        data = spec_loader.load_spec(spec_path) if spec_path else None
+        metadata = spec_loader.extract_metadata(spec_path) if data else None
+        if metadata is None:
+            missing.append(name)
+        elif spec_path not in seen:
+            seen.add(spec_path)
+            found.append((metadata, spec_loader.prompt_text(data)))
+
+    with_prompt = "prompt" in include
+    parts, shared = {}, {}
+    if dedupe and with_prompt:
+        parts, shared = dedupe_sections({metadata.name: prompt for metadata, prompt in found})
+
+    entries = []
+    for metadata, prompt in found:
+        entry = {
+            "name": metadata.name,
+            "category": metadata.category,
+            "content_hash": metadata.content_hash,
+        }
+        if with_prompt:
+            if dedupe:
+                entry["prompt_parts"] = parts[metadata.name]
+            else:
+                entry["prompt"] = prompt
+        if "metadata" in include:
+            entry["metadata"] = metadata.to_dict()
+        if "phases" in include:
+            entry["phases"] = metadata.phases
+        entries.append(entry)
+
+    result = {"specs": entries, "missing": missing}
+    if dedupe and with_prompt:
+        result["shared_sections"] = shared
+    return result
+
+
+def changes_since(cursor: str | None) -> dict:
+    """
+    Get the net spec changes since a cursor.
+
+    Added and modified specs are listed with their category and content
+    hash. If the cursor is missing, expired or from another server process,
+    `reset` is true and every current spec is listed as added.
+    """
+    spec_loader.refresh()
+    next_cursor = spec_loader.change_cursor()
+    net = spec_loader.changes.since(cursor)
+
+    def entry(spec_path: Path | None) -> dict | None:
+        metadata = spec_loader.extract_metadata(spec_path) if spec_path else None
+        if metadata is None:
+            return None
+        return {"name": metadata.name, "category": metadata.category, "content_hash": metadata.content_hash}
+
+    result = {
+        "cursor": next_cursor,
+        "reset": net is None,
+        "added": [],
+        "modified": [],
+        "removed": [],
+    }
+    if net is None:
+        names = set()
+        for spec_path in spec_loader.discover_specs():
+            if spec_path.stem not in names and (item := entry(spec_path)):
+                names.add(spec_path.stem)
+                result["added"].append(item)
+        return result
+    for name, kind in sorted(net.items()):
+        if kind == "removed":
+            result["removed"].append(name)
+        elif item := entry(spec_loader.find_spec(name)):
+            result[kind].append(item)
+    return result
+
+
 def _find_spec(name: str, category: str | None) -> Path | None:
     """Find a spec file by name and optional category."""
-    if category:
-        spec_path = SPECS_DIR / category / f"{name}.toml"
-        if spec_path.exists():
-            return spec_path
-    else:
-        # Search all categories
-        for spec_path in spec_loader.discover_specs():
-            if spec_path.stem == name:
-                return spec_path
-    return None
+    return spec_loader.find_spec(name, category)
 
 
 # =============================================================================
@@ -639,9 +1056,29 @@ def _find_spec(name: str, category: str | None) -> Path | None:
 # =============================================================================
 
 
-@server.list_prompts()
 async def list_prompts() -> list[Prompt]:
-    """List available prompts for workflow execution."""
+    """List available prompts for workflow execution, rebuilt only after changes."""
+    return list(_listing_cache.get_or_build(
+        "prompts", spec_loader.refresh(), _build_prompts
+    ))
+
+
+@server.list_prompts()
+async def list_prompts_page(request: ListPromptsRequest) -> ListPromptsResult:
+    """Serve one page of the prompt listing, sorted by name."""
+    generation = spec_loader.refresh()
+    prompts, next_cursor = _paginator.page(
+        "prompts",
+        generation,
+        lambda: _listing_cache.get_or_build("prompts", generation, _build_prompts),
+        lambda prompt: prompt.name,
+        request.params.cursor if request.params else None,
+    )
+    return ListPromptsResult(prompts=prompts, nextCursor=next_cursor)
+
+
+def _build_prompts() -> list[Prompt]:
+    """Build the prompt listing for the current specs."""
     prompts = []
 
     for spec_path in spec_loader.discover_specs():
@@ -662,6 +1099,16 @@ async def list_prompts() -> list[Prompt]:
                             description="Execution mode: 'collaboration' (default) or 'silent'",
                             required=False,
                         ),
+                        PromptArgument(
+                            name="task_name",
+                            description="Task name (directory name under .lia/), filled in for {task_name}",
+                            required=False,
+                        ),
+                        PromptArgument(
+                            name="workspace",
+                            description="Workspace root, filled in for ${WORKSPACE} and used to root .lia/ paths",
+                            required=False,
+                        ),
                     ],
                 )
             )
@@ -713,11 +1160,20 @@ async def get_prompt(name: str, arguments: dict[str, str] | None) -> GetPromptRe
         )
 
     # Get arguments
-    task = (arguments or {}).get("task", "")
-    mode = (arguments or {}).get("mode", "collaboration")
+    args = arguments or {}
+    task = args.get("task", "")
+    mode = args.get("mode", "collaboration")
 
     # Build the execution prompt
-    workflow_prompt = data["prompt"]
+    workflow_prompt = _renderer.render(
+        spec_loader.prompt_text(data),
+        {
+            "task": task,
+            "task_name": args.get("task_name", ""),
+            "workflow": spec_name,
+            "workspace": args.get("workspace", ""),
+        },
+    )
     description = data.get("description", "")
 
     # Construct the full prompt
@@ -754,10 +1210,33 @@ async def get_prompt(name: str, arguments: dict[str, str] | None) -> GetPromptRe
 # =============================================================================
 
 
+async def apply_spec_changes(paths: set[Path]) -> None:
+    """
+    Apply on-disk changes reported by the spec watcher.
+
+    Forces a refresh so edits show up immediately rather than after the
+    refresh throttle; only files whose stats changed are re-parsed. The
+    refresh runs on the event loop because the loader's caches are not
+    shared across threads. Subscribers are then notified of resources whose
+    content actually changed.
+    """
+    spec_loader.refresh(force=True)
+    await notifier.publish(resource_hashes())
+
+
 async def run_server():
-    """Run the MCP server."""
-    async with stdio_server() as (read_stream, write_stream):
-        await server.run(read_stream, write_stream, server.create_initialization_options())
+    """Run the MCP server, watching for spec edits unless WORKFLOW_SPECS_WATCH=0."""
+    watcher = None
+    if os.environ.get("WORKFLOW_SPECS_WATCH", "1") != "0":
+        notifier.diff(resource_hashes())
+        watcher = SpecWatcher(SPECS_DIR, apply_spec_changes)
+        watcher.start()
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await server.run(read_stream, write_stream, subscribable_options(server))
+    finally:
+        if watcher is not None:
+            await watcher.stop()
 
 
 def main():
@@ -4,17 +4,38 @@ Spec Loader Module
 Utilities for loading, parsing, and analysing workflow specification files.
 """
 
+import json
+import os
 import re
+import sys
+import time
 from dataclasses import dataclass, field
+from dataclasses import fields as dataclass_fields
 from pathlib import Path
 from typing import Optional
 
 import tomli
 
+from lia_workflow_mcp.cache import LRUCache
+from lia_workflow_mcp.changes import ChangeLog, diff_versions
+from lia_workflow_mcp.diagram import WorkflowDiagram, parse_prompt_diagram
+from lia_workflow_mcp.inheritance import COMMON_DIR, BaseResolver, structured_phases
+from lia_workflow_mcp.interning import intern_fields
+from lia_workflow_mcp.serialise import FragmentCache, content_hash
+from lia_workflow_mcp.similarity import SimilarityIndex
 
-@dataclass
+# Stamp recorded for a base file that does not exist
+MISSING_STAMP = (0, -1, 0)
+
+
+@dataclass(frozen=True, slots=True)
 class SpecMetadata:
-    """Metadata extracted from a workflow spec."""
+    """
+    Metadata extracted from a workflow spec.
+
+    Immutable; categorical strings are interned so they are shared across
+    specs.
+    """
 
     name: str
     path: str
@@ -34,6 +55,104 @@ class SpecMetadata:
     requires: list[str] = field(default_factory=list)
     tags: list[str] = field(default_factory=list)
     authors: list[str] = field(default_factory=list)
+    # Hash of the raw spec file, for client-side caching
+    content_hash: str = ""
+    _json: FragmentCache = field(
+        default_factory=FragmentCache, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self):
+        intern_fields(
+            self, "name", "category", "phases", "modes", "on_complete", "can_chain_from",
+            "provides", "requires", "tags",
+        )
+
+    def to_dict(self) -> dict:
+        """Convert metadata to a dictionary for JSON serialisation."""
+        return {
+            f.name: getattr(self, f.name)
+            for f in dataclass_fields(self)
+            if not f.name.startswith("_")
+        }
+
+    def to_json(
+        self,
+        fields: Optional[tuple[str, ...]] = None,
+        compact: bool = False,
+        level: int = 0,
+    ) -> str:
+        """
+        Get the metadata as a pre-encoded JSON fragment.
+
+        Metadata is memoised per spec version, so each projection is encoded
+        once per version and listings are assembled from the fragments.
+
+        Args:
+            fields: Fields to include, or None for all
+            compact: Encode without indentation
+            level: Nesting depth the fragment will be placed at
+        """
+        return self._json.get(self.to_dict, fields, compact, level)
+
+
+@dataclass
+class TriggerNode:
+    """A spec's position in the workflow trigger graph."""
+
+    name: str
+    path: Path
+    category: str
+    on_complete: list[str] = field(default_factory=list)
+    can_chain_from: list[str] = field(default_factory=list)
+    provides: list[str] = field(default_factory=list)
+
+
+@dataclass
+class TriggerGraph:
+    """Trigger edges between specs, compiled once per loader generation."""
+
+    nodes: dict[str, TriggerNode] = field(default_factory=dict)
+    generation: int = 0
+    paths: list[Path] = field(default_factory=list)
+    # Stamp of the shared trigger definitions the graph was built from
+    shared_stamp: Optional[tuple[int, int, int]] = None
+
+    def walk(self, start: str, depth: int) -> list[tuple[int, TriggerNode]]:
+        """
+        Breadth-first walk of `on_complete` edges from a spec.
+
+        Args:
+            start: Name of the starting spec
+            depth: Number of levels to visit
+
+        Returns:
+            List of (level, node) pairs in visiting order
+        """
+        visited = set()
+        current = [start]
+        result = []
+        for level in range(depth):
+            following = []
+            for name in current:
+                node = self.nodes.get(name)
+                if name in visited or node is None:
+                    continue
+                visited.add(name)
+                result.append((level, node))
+                following.extend(node.on_complete)
+            current = following
+        return result
+
+
+@dataclass
+class CatalogueView:
+    """Catalogue and category listings with their JSON pre-serialised."""
+
+    generation: int
+    by_category: dict[str, list[SpecMetadata]]
+    catalogue_json: str
+    category_json: dict[str, str]
+    categories_json: str
 
 
 @dataclass
@@ -72,55 +191,250 @@ class SpecLoader:
         "## 🤖 LLM Observations",
     ]
 
-    def __init__(self, specs_directory: Path):
+    def __init__(
+        self,
+        specs_directory: Path,
+        cache_size: int = 256,
+        cache_bytes: int = 32 * 1024 * 1024,
+        refresh_interval: float = 1.0,
+    ):
         """
         Initialise the spec loader.
 
         Args:
             specs_directory: Path to the specs directory
+            cache_size: Maximum number of parsed specs kept in memory
+            cache_bytes: Maximum total size of cached specs, measured as the
+                size of their source files
+            refresh_interval: Minimum seconds between checks of the specs
+                tree for changes when serving materialised views
         """
         self.specs_directory = specs_directory
-        self._cache: dict[str, dict] = {}
+        # Parsed specs keyed by path: (base files, data)
+        self._cache: LRUCache[tuple[list[Path], dict]] = LRUCache(
+            cache_size, cache_bytes, on_evict=self._on_evict
+        )
+        # Last seen (mtime_ns, size, inode) of every file loaded
+        self._stamps: dict[str, tuple[int, int, int]] = {}
+        # Base files any loaded spec inherits from
+        self._base_keys: set[str] = set()
+        self._diagrams: dict[str, Optional[WorkflowDiagram]] = {}
+        self._metadata: dict[str, SpecMetadata] = {}
+        # Content hash of each spec file, with the stamp it was computed for
+        self._hashes: dict[str, tuple[tuple[int, int, int], str]] = {}
+        # Discovered spec paths, revalidated against directory mtimes
+        self._dir_stamps: dict[str, int] = {}
+        self._spec_paths: Optional[list[Path]] = None
+        self._by_name: dict[str, Path] = {}
+        self._path_set: set[Path] = set()
+        self._similarity = SimilarityIndex()
+        self._similarity_generation: Optional[int] = None
+        self._bases = BaseResolver(specs_directory, self._parse_file)
+        # Bumped whenever cached data is invalidated
+        self._generation = 0
+        self._trigger_graph: Optional[TriggerGraph] = None
+        self.refresh_interval = refresh_interval
+        self._last_refresh = float("-inf")
+        self._view: Optional[CatalogueView] = None
+        # Specs added, modified or removed, keyed by a counter of its own
+        # that only advances when changes are logged
+        self.changes = ChangeLog()
+        self._change_generation = 0
+        self._versions: Optional[dict[str, str]] = None
+        self._versions_generation: Optional[int] = None
+        # Last logged metadata JSON of each spec file, None if unreadable
+        self._path_versions: dict[str, Optional[str]] = {}
 
     def discover_specs(self) -> list[Path]:
         """
         Discover all .toml spec files in the specs directory.
 
+        Shared bases and trigger definitions under `_common` are skipped.
+        The result is cached and only rescanned when the mtime of a
+        directory in the tree changes (a file was added, removed or renamed).
+
         Returns:
             List of paths to spec files
         """
-        if not self.specs_directory.exists():
-            return []
-        return sorted(self.specs_directory.rglob("*.toml"))
+        if self._spec_paths is None or self._dirs_changed():
+            self._scan_specs()
+        return list(self._spec_paths)
+
+    def find_spec(self, name: str, category: Optional[str] = None) -> Optional[Path]:
+        """
+        Find a spec file by name and optional category.
 
-    def load_spec(self, spec_path: Path) -> Optional[dict]:
+        Args:
+            name: Spec name (file stem)
+            category: Optional category directory
+
+        Returns:
+            Path to the spec file or None
+        """
+        self.discover_specs()
+        if category:
+            spec_path = self.specs_directory / category / f"{name}.toml"
+            return spec_path if spec_path in self._path_set else None
+        return self._by_name.get(name)
+
+    def _dirs_changed(self) -> bool:
+        """Check whether any directory in the specs tree has changed."""
+        for directory, mtime in self._dir_stamps.items():
+            try:
+                if os.stat(directory).st_mtime_ns != mtime:
+                    return True
+            except OSError:
+                return True
+        return not self._dir_stamps and self.specs_directory.exists()
+
+    def _scan_specs(self) -> None:
+        """Rescan the specs tree, recording directory mtimes."""
+        dir_stamps: dict[str, int] = {}
+        paths: list[Path] = []
+        for root, dirs, files in os.walk(self.specs_directory):
+            dirs[:] = [d for d in dirs if d != COMMON_DIR]
+            try:
+                dir_stamps[root] = os.stat(root).st_mtime_ns
+            except OSError:
+                continue
+            paths.extend(Path(root) / f for f in files if f.endswith(".toml"))
+        paths.sort()
+
+        if self._spec_paths is not None and paths != self._spec_paths:
+            self._generation += 1
+        self._dir_stamps = dir_stamps
+        self._spec_paths = paths
+        self._path_set = set(paths)
+        self._by_name = {}
+        for path in paths:
+            self._by_name.setdefault(path.stem, path)
+
+    def load_spec(self, spec_path: Path, cache: bool = True) -> Optional[dict]:
         """
         Load and parse a spec file.
 
+        If the spec extends a base, the returned data is the flattened
+        result of merging the spec over its base. Cached data is revalidated
+        against the file's mtime, size and inode on every call, so edits are
+        picked up without clearing the cache.
+
         Args:
             spec_path: Path to the spec file
+            cache: Mark a cached entry as used and cache a fresh parse. Scans
+                of the whole corpus pass False so they do not evict the
+                specs that are actually in use.
 
         Returns:
             Parsed spec data or None if loading fails
         """
         cache_key = str(spec_path)
-        if cache_key in self._cache:
-            return self._cache[cache_key]
+        stamp = self._stat(spec_path)
+        if stamp is None:
+            self._forget(cache_key, changed=self._stamps.pop(cache_key, None) is not None)
+            return None
+        if self._changed(cache_key, stamp):
+            self._forget(cache_key, changed=True)
 
+        entry = self._cache.get(cache_key) if cache else self._cache.peek(cache_key)
+        if entry is not None:
+            bases, data = entry
+            if not any(self._base_changed(base) for base in bases):
+                return data
+
+        data = self._parse_file(spec_path)
+        if data:
+            try:
+                data = self._bases.resolve(data, spec_path)
+            except ValueError as e:
+                print(f"Warning: {e}", file=sys.stderr)
+            bases = self._bases.bases_for(data, spec_path)
+            size = stamp[1]
+            for base in bases:
+                base_stamp = self._stat(base)
+                # A missing base is stamped too, so it is only rechecked
+                # for being created rather than invalidating every load
+                self._stamps.setdefault(str(base), base_stamp or MISSING_STAMP)
+                self._base_keys.add(str(base))
+                if base_stamp is not None:
+                    size += base_stamp[1]
+            if cache:
+                self._cache.put(cache_key, (bases, data), size)
+        return data
+
+    @staticmethod
+    def _stat(path: Path) -> Optional[tuple[int, int, int]]:
+        """Get a file's (mtime_ns, size, inode), or None if it is missing."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def _changed(self, key: str, stamp: tuple[int, int, int]) -> bool:
+        """Record a file's stamp, reporting whether it differs from the last one."""
+        previous = self._stamps.get(key)
+        self._stamps[key] = stamp
+        return previous is not None and previous != stamp
+
+    def _base_changed(self, base: Path) -> bool:
+        """
+        Check a base file for edits.
+
+        A changed, created or deleted base invalidates every cached spec,
+        since any of them may inherit from it.
+        """
+        key = str(base)
+        if not self._changed(key, self._stat(base) or MISSING_STAMP):
+            return False
+        self._stamps.pop(key, None)
+        self.clear_cache()
+        return True
+
+    def _forget(self, key: str, changed: bool = False) -> None:
+        """
+        Drop everything cached or logged for a file that changed or disappeared.
+
+        The generation is bumped if the file is known to have changed or
+        anything was held for it, even if it had been evicted.
+        """
+        if (
+            self._cache.pop(key) is not None
+            or changed
+            or key in self._diagrams
+            or key in self._metadata
+            or key in self._path_versions
+        ):
+            self._generation += 1
+        self._path_versions.pop(key, None)
+        self._diagrams.pop(key, None)
+        self._metadata.pop(key, None)
+
+    def _on_evict(self, key: str, entry: tuple[list[Path], dict]) -> None:
+        """Drop derived data for a spec evicted from the cache."""
+        self._diagrams.pop(key, None)
+        self._metadata.pop(key, None)
+
+    def cache_stats(self) -> dict[str, int]:
+        """
+        Get spec cache statistics.
+
+        Returns:
+            Dictionary with entry and byte counts, limits, hits, misses,
+            evictions and the current cache generation
+        """
+        return {**self._cache.stats(), "generation": self._generation}
+
+    def _parse_file(self, spec_path: Path) -> Optional[dict]:
+        """Parse a TOML file without resolving inheritance."""
         try:
             with open(spec_path, "rb") as f:
-                data = tomli.load(f)
-            self._cache[cache_key] = data
-            return data
+                return tomli.load(f)
         except tomli.TOMLDecodeError:
             # Some spec files may have invalid escape sequences (e.g., Windows paths)
             # Fall back to raw string parsing
             try:
                 content = spec_path.read_text(encoding="utf-8")
-                data = self._parse_spec_fallback(content)
-                if data:
-                    self._cache[cache_key] = data
-                return data
+                return self._parse_spec_fallback(content)
             except Exception:
                 return None
         except Exception:
@@ -148,6 +462,19 @@ class SpecLoader:
 
         return result if result else None
 
+    @staticmethod
+    def prompt_text(data: dict) -> str:
+        """
+        Get the prompt from parsed spec data.
+
+        Handles both a top-level `prompt` string and a `[prompt]` table
+        with a `content` key.
+        """
+        prompt = data.get("prompt", "")
+        if isinstance(prompt, dict):
+            prompt = prompt.get("content", "")
+        return prompt
+
     def get_spec_content(self, spec_path: Path) -> Optional[str]:
         """
         Get the raw content of a spec file.
@@ -163,31 +490,75 @@ class SpecLoader:
         except Exception:
             return None
 
+    def content_hash(self, spec_path: Path) -> Optional[str]:
+        """
+        Get a hash of a spec file's raw content.
+
+        The hash is recomputed only when the file's stats change, so a file
+        that is touched but not edited keeps the same hash.
+
+        Args:
+            spec_path: Path to the spec file
+
+        Returns:
+            Hex digest or None if the file cannot be read
+        """
+        key = str(spec_path)
+        stamp = self._stat(spec_path)
+        if stamp is None:
+            self._hashes.pop(key, None)
+            return None
+        entry = self._hashes.get(key)
+        if entry is not None and entry[0] == stamp:
+            return entry[1]
+        try:
+            digest = content_hash(spec_path.read_bytes())
+        except OSError:
+            return None
+        self._hashes[key] = (stamp, digest)
+        return digest
+
     def extract_metadata(self, spec_path: Path) -> Optional[SpecMetadata]:
         """
         Extract metadata from a spec file.
 
+        Metadata is memoised per spec version; an edited spec is
+        re-extracted on the next call.
+
         Args:
             spec_path: Path to the spec file
 
         Returns:
             SpecMetadata object or None
         """
+        # Loading first revalidates the spec, dropping stale metadata
         data = self.load_spec(spec_path)
         if not data:
             return None
 
-        prompt = data.get("prompt", "")
+        cache_key = str(spec_path)
+        metadata = self._metadata.get(cache_key)
+        if metadata is None:
+            metadata = self._build_metadata(spec_path, data)
+            self._metadata[cache_key] = metadata
+        return metadata
+
+    def _build_metadata(self, spec_path: Path, data: dict) -> SpecMetadata:
+        """Extract metadata from parsed spec data."""
+
+        prompt = self.prompt_text(data)
         description = data.get("description", "")
 
-        # Extract category from path
-        try:
-            category = spec_path.parent.name
-        except Exception:
-            category = "unknown"
+        # Extract category from [meta] or the path
+        meta = data.get("meta", {})
+        category = meta.get("category") or spec_path.parent.name
 
-        # Extract phases from workflow definition
-        phases = self._extract_phases(prompt)
+        # Prefer [[phases]] tables, falling back to the workflow definition
+        table_phases = structured_phases(data)
+        if table_phases is not None:
+            phases = [phase["name"] for phase in table_phases]
+        else:
+            phases = self._extract_phases(prompt)
 
         # Count constraints
         constraints = {
@@ -222,9 +593,9 @@ class SpecLoader:
 
         # Extract metadata fields
         metadata_section = data.get("metadata", {})
-        tags = metadata_section.get("tags", [])
+        tags = metadata_section.get("tags", meta.get("tags", []))
         authors = metadata_section.get("authors", [])
-        version = metadata_section.get("version", "1.0.0")
+        version = metadata_section.get("version", meta.get("version", "1.0.0"))
 
         return SpecMetadata(
             name=spec_path.stem,
@@ -244,8 +615,33 @@ class SpecLoader:
             requires=requires,
             tags=tags,
             authors=authors,
+            content_hash=self.content_hash(spec_path) or "",
         )
 
+    def get_diagram(self, spec_path: Path) -> Optional[WorkflowDiagram]:
+        """
+        Get the spec's Mermaid workflow diagram parsed into nodes and edges.
+
+        The diagram is parsed once per spec and cached alongside it.
+
+        Args:
+            spec_path: Path to the spec file
+
+        Returns:
+            WorkflowDiagram or None if the spec has no diagram
+        """
+        # Loading first revalidates the spec, dropping a stale diagram
+        data = self.load_spec(spec_path)
+        if not data:
+            return None
+
+        cache_key = str(spec_path)
+        if cache_key in self._diagrams:
+            return self._diagrams[cache_key]
+        diagram = parse_prompt_diagram(self.prompt_text(data))
+        self._diagrams[cache_key] = diagram
+        return diagram
+
     def _extract_phases(self, prompt: str) -> list[str]:
         """Extract phase names from a spec prompt."""
         phases = []
@@ -302,7 +698,7 @@ class SpecLoader:
                 result.info.append(f"Found required key: '{key}'")
 
         # Validate prompt content
-        prompt = data.get("prompt", "")
+        prompt = self.prompt_text(data)
 
         # Check required sections
         for section in self.REQUIRED_SECTIONS:
@@ -394,7 +790,7 @@ class SpecLoader:
                 continue
 
             # Search in prompt content
-            prompt = data.get("prompt", "").lower()
+            prompt = self.prompt_text(data).lower()
             if query_lower in prompt:
                 metadata = self.extract_metadata(spec_path)
                 if metadata:
@@ -433,6 +829,224 @@ class SpecLoader:
 
         return by_category
 
+    def refresh(self, force: bool = False) -> int:
+        """
+        Check the specs tree for added, removed or edited specs.
+
+        Checks are throttled to one per `refresh_interval` seconds unless
+        `force` is set. Files are checked by their stats alone, and only
+        changed specs are parsed again. Changed specs are recorded in
+        `changes`.
+
+        Returns:
+            The cache generation after the check
+        """
+        now = time.monotonic()
+        if force or now - self._last_refresh >= self.refresh_interval:
+            self._last_refresh = now
+            self._revalidate()
+            self._log_changes()
+        return self._generation
+
+    def _revalidate(self) -> None:
+        """Drop cached data for spec and base files whose stats changed."""
+        for base in list(self._base_keys):
+            if self._base_changed(Path(base)):
+                break
+        for spec_path in self.discover_specs():
+            key = str(spec_path)
+            stamp = self._stat(spec_path)
+            if stamp is None:
+                self._forget(key, changed=self._stamps.pop(key, None) is not None)
+            elif self._changed(key, stamp):
+                self._forget(key, changed=True)
+
+    def change_cursor(self) -> str:
+        """
+        Get a `changes` cursor for the current state of the specs.
+
+        Changes already picked up by other calls are logged first, so they
+        fall before the cursor rather than being recorded at or below it.
+        """
+        self._log_changes()
+        return self.changes.cursor(self._change_generation)
+
+    def _log_changes(self) -> None:
+        """Record which specs changed since the last generation logged."""
+        if self._versions_generation == self._generation:
+            return
+        # Only specs forgotten since the last log are extracted again
+        path_versions: dict[str, Optional[str]] = {}
+        for spec_path in self.discover_specs():
+            key = str(spec_path)
+            if key in self._path_versions:
+                path_versions[key] = self._path_versions[key]
+            else:
+                metadata = self.extract_metadata(spec_path)
+                path_versions[key] = metadata.to_json() if metadata else None
+        self._path_versions = path_versions
+        versions: dict[str, str] = {}
+        for key, version in path_versions.items():
+            if version is not None:
+                versions.setdefault(Path(key).stem, version)
+        if self._versions is not None:
+            changes = diff_versions(self._versions, versions)
+            if changes:
+                self._change_generation += 1
+                self.changes.record(self._change_generation, changes)
+        self._versions = versions
+        self._versions_generation = self._generation
+
+    def get_catalogue_view(self) -> CatalogueView:
+        """
+        Get the materialised catalogue and category listings.
+
+        The view is rebuilt only when a spec has changed, so between changes
+        reads return pre-serialised JSON without touching the specs.
+
+        Returns:
+            CatalogueView for the current generation
+        """
+        generation = self.refresh()
+        view = self._view
+        if view is not None and view.generation == generation:
+            return view
+
+        by_category = self.get_specs_by_category()
+        # Building may itself detect changes; tag the view with the final state
+        generation = self._generation
+        catalogue = {
+            category: [
+                {
+                    "name": s.name,
+                    "description": s.description,
+                    "phases": s.phases,
+                    "modes": s.modes,
+                    "output_directory": s.output_directory,
+                }
+                for s in specs
+            ]
+            for category, specs in by_category.items()
+        }
+        category_json = {
+            category: json.dumps(
+                [
+                    {
+                        "name": s.name,
+                        "description": s.description,
+                        "path": s.path,
+                        "phases": s.phases,
+                        "constraints": s.constraints,
+                        "modes": s.modes,
+                    }
+                    for s in specs
+                ],
+                indent=2,
+            )
+            for category, specs in by_category.items()
+        }
+        categories = {
+            "categories": [
+                {"name": category, "spec_count": len(by_category.get(category, []))}
+                for category in sorted({p.parent.name for p in self.discover_specs()})
+            ]
+        }
+        view = CatalogueView(
+            generation=generation,
+            by_category=by_category,
+            catalogue_json=json.dumps(catalogue, indent=2),
+            category_json=category_json,
+            categories_json=json.dumps(categories, indent=2),
+        )
+        self._view = view
+        return view
+
+    def get_similarity_index(self) -> SimilarityIndex:
+        """
+        Get the prompt similarity index, bringing it up to date first.
+
+        The index is checked against the cache generation after a stat-only
+        revalidation, and specs are loaded only when it has to be brought up
+        to date. Even then, only specs whose prompt changed are re-signed.
+
+        Returns:
+            SimilarityIndex keyed by spec name
+        """
+        self._revalidate()
+        if self._similarity_generation == self._generation:
+            return self._similarity
+
+        names = []
+        for spec_path in self.discover_specs():
+            data = self.load_spec(spec_path, cache=False)
+            prompt = self.prompt_text(data) if data else ""
+            if prompt:
+                self._similarity.update(spec_path.stem, prompt)
+                names.append(spec_path.stem)
+        self._similarity.retain(names)
+        # Loading may itself detect changes; tag the index with the final state
+        self._similarity_generation = self._generation
+        return self._similarity
+
+    def get_trigger_graph(self) -> TriggerGraph:
+        """
+        Get the workflow trigger graph, compiling it on first use.
+
+        Each spec's own `[triggers]` table takes precedence over its entry in
+        `_common/workflow-triggers.toml`. The graph is rebuilt only when a
+        spec is added, removed or edited.
+
+        Returns:
+            TriggerGraph keyed by spec name
+        """
+        # Stat-only checks bump the generation on edits; specs are loaded
+        # only when the graph has to be rebuilt
+        self._revalidate()
+        spec_paths = self.discover_specs()
+        shared_path = self.specs_directory / COMMON_DIR / "workflow-triggers.toml"
+        shared_stamp = self._stat(shared_path)
+
+        graph = self._trigger_graph
+        if (
+            graph is not None
+            and graph.generation == self._generation
+            and graph.paths == spec_paths
+            and graph.shared_stamp == shared_stamp
+        ):
+            return graph
+
+        shared = (self.load_spec(shared_path, cache=False) or {}).get("triggers", {})
+        loaded = [
+            (spec_path, self.load_spec(spec_path, cache=False) or {}) for spec_path in spec_paths
+        ]
+        # Loading may itself detect changes; tag the graph with the final state
+        graph = TriggerGraph(
+            generation=self._generation, paths=spec_paths, shared_stamp=shared_stamp
+        )
+        for spec_path, data in loaded:
+            name = spec_path.stem
+            if name in graph.nodes:
+                continue
+            triggers = dict(shared.get(name, {}))
+            triggers.update(data.get("triggers", {}))
+            graph.nodes[name] = TriggerNode(
+                name=name,
+                path=spec_path,
+                category=data.get("meta", {}).get("category") or spec_path.parent.name,
+                on_complete=list(triggers.get("on_complete", [])),
+                can_chain_from=list(triggers.get("can_chain_from", [])),
+                provides=list(triggers.get("provides", triggers.get("typical_outputs", []))),
+            )
+
+        self._trigger_graph = graph
+        return graph
+
     def clear_cache(self):
         """Clear the spec cache."""
+        self._generation += 1
         self._cache.clear()
+        self._diagrams.clear()
+        self._metadata.clear()
+        self._path_versions.clear()
+        self._bases.clear()
+        self._spec_paths = None
@@ -0,0 +1,59 @@
+"""
+Tests for the cache module.
+"""
+
+import pytest
+
+from lia_workflow_mcp.cache import LRUCache
+
+
+class TestLRUCache:
+    """Tests for LRUCache."""
+
+    def test_evicts_least_recently_used(self):
+        evicted = []
+        cache = LRUCache(max_entries=2, on_evict=lambda k, v: evicted.append(k))
+        cache.put("a", 1)
+        cache.put("b", 2)
+        assert cache.get("a") == 1
+        cache.put("c", 3)
+
+        assert evicted == ["b"]
+        assert "a" in cache and "c" in cache
+        assert cache.stats()["evictions"] == 1
+
+    def test_byte_limit(self):
+        cache = LRUCache(max_entries=10, max_bytes=100)
+        cache.put("a", "x", size=60)
+        cache.put("b", "y", size=60)
+        assert "a" not in cache
+        assert cache.size_bytes == 60
+
+        # Entries larger than the whole budget are not cached
+        cache.put("c", "z", size=101)
+        assert "c" not in cache
+
+    def test_hit_miss_counters(self):
+        cache = LRUCache()
+        cache.put("a", 1)
+        cache.get("a")
+        cache.get("missing")
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+    def test_peek_leaves_order_and_counters(self):
+        cache = LRUCache(max_entries=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        assert cache.peek("a") == 1
+        assert cache.peek("missing") is None
+        cache.put("c", 3)
+
+        assert "a" not in cache
+        assert cache.stats()["hits"] == 0
+        assert cache.stats()["misses"] == 0
+
+    def test_invalid_size(self):
+        with pytest.raises(ValueError):
+            LRUCache(max_entries=0)
@@ -0,0 +1,41 @@
+"""
+Tests for the changes module.
+"""
+
+from lia_workflow_mcp.changes import ChangeLog, diff_versions
+
+
+class TestDiffVersions:
+    """Tests for diff_versions."""
+
+    def test_diff(self):
+        changes = diff_versions({"a": 1, "b": 1, "c": 1}, {"a": 1, "b": 2, "d": 1})
+        assert sorted(changes) == [("b", "modified"), ("c", "removed"), ("d", "added")]
+
+
+class TestChangeLog:
+    """Tests for ChangeLog."""
+
+    def test_since_coalesces(self):
+        log = ChangeLog()
+        start = log.cursor(1)
+        log.record(2, [("a", "added"), ("b", "modified")])
+        middle = log.cursor(2)
+        log.record(3, [("a", "modified"), ("c", "added")])
+        log.record(4, [("c", "removed"), ("b", "removed")])
+
+        assert log.since(start) == {"a": "added", "b": "removed"}
+        assert log.since(middle) == {"a": "modified", "b": "removed"}
+        assert log.since(log.cursor(4)) == {}
+
+    def test_unservable_cursors(self):
+        log = ChangeLog(max_entries=2)
+        old = log.cursor(1)
+        log.record(2, [("a", "added")])
+        log.record(3, [("b", "added"), ("c", "added")])
+
+        assert log.since(old) is None
+        assert log.since(log.cursor(2)) == {"b": "added", "c": "added"}
+        assert log.since(None) is None
+        assert log.since("other:2") is None
+        assert log.since(f"{log.epoch}:x") is None
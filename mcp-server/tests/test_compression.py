@@ -0,0 +1,43 @@
+"""
+Tests for the compression module.
+"""
+
+from lia_workflow_mcp.compression import PromptStore, train_dictionary
+
+SHARED = "## Workflow Mode System\nCollaboration or silent.\n" * 3
+
+
+class TestTrainDictionary:
+    """Tests for train_dictionary."""
+
+    def test_shared_lines_only(self):
+        zdict = train_dictionary([SHARED + "only in one\n", SHARED + "only in two\n"])
+        assert b"Collaboration or silent." in zdict
+        assert b"only in" not in zdict
+        assert len(train_dictionary([SHARED, SHARED], max_bytes=10)) == 10
+
+
+class TestPromptStore:
+    """Tests for PromptStore."""
+
+    def test_round_trip_and_hot_cache(self):
+        store = PromptStore(max_hot_bytes=1024)
+        store.train([SHARED + "a\n", SHARED + "b\n"])
+        text = SHARED + "Phase 1: plan the work.\n"
+        prompt = store.compress(text)
+
+        assert len(prompt.data) < len(text)
+        assert prompt.text() == text
+        assert prompt.text() == text
+        stats = store.stats()
+        assert stats["decompressions"] == 1
+        assert stats["hot"]["hits"] == 1
+        assert stats["ratio"] > 1
+
+    def test_retraining_keeps_old_prompts_readable(self):
+        store = PromptStore(max_hot_bytes=1)
+        store.train([SHARED, SHARED])
+        old = store.compress(SHARED)
+        store.train(["something else\n", "something else\n"])
+        assert old.text() == SHARED
+        assert store.compress(SHARED) != old
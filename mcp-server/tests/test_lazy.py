@@ -0,0 +1,76 @@
+"""
+Tests for the lazy module.
+"""
+
+import pytest
+
+from lia_workflow_mcp.lazy import LazyPrompt, LazyPrompts, StalePromptError
+from lia_workflow_mcp.models import SpecCollection
+
+PROMPT = "# Goal\nShip it.\n### 1. Plan\nPlan it.\n"
+
+
+def write_spec(directory, name, body):
+    spec_file = directory / "development" / f"{name}.toml"
+    spec_file.parent.mkdir(exist_ok=True)
+    spec_file.write_text(body)
+    return spec_file
+
+
+class TestLazyPrompts:
+    """Tests for loading prompts on demand."""
+
+    def test_offsets_and_eviction(self, tmp_path):
+        write_spec(tmp_path, "one", f'description = "One"\nprompt = """\n{PROMPT}"""\n')
+        collection = SpecCollection()
+        collection.lazy_prompts = LazyPrompts(collection.read_prompt, max_resident_bytes=1)
+        collection.load_from_directory(tmp_path)
+
+        spec = collection.get_by_name("one")
+        assert isinstance(spec._prompt.body, LazyPrompt)
+        assert spec._prompt.body.offset is not None
+        assert [p.name for p in spec.phases] == ["Plan"]
+        assert spec.prompt == PROMPT
+        assert spec.prompt == PROMPT
+        assert [s.title for s in spec.sections] == ["Goal", "1. Plan"]
+
+        stats = collection.lazy_prompts.stats()
+        assert stats["loads"] == 3
+        assert stats["parses"] == 0
+        assert stats["resident"]["entries"] == 0
+
+    def test_prompt_without_offset_is_parsed(self, tmp_path):
+        write_spec(tmp_path, "escaped", 'prompt = "Line one\\nLine two"\n')
+        collection = SpecCollection()
+        collection.lazy_prompts = LazyPrompts(collection.read_prompt)
+        collection.load_from_directory(tmp_path)
+
+        spec = collection.get_by_name("escaped")
+        assert spec._prompt.body.offset is None
+        assert spec.prompt == "Line one\nLine two"
+        assert collection.lazy_prompts.stats()["parses"] == 1
+
+    def test_moved_prompt_is_parsed(self, tmp_path):
+        spec_file = write_spec(tmp_path, "one", f'prompt = """\n{PROMPT}"""\n')
+        collection = SpecCollection()
+        collection.lazy_prompts = LazyPrompts(collection.read_prompt)
+        collection.load_from_directory(tmp_path)
+
+        spec_file.write_text(f'description = "Moved"\nprompt = """\n{PROMPT}"""\n')
+        assert collection.get_by_name("one").prompt == PROMPT
+        assert collection.lazy_prompts.stats()["parses"] == 1
+
+    def test_edited_prompt_is_not_served(self, tmp_path):
+        spec_file = write_spec(tmp_path, "one", f'prompt = """\n{PROMPT}"""\n')
+        collection = SpecCollection()
+        collection.lazy_prompts = LazyPrompts(collection.read_prompt)
+        collection.load_from_directory(tmp_path)
+
+        spec_file.write_text('prompt = """\nInserted.\n' + PROMPT + '"""\n')
+        with pytest.raises(StalePromptError):
+            collection.get_by_name("one").sections
+
+        collection.reload_paths({spec_file})
+        spec = collection.get_by_name("one")
+        assert spec.prompt == "Inserted.\n" + PROMPT
+        assert [s.text for s in spec.sections][:2] == ["Inserted.\n", "# Goal\nShip it.\n"]
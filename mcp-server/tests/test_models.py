@@ -2,6 +2,7 @@
 Tests for the models module.
 """
 
+import dataclasses
 import pytest
 from pathlib import Path
 import tempfile
@@ -27,7 +28,16 @@ class TestWorkflowPhase:
         assert phase.number == 1
         assert phase.name == "Task Analysis"
         assert phase.description == "Analyse the task requirements"
-        assert phase.constraints == []
+        assert phase.constraints == ()
+    
+    def test_phase_compact(self):
+        """Test phases are slotted, immutable and share their names."""
+        first = WorkflowPhase(number=1, name="".join(["Task ", "Analysis"]), description="")
+        second = WorkflowPhase(number=1, name="".join(["Task ", "Analysis"]), description="")
+        assert first.name is second.name
+        assert not hasattr(first, "__dict__")
+        with pytest.raises(AttributeError):
+            first.name = "Other"
 
 
 class TestWorkflowSpec:
@@ -40,11 +50,32 @@ class TestWorkflowSpec:
             filepath=Path("/tmp/test.toml"),
             category=SpecCategory.DEVELOPMENT,
             description="A test workflow",
-            prompt="Test prompt content",
+            body="Test prompt content",
         )
         assert spec.name == "test"
         assert spec.category == SpecCategory.DEVELOPMENT
     
+    def test_spec_is_immutable(self):
+        """Test list arguments are stored as tuples and fields cannot be set."""
+        spec = WorkflowSpec(
+            name="test",
+            filename="test.toml",
+            filepath=Path("/tmp/test.toml"),
+            category=SpecCategory.DEVELOPMENT,
+            description="A test workflow",
+            body="# Goal\nShip it.\n",
+            phases=[WorkflowPhase(number=1, name="Plan", description="")],
+            tags=["development"],
+        )
+        assert spec.tags == ("development",)
+        assert isinstance(spec.phases, tuple)
+        assert spec.prompt == "# Goal\nShip it.\n"
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            spec.tags = ()
+        
+        spec.warm()
+        assert [s.title for s in spec.sections] == ["Goal"]
+    
     def test_extract_phases(self):
         prompt = """
         ### 1. Task Analysis and Planning
@@ -79,7 +110,7 @@ class TestWorkflowSpec:
             filepath=Path("/tmp/test.toml"),
             category=SpecCategory.DEVELOPMENT,
             description="A test workflow",
-            prompt="Test prompt",
+            body="Test prompt",
             phases=[
                 WorkflowPhase(number=1, name="Phase 1", description=""),
             ],
@@ -99,7 +130,7 @@ class TestWorkflowSpec:
             filepath=Path("/tmp/test.toml"),
             category=SpecCategory.DEVELOPMENT,
             description="A test workflow for development",
-            prompt="Test prompt",
+            body="Test prompt",
             phases=[
                 WorkflowPhase(number=1, name="Planning", description=""),
                 WorkflowPhase(number=2, name="Implementation", description=""),
@@ -143,6 +174,22 @@ More content.
         finally:
             os.unlink(temp_path)
 
+    def test_to_json_fragments(self):
+        """Test pre-encoded JSON fragments and projection."""
+        import json
+        
+        spec = WorkflowSpec(
+            name="frag",
+            filename="frag.toml",
+            filepath=Path("/tmp/frag.toml"),
+            category=SpecCategory.QUALITY,
+            description="Fragment test",
+            body="Prompt",
+        )
+        assert json.loads(spec.to_json()) == spec.to_dict()
+        assert spec.to_json(("name",), compact=True) == '{"name":"frag"}'
+        assert spec.to_json(("name",), compact=True) is spec.to_json(("name",), compact=True)
+
 
 class TestSpecCollection:
     """Tests for SpecCollection."""
@@ -163,13 +210,18 @@ class TestSpecCollection:
             filepath=Path("/tmp/test.toml"),
             category=SpecCategory.DEVELOPMENT,
             description="Test",
-            prompt="Prompt",
+            body="Prompt",
         )
         collection = SpecCollection(specs=[spec])
         
         result = collection.get_by_name("test")
         assert result is not None
         assert result.name == "test"
+        assert collection.get_by_name("test.toml") is spec
+        
+        # The name index is rebuilt when the specs are replaced
+        collection.specs = []
+        assert collection.get_by_name("test") is None
     
     def test_get_by_category(self):
         specs = [
@@ -179,7 +231,7 @@ class TestSpecCollection:
                 filepath=Path("/tmp/dev.toml"),
                 category=SpecCategory.DEVELOPMENT,
                 description="Dev",
-                prompt="Prompt",
+                body="Prompt",
             ),
             WorkflowSpec(
                 name="review",
@@ -187,7 +239,7 @@ class TestSpecCollection:
                 filepath=Path("/tmp/review.toml"),
                 category=SpecCategory.QUALITY,
                 description="Review",
-                prompt="Prompt",
+                body="Prompt",
             ),
         ]
         collection = SpecCollection(specs=specs)
@@ -204,7 +256,7 @@ class TestSpecCollection:
                 filepath=Path("/tmp/dev.toml"),
                 category=SpecCategory.DEVELOPMENT,
                 description="Development workflow",
-                prompt="Prompt",
+                body="Prompt",
                 tags=["development", "coding"],
             ),
             WorkflowSpec(
@@ -213,7 +265,7 @@ class TestSpecCollection:
                 filepath=Path("/tmp/security.toml"),
                 category=SpecCategory.QUALITY,
                 description="Security assessment workflow",
-                prompt="Prompt",
+                body="Prompt",
                 tags=["security", "audit"],
             ),
         ]
@@ -242,7 +294,7 @@ class TestSpecCollection:
                 filepath=Path("/tmp/dev.toml"),
                 category=SpecCategory.DEVELOPMENT,
                 description="Dev",
-                prompt="Prompt",
+                body="Prompt",
             ),
             WorkflowSpec(
                 name="spec",
@@ -250,7 +302,7 @@ class TestSpecCollection:
                 filepath=Path("/tmp/spec.toml"),
                 category=SpecCategory.DEVELOPMENT,
                 description="Spec",
-                prompt="Prompt",
+                body="Prompt",
             ),
             WorkflowSpec(
                 name="review",
@@ -258,7 +310,7 @@ class TestSpecCollection:
                 filepath=Path("/tmp/review.toml"),
                 category=SpecCategory.QUALITY,
                 description="Review",
-                prompt="Prompt",
+                body="Prompt",
             ),
         ]
         collection = SpecCollection(specs=specs)
@@ -277,7 +329,7 @@ class TestSpecCollection:
                 filepath=Path("/tmp/dev.toml"),
                 category=SpecCategory.DEVELOPMENT,
                 description="Development implementation workflow",
-                prompt="Prompt",
+                body="Prompt",
                 tags=["development", "implementation"],
             ),
             WorkflowSpec(
@@ -286,7 +338,7 @@ class TestSpecCollection:
                 filepath=Path("/tmp/security.toml"),
                 category=SpecCategory.QUALITY,
                 description="Security vulnerability assessment",
-                prompt="Prompt",
+                body="Prompt",
                 tags=["security", "vulnerability"],
             ),
             WorkflowSpec(
@@ -295,7 +347,7 @@ class TestSpecCollection:
                 filepath=Path("/tmp/troubleshoot.toml"),
                 category=SpecCategory.PROBLEM_SOLVING,
                 description="Problem diagnosis and resolution",
-                prompt="Prompt",
+                body="Prompt",
                 tags=["debug", "problem"],
             ),
         ]
@@ -330,3 +382,281 @@ class TestSpecCategory:
         ]
         actual = [c.value for c in SpecCategory]
         assert sorted(actual) == sorted(expected)
+
+
+class TestSpecSimilarity:
+    """Tests for prompt similarity on SpecCollection."""
+    
+    @staticmethod
+    def _spec(name: str, prompt: str) -> WorkflowSpec:
+        return WorkflowSpec(
+            name=name,
+            filename=f"{name}.toml",
+            filepath=Path(f"/tmp/{name}.toml"),
+            category=SpecCategory.DEVELOPMENT,
+            description=name,
+            body=prompt,
+        )
+    
+    def test_similarity_and_related(self):
+        base = " ".join(f"step {i} requires careful review of the design" for i in range(40))
+        collection = SpecCollection(specs=[
+            self._spec("a", base),
+            self._spec("b", base + " with one extra closing sentence"),
+            self._spec("c", "a completely different prompt about academic paper analysis"),
+        ])
+        
+        assert collection.similarity("a", "b") > 0.8
+        assert collection.similarity("a", "c") < 0.2
+        
+        related = collection.get_related("a", limit=1)
+        assert [s.name for s, _ in related] == ["b"]
+        
+        duplicates = collection.similarity_index().near_duplicates(0.8)
+        assert [(x, y) for x, y, _ in duplicates] == [("a", "b")]
+    
+    def test_signatures_are_incremental(self):
+        collection = SpecCollection(specs=[self._spec("a", "some prompt text here")])
+        index = collection.similarity_index()
+        
+        assert not index.update("a", "some prompt text here")
+        assert index.update("a", "changed prompt text here")
+        
+        collection.specs = []
+        assert "a" not in collection.similarity_index()
+
+
+class TestWorkflowDiagram:
+    """Tests for Mermaid diagram parsing."""
+    
+    def test_parse_flowchart(self):
+        from lia_workflow_mcp.diagram import parse_prompt_diagram
+        
+        prompt = """
+## Workflow Diagram
+```mermaid
+graph TD
+    A[Start: Request] --> B[1. Planning]
+    B -->|approved| C{Done?}
+    B --> [*] : Update
+```
+"""
+        diagram = parse_prompt_diagram(prompt)
+        assert diagram is not None
+        assert diagram.direction == "TD"
+        assert [n.id for n in diagram.nodes] == ["A", "B", "C", "[*]"]
+        assert diagram.nodes[0].label == "Start: Request"
+        assert diagram.nodes[2].shape == "diamond"
+        assert [(e.source, e.target, e.label) for e in diagram.edges] == [
+            ("A", "B", None),
+            ("B", "C", "approved"),
+            ("B", "[*]", "Update"),
+        ]
+    
+    def test_parse_state_diagram(self):
+        from lia_workflow_mcp.diagram import parse_mermaid
+        
+        diagram = parse_mermaid("""stateDiagram-v2
+  [*] --> Requirements : Initial Creation
+  Requirements : Write Requirements
+  A: Learning Project --> B: Profile Assessment
+""")
+        labels = {n.id: n.label for n in diagram.nodes}
+        assert labels["Requirements"] == "Write Requirements"
+        assert labels["A"] == "Learning Project"
+        assert labels["B"] == "Profile Assessment"
+        assert diagram.edges[0].label == "Initial Creation"
+        assert diagram.edges[1].label is None
+    
+    def test_no_diagram(self):
+        from lia_workflow_mcp.diagram import parse_prompt_diagram
+        
+        assert parse_prompt_diagram("No diagram here") is None
+
+
+class TestBaseInheritance:
+    """Tests for specs that extend a shared base."""
+    
+    BASE = '''
+[meta]
+version = "1.0.0"
+category = "quality"
+
+[config]
+resumable = true
+output_dir = ".lia/{workflow_type}/{task_name}"
+
+[[phases]]
+name = "Plan"
+output_file = "1-plan.md"
+
+[[phases]]
+name = "Execute"
+constraints = ["MUST record assumptions"]
+'''
+    
+    def _write_specs(self, root: Path) -> None:
+        (root / "_common").mkdir()
+        (root / "_common" / "base.toml").write_text(self.BASE)
+        (root / "development").mkdir()
+        (root / "development" / "child.toml").write_text(
+            'extends = "base"\n'
+            'description = "Child workflow"\n'
+            'prompt = "### 1. Ignored"\n'
+            '[meta]\ntags = ["child"]\n'
+        )
+        (root / "development" / "other.toml").write_text(
+            'description = "Other"\nprompt = "x"\n[meta]\nextends = "base"\n'
+        )
+    
+    def test_extends_merges_base(self, tmp_path):
+        self._write_specs(tmp_path)
+        collection = SpecCollection()
+        collection.load_from_directory(tmp_path)
+        
+        # _common files are not loaded as specs
+        assert sorted(s.name for s in collection.specs) == ["child", "other"]
+        child = collection.get_by_name("child")
+        assert child.category == SpecCategory.QUALITY
+        assert "child" in child.tags
+        assert [(p.number, p.name) for p in child.phases] == [(1, "Plan"), (2, "Execute")]
+        assert child.phases[0].output_file == "1-plan.md"
+        assert child.phases[1].constraints == ("MUST record assumptions",)
+    
+    def test_base_parsed_once(self, tmp_path, monkeypatch):
+        self._write_specs(tmp_path)
+        parsed = []
+        read_toml = WorkflowSpec.read_toml
+        
+        def counting_read(filepath):
+            parsed.append(filepath.name)
+            return read_toml(filepath)
+        
+        monkeypatch.setattr(WorkflowSpec, "read_toml", staticmethod(counting_read))
+        collection = SpecCollection()
+        collection.load_from_directory(tmp_path)
+        
+        assert len(collection.specs) == 2
+        assert parsed.count("base.toml") == 1
+    
+    def test_circular_extends(self, tmp_path):
+        from lia_workflow_mcp.inheritance import BaseResolver
+        
+        (tmp_path / "_common").mkdir()
+        (tmp_path / "_common" / "a.toml").write_text('extends = "b"\n')
+        (tmp_path / "_common" / "b.toml").write_text('extends = "a"\n')
+        resolver = BaseResolver(tmp_path, WorkflowSpec.read_toml)
+        with pytest.raises(ValueError):
+            resolver.resolve({"extends": "a"}, tmp_path / "spec.toml")
+
+
+class TestIncrementalReload:
+    """Tests for reloading only changed spec files."""
+    
+    def test_reload_paths(self, tmp_path):
+        (tmp_path / "development").mkdir()
+        one = tmp_path / "development" / "one.toml"
+        two = tmp_path / "development" / "two.toml"
+        one.write_text('description = "One"\nprompt = "x"\n')
+        two.write_text('description = "Two"\nprompt = "y"\n')
+        
+        collection = SpecCollection()
+        collection.load_from_directory(tmp_path)
+        snapshot = collection.snapshot()
+        untouched = collection.get_by_name("two")
+        
+        one.write_text('description = "One, edited"\nprompt = "x"\n')
+        three = tmp_path / "development" / "three.toml"
+        three.write_text('description = "Three"\nprompt = "z"\n')
+        assert collection.reload_paths({one, three})
+        
+        assert collection.generation > snapshot.generation
+        assert collection.get_by_name("one").description == "One, edited"
+        assert collection.get_by_name("two") is untouched
+        assert collection.get_by_name("three") is not None
+        # Earlier snapshots are unaffected by the reload
+        assert {s.description for s in snapshot.specs} == {"One", "Two"}
+        
+        two.unlink()
+        assert collection.reload_paths({two})
+        assert collection.get_by_name("two") is None
+        assert not collection.reload_paths({tmp_path / "notes.txt"})
+
+
+    def test_changes_logged(self, tmp_path):
+        (tmp_path / "development").mkdir()
+        one = tmp_path / "development" / "one.toml"
+        two = tmp_path / "development" / "two.toml"
+        one.write_text('description = "One"\nprompt = "x"\n')
+        two.write_text('description = "Two"\nprompt = "y"\n')
+        
+        collection = SpecCollection()
+        collection.load_from_directory(tmp_path)
+        cursor = collection.changes.cursor(collection.generation)
+        
+        # Reloading unchanged files records nothing
+        collection.reload_paths({one, two})
+        assert collection.changes.since(cursor) == {}
+        
+        one.write_text('description = "One"\nprompt = "edited"\n')
+        two.unlink()
+        collection.reload_paths({one, two})
+        assert collection.changes.since(cursor) == {"one": "modified", "two": "removed"}
+
+
+class TestCompressedPrompts:
+    """Tests for keeping loaded prompts compressed."""
+    
+    def test_load_compressed(self, tmp_path):
+        from lia_workflow_mcp.compression import CompressedPrompt, PromptStore
+        
+        shared = "## Workflow Mode System\nCollaboration or silent.\n"
+        for name in ("one", "two"):
+            spec_file = tmp_path / "development" / f"{name}.toml"
+            spec_file.parent.mkdir(exist_ok=True)
+            spec_file.write_text(
+                f'description = "{name}"\nprompt = """\n# {name}\n{shared}### 1. Plan\nPlan it.\n"""\n'
+            )
+        plain = SpecCollection()
+        plain.load_from_directory(tmp_path)
+        compressed = SpecCollection(prompt_store=PromptStore())
+        compressed.load_from_directory(tmp_path)
+        
+        for spec in compressed.specs:
+            assert isinstance(spec._prompt.body, CompressedPrompt)
+            other = plain.get_by_name(spec.name)
+            assert spec == other
+            assert spec.prompt == other.prompt
+            assert spec.sections == other.sections
+        assert compressed.prompt_store.stats()["prompts"] == 2
+        
+        cursor = compressed.changes.cursor(compressed.generation)
+        (tmp_path / "development" / "one.toml").write_text('prompt = "changed"\n')
+        compressed.reload_paths([tmp_path / "development" / "one.toml"])
+        assert compressed.get_by_name("one").prompt == "changed"
+        assert compressed.changes.since(cursor) == {"one": "modified"}
+
+
+class TestSharedSections:
+    """Tests for holding loaded prompts as shared sections."""
+    
+    def test_load_shared_sections(self, tmp_path):
+        from lia_workflow_mcp.sections import SectionPrompt, SectionStore
+        
+        shared = "## Workflow Mode System\nCollaboration or silent.\n"
+        for name in ("one", "two"):
+            spec_file = tmp_path / "development" / f"{name}.toml"
+            spec_file.parent.mkdir(exist_ok=True)
+            spec_file.write_text(f'prompt = """\n# {name}\n{shared}"""\n')
+        collection = SpecCollection(section_store=SectionStore())
+        collection.load_from_directory(tmp_path)
+        
+        one, two = (collection.get_by_name(name) for name in ("one", "two"))
+        assert isinstance(one._prompt.body, SectionPrompt)
+        assert one.prompt == f"# one\n{shared}"
+        assert one._prompt.body.parts[-1] is two._prompt.body.parts[-1]
+        assert len(collection.section_store) == 3
+        
+        (tmp_path / "development" / "one.toml").unlink()
+        collection.reload_paths([tmp_path / "development" / "one.toml"])
+        assert len(collection.section_store) == 2
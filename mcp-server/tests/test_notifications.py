@@ -0,0 +1,65 @@
+"""
+Tests for the notifications module.
+"""
+
+import asyncio
+
+from lia_workflow_mcp.notifications import ResourceNotifier
+
+
+class FakeSession:
+    """Records notifications sent to it."""
+
+    def __init__(self, fail: bool = False):
+        self.updated = []
+        self.list_changed = 0
+        self.fail = fail
+
+    async def send_resource_updated(self, uri):
+        if self.fail:
+            raise ConnectionError("closed")
+        self.updated.append(str(uri))
+
+    async def send_resource_list_changed(self):
+        self.list_changed += 1
+
+
+class TestResourceNotifier:
+    """Tests for ResourceNotifier."""
+
+    def test_diff(self):
+        notifier = ResourceNotifier()
+        assert notifier.diff({"specs://a": "1"}) == (set(), False)
+        assert notifier.diff({"specs://a": "1"}) == (set(), False)
+        assert notifier.diff({"specs://a": "2"}) == ({"specs://a"}, False)
+        assert notifier.diff({"specs://a": "2", "specs://b": "1"}) == (set(), True)
+        assert notifier.diff({"specs://b": "1"}) == ({"specs://a"}, True)
+
+    def test_publish_only_changed_subscriptions(self):
+        notifier = ResourceNotifier()
+        session = FakeSession()
+        other = FakeSession()
+        notifier.subscribe("specs://a", session)
+        notifier.subscribe("specs://b", other)
+        notifier.diff({"specs://a": "1", "specs://b": "1"})
+
+        sent = asyncio.run(notifier.publish({"specs://a": "2", "specs://b": "1"}))
+        assert sent == {"specs://a"}
+        assert session.updated == ["specs://a"]
+        assert other.updated == []
+        assert session.list_changed == other.list_changed == 0
+
+        asyncio.run(notifier.publish({"specs://a": "2", "specs://b": "1", "specs://c": "1"}))
+        assert session.list_changed == other.list_changed == 1
+
+        notifier.unsubscribe("specs://a", session)
+        assert asyncio.run(notifier.publish({"specs://a": "3", "specs://b": "1", "specs://c": "1"})) == set()
+
+    def test_failed_session_is_dropped(self):
+        notifier = ResourceNotifier()
+        session = FakeSession(fail=True)
+        notifier.subscribe("specs://a", session)
+        notifier.diff({"specs://a": "1"})
+        assert notifier.stats()["subscriptions"] == 1
+        assert asyncio.run(notifier.publish({"specs://a": "2"})) == set()
+        assert notifier.stats()["subscriptions"] == 0
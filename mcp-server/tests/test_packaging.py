@@ -0,0 +1,28 @@
+"""
+Tests for the distribution's package layout.
+"""
+
+import re
+from pathlib import Path
+
+import tomli
+
+ROOT = Path(__file__).parent.parent
+
+
+def test_imported_packages_are_shipped():
+    """Test every first-party package the servers import is built into the wheel."""
+    with open(ROOT / "pyproject.toml", "rb") as f:
+        config = tomli.load(f)
+    hatch = config["tool"]["hatch"]["build"]["targets"]
+    shipped = {Path(p).name for p in hatch["wheel"]["packages"]}
+    assert shipped == {Path(p).name for p in hatch["sdist"]["include"]}
+    
+    first_party = {p.name for p in (ROOT / "src").iterdir() if (p / "__init__.py").exists()}
+    for package in shipped:
+        for module in (ROOT / "src" / package).glob("*.py"):
+            imported = set(re.findall(r"^(?:from|import) (\w+)", module.read_text(), re.MULTILINE))
+            assert imported & first_party <= shipped, module
+    
+    scripts = config["project"]["scripts"].values()
+    assert {script.split(".")[0] for script in scripts} == shipped
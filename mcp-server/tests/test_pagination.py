@@ -0,0 +1,60 @@
+"""
+Tests for the pagination module.
+"""
+
+import pytest
+
+from lia_workflow_mcp.pagination import Paginator, decode_cursor, encode_cursor, normalise_limit
+
+
+def identity(item):
+    return item
+
+
+class TestPaginator:
+    """Tests for Paginator."""
+
+    def test_pages_cover_listing(self):
+        paginator = Paginator(page_size=2)
+        items = ["c", "a", "e", "b", "d"]
+        pages, cursor = [], None
+        while True:
+            page, cursor = paginator.page("letters", 1, lambda: items, identity, cursor)
+            pages.append(page)
+            if cursor is None:
+                break
+        assert pages == [["a", "b"], ["c", "d"], ["e"]]
+
+    def test_snapshot_is_stable_across_generations(self):
+        paginator = Paginator(page_size=2)
+        page, cursor = paginator.page("letters", 1, lambda: ["a", "b", "c", "d"], identity)
+        assert page == ["a", "b"]
+
+        # A reload removed "c"; the iteration continues on the old snapshot
+        page, cursor = paginator.page("letters", 2, lambda: ["a", "b", "d"], identity, cursor)
+        assert page == ["c", "d"]
+        assert cursor is None
+
+    def test_resumes_after_last_key_when_snapshot_evicted(self):
+        paginator = Paginator(page_size=2, max_snapshots=1)
+        _page, cursor = paginator.page("letters", 1, lambda: ["a", "b", "c", "d"], identity)
+        paginator.page("other", 1, lambda: ["x"], identity)
+
+        page, _cursor = paginator.page("letters", 2, lambda: ["a", "b", "bb", "d"], identity, cursor)
+        assert page == ["bb", "d"]
+
+    def test_invalid_cursors(self):
+        paginator = Paginator()
+        with pytest.raises(ValueError):
+            paginator.page("letters", 1, lambda: [], identity, "not a cursor")
+        with pytest.raises(ValueError):
+            paginator.page("letters", 1, lambda: [], identity, encode_cursor("other", 1, 0, ""))
+
+    def test_cursor_round_trip(self):
+        assert decode_cursor(encode_cursor("search:x", 3, 10, "dev")) == ("search:x", 3, 10, "dev")
+
+    def test_normalise_limit(self):
+        assert normalise_limit(None) == 100
+        assert normalise_limit(5000) == 1000
+        with pytest.raises(ValueError):
+            normalise_limit(0)
@@ -0,0 +1,117 @@
+"""
+Tests for the sections module.
+"""
+
+from lia_workflow_mcp.compression import PromptStore
+from lia_workflow_mcp.sections import (
+    SectionStore,
+    dedupe_sections,
+    estimate_tokens,
+    fit_sections,
+    split_sections,
+)
+
+PROMPT = """Intro line
+# Goal
+Ship it.
+## Phase 1
+Plan.
+#### Detail
+Stays in Phase 1.
+```markdown
+# Notepad heading inside a fence
+```
+## Phase 2
+Build.
+"""
+
+
+class TestSplitSections:
+    """Tests for split_sections."""
+
+    def test_round_trip_and_titles(self):
+        sections = split_sections(PROMPT)
+        assert "".join(s.text for s in sections) == PROMPT
+        assert [(s.title, s.level) for s in sections] == [
+            ("", 0), ("Goal", 1), ("Phase 1", 2), ("Phase 2", 2),
+        ]
+        assert "Notepad heading" in sections[2].text
+
+    def test_no_headings(self):
+        assert [s.text for s in split_sections("plain")] == ["plain"]
+        assert split_sections("") == []
+
+
+class TestDedupeSections:
+    """Tests for dedupe_sections."""
+
+    def test_shared_sections_sent_once(self):
+        shared_block = "## Modes\nCollaboration or silent.\n"
+        prompts = {
+            "one": "# One\nFirst.\n" + shared_block,
+            "two": "# Two\nSecond.\n" + shared_block,
+        }
+        parts, shared = dedupe_sections(prompts)
+
+        assert list(shared.values()) == [shared_block]
+        for name, prompt in prompts.items():
+            text = "".join(
+                part if isinstance(part, str) else shared[part["ref"]]
+                for part in parts[name]
+            )
+            assert text == prompt
+        assert parts["one"][0] == "# One\nFirst.\n"
+
+
+class TestFitSections:
+    """Tests for token estimates and budgeted section selection."""
+
+    def test_estimate_tokens(self):
+        assert estimate_tokens("") == 0
+        assert estimate_tokens("Ship it.") == 3
+        assert estimate_tokens("internationalisation") == 3
+
+    def test_priority_order(self):
+        prompt = (
+            "## Goal\nShip it.\n"
+            "## 1. Plan\nPlan the work carefully.\n"
+            "## 2. Build\nBuild the thing.\n"
+            "## Workflow Diagram\nA --> B --> C --> D\n"
+        )
+        sections = split_sections(prompt)
+        goal, plan, build, diagram = (s.tokens for s in sections)
+
+        text, omitted = fit_sections(sections, goal + build, phase=2)
+        assert text == "## Goal\nShip it.\n## 2. Build\nBuild the thing.\n"
+        assert omitted == ["1. Plan", "Workflow Diagram"]
+
+        text, omitted = fit_sections(sections, goal + plan + build)
+        assert "Diagram" not in text
+        assert omitted == ["Workflow Diagram"]
+
+        assert fit_sections(sections, 10_000) == (prompt, [])
+
+
+class TestSectionStore:
+    """Tests for SectionStore."""
+
+    def test_shared_sections_stored_once(self):
+        shared_block = "## Modes\nCollaboration or silent.\n"
+        store = SectionStore()
+        one = store.put(split_sections("# One\n" + shared_block))
+        two = store.put(split_sections("# Two\n" + shared_block))
+
+        assert one.text() == "# One\n" + shared_block
+        assert one.digests[1] is two.digests[1]
+        assert one.parts[1] is two.parts[1]
+        assert len(store) == 3
+        assert store.stats()["stored_chars"] < store.stats()["referenced_chars"]
+
+        store.retain([two])
+        assert len(store) == 2
+        assert one.text() == "# One\n" + shared_block
+
+    def test_compressed_sections(self):
+        store = SectionStore(PromptStore())
+        prompt = store.put(split_sections(PROMPT))
+        assert prompt.text() == PROMPT
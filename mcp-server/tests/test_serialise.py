@@ -0,0 +1,68 @@
+"""
+Tests for the serialise module.
+"""
+
+import json
+
+import pytest
+
+from lia_workflow_mcp.serialise import (
+    FragmentCache,
+    encode,
+    json_array,
+    json_object,
+    normalise_fields,
+    project,
+)
+
+
+class TestFragmentAssembly:
+    """Tests for assembling JSON from pre-encoded fragments."""
+
+    ITEMS = [{"name": "a", "tags": ["x", "y"]}, {"name": "b", "tags": []}]
+
+    def test_array_matches_json_dumps(self):
+        fragments = [encode(item, level=1) for item in self.ITEMS]
+        assert json_array(fragments) == json.dumps(self.ITEMS, indent=2)
+
+    def test_compact_array(self):
+        fragments = [encode(item, compact=True) for item in self.ITEMS]
+        assert json_array(fragments, compact=True) == json.dumps(self.ITEMS, separators=(",", ":"))
+
+    def test_nested_object_matches_json_dumps(self):
+        specs = json_array((encode(item, level=2) for item in self.ITEMS), level=1)
+        text = json_object([("total", encode(2)), ("specs", specs)])
+        assert text == json.dumps({"total": 2, "specs": self.ITEMS}, indent=2)
+
+    def test_empty(self):
+        assert json_array([]) == "[]"
+        assert json_object([]) == "{}"
+
+
+class TestProjection:
+    """Tests for field projection."""
+
+    def test_project(self):
+        data = {"name": "a", "category": "dev", "path": "p"}
+        assert project(data, ("path", "name", "missing")) == {"path": "p", "name": "a"}
+        assert project(data, None) is data
+
+    def test_normalise_fields(self):
+        assert normalise_fields(None) is None
+        assert normalise_fields(["name", "path"]) == ("name", "path")
+        assert normalise_fields("name, path") == ("name", "path")
+        with pytest.raises(ValueError):
+            normalise_fields([1, 2])
+
+
+class TestFragmentCache:
+    """Tests for per-object fragment caching."""
+
+    def test_projections_are_bounded(self):
+        cache = FragmentCache()
+        data = {"name": "a", "path": "p"}
+        default = cache.get(lambda: data, None, False, 0)
+        for i in range(FragmentCache.MAX_ENTRIES * 2):
+            cache.get(lambda: data, ("name", f"extra-{i}"), False, 0)
+            assert cache.get(lambda: data, None, False, 0) is default
+        assert len(cache._fragments) == FragmentCache.MAX_ENTRIES
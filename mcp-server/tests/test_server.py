@@ -29,7 +29,7 @@ class TestValidateSpecContent:
             filepath=Path("/tmp/test.toml"),
             category=SpecCategory.DEVELOPMENT,
             description="Test workflow",
-            prompt="""
+            body="""
 # Test Workflow
 
 ## Workflow Mode System
@@ -70,7 +70,7 @@ Template here.
             filepath=Path("/tmp/test.toml"),
             category=SpecCategory.DEVELOPMENT,
             description="Test workflow",
-            prompt="Minimal prompt without required sections",
+            body="Minimal prompt without required sections",
         )
         
         result = validate_spec_content(spec)
@@ -84,7 +84,7 @@ Template here.
             filepath=Path("/tmp/test.toml"),
             category=SpecCategory.DEVELOPMENT,
             description="Test workflow",
-            prompt="""
+            body="""
 ## Workflow Mode System
 ## Goal
 <workflow-definition></workflow-definition>
@@ -107,7 +107,7 @@ class TestCompareSpecs:
             filepath=Path("/tmp/dev.toml"),
             category=SpecCategory.DEVELOPMENT,
             description="Development workflow for implementing features",
-            prompt="Prompt 1",
+            body="Prompt 1",
             phases=[
                 WorkflowPhase(number=1, name="Planning", description=""),
                 WorkflowPhase(number=2, name="Implementation", description=""),
@@ -121,7 +121,7 @@ class TestCompareSpecs:
             filepath=Path("/tmp/review.toml"),
             category=SpecCategory.QUALITY,
             description="Code review workflow for quality assessment",
-            prompt="Prompt 2",
+            body="Prompt 2",
             phases=[
                 WorkflowPhase(number=1, name="Context", description=""),
                 WorkflowPhase(number=2, name="Review", description=""),
@@ -160,7 +160,7 @@ class TestGenerateQuickReference:
                     filepath=Path("/tmp/dev.toml"),
                     category=SpecCategory.DEVELOPMENT,
                     description="Test development workflow",
-                    prompt="Prompt",
+                    body="Prompt",
                     tags=["development"],
                 ),
             ]
@@ -173,3 +173,444 @@ class TestGenerateQuickReference:
         finally:
             # Restore original specs
             spec_collection.specs = original_specs
+
+
+class TestResourceCache:
+    """Tests for cached resource responses."""
+    
+    def test_index_cached_per_generation(self):
+        """Test the index is serialised once until the collection changes."""
+        from lia_workflow_mcp.server import spec_collection, read_resource
+        
+        original_specs = spec_collection.specs
+        
+        try:
+            spec_collection.specs = [
+                WorkflowSpec(
+                    name="cached",
+                    filename="cached.toml",
+                    filepath=Path("/tmp/cached.toml"),
+                    category=SpecCategory.DEVELOPMENT,
+                    description="Cached workflow",
+                    body="Prompt",
+                ),
+            ]
+            
+            first = asyncio.run(read_resource("specs://index")).text
+            second = asyncio.run(read_resource("specs://index")).text
+            assert first is second
+            assert '"cached"' in first
+            
+            spec_collection.specs = []
+            third = asyncio.run(read_resource("specs://index")).text
+            assert '"total_specs": 0' in third
+        finally:
+            spec_collection.specs = original_specs
+
+    def test_listings_built_once_per_generation(self):
+        """Test resource, prompt and tool listings are reused."""
+        from lia_workflow_mcp.server import (
+            spec_collection, list_resources, list_prompts, list_tools,
+        )
+        
+        original_specs = spec_collection.specs
+        
+        try:
+            spec_collection.specs = []
+            resources = asyncio.run(list_resources())
+            assert asyncio.run(list_resources())[0] is resources[0]
+            assert asyncio.run(list_tools())[0] is asyncio.run(list_tools())[0]
+            assert asyncio.run(list_prompts()) == asyncio.run(list_prompts())
+            
+            spec_collection.specs = [
+                WorkflowSpec(
+                    name="listed",
+                    filename="listed.toml",
+                    filepath=Path("/tmp/listed.toml"),
+                    category=SpecCategory.QUALITY,
+                    description="Listed workflow",
+                    body="Prompt",
+                ),
+            ]
+            uris = [str(r.uri) for r in asyncio.run(list_resources())]
+            assert "specs://quality/listed" in uris
+            names = [p.name for p in asyncio.run(list_prompts())]
+            assert "start-listed" in names
+        finally:
+            spec_collection.specs = original_specs
+
+
+class TestToolCache:
+    """Tests for memoised tool results."""
+    
+    def test_cacheable_tool_results_reused(self):
+        """Test repeated calls are served from the cache until a reload."""
+        from lia_workflow_mcp.server import spec_collection, call_tool, get_cache_stats
+        
+        original_specs = spec_collection.specs
+        
+        try:
+            spec_collection.specs = [
+                WorkflowSpec(
+                    name="memo",
+                    filename="memo.toml",
+                    filepath=Path("/tmp/memo.toml"),
+                    category=SpecCategory.DEVELOPMENT,
+                    description="Memoised workflow",
+                    body="Prompt",
+                    phases=[WorkflowPhase(number=1, name="Plan", description="")],
+                ),
+            ]
+            
+            first = asyncio.run(call_tool("get_workflow_phases", {"spec_name": "memo"}))
+            second = asyncio.run(call_tool("get_workflow_phases", {"spec_name": "memo"}))
+            assert first[0] is second[0]
+            assert get_cache_stats()["tools"]["by_tool"]["get_workflow_phases"]["hits"] >= 1
+            
+            spec_collection.specs = []
+            third = asyncio.run(call_tool("get_workflow_phases", {"spec_name": "memo"}))
+            assert "not found" in third[0].text
+        finally:
+            spec_collection.specs = original_specs
+    
+    def test_uncached_tool(self):
+        """Test tools outside the opt-in list bypass the cache."""
+        from lia_workflow_mcp.server import CACHEABLE_TOOLS
+        
+        assert "get_cache_stats" not in CACHEABLE_TOOLS
+        assert "get_spec_prompt" not in CACHEABLE_TOOLS
+
+
+class TestResourceNotifications:
+    """Tests for subscription notifications after spec changes."""
+    
+    def test_only_changed_resources_notified(self, tmp_path):
+        """Test an edit notifies the edited spec and derived resources only."""
+        from lia_workflow_mcp import server
+        from lia_workflow_mcp.models import SpecCollection
+        from lia_workflow_mcp.notifications import ResourceNotifier
+        from tests.test_notifications import FakeSession
+        
+        (tmp_path / "development").mkdir()
+        one = tmp_path / "development" / "one.toml"
+        two = tmp_path / "development" / "two.toml"
+        one.write_text('description = "One"\nprompt = "x"\n')
+        two.write_text('description = "Two"\nprompt = "y"\n')
+        
+        collection = SpecCollection()
+        collection.load_from_directory(tmp_path)
+        notifier = ResourceNotifier()
+        session = FakeSession()
+        
+        with patch.object(server, "spec_collection", collection), \
+                patch.object(server, "notifier", notifier):
+            server._listing_cache.clear()
+            server._resource_cache.clear()
+            for uri in server.resource_hashes():
+                notifier.subscribe(uri, session)
+            notifier.diff(server.resource_hashes())
+            
+            one.write_text('description = "One"\nprompt = "edited"\n')
+            asyncio.run(server.apply_spec_changes({one}))
+            assert "specs://development/one" in session.updated
+            assert "specs://summary" not in session.updated
+            assert "specs://categories" not in session.updated
+            
+            two.write_text('description = "Two, edited"\nprompt = "y"\n')
+            session.updated.clear()
+            asyncio.run(server.apply_spec_changes({two}))
+            assert "specs://development/two/metadata" in session.updated
+            assert "specs://index" in session.updated
+            assert "specs://development/two" not in session.updated
+            assert "specs://development/one" not in session.updated
+            assert session.list_changed == 0
+            
+            two.unlink()
+            asyncio.run(server.apply_spec_changes({two}))
+            assert session.list_changed == 1
+
+    def test_trigger_reload_refreshes_chains(self, tmp_path, monkeypatch):
+        """Test cached chain output changes when only the trigger definitions do."""
+        import lia_workflow_mcp.server as server
+        from lia_workflow_mcp.triggers import TriggerManager
+
+        (tmp_path / "_common").mkdir()
+        triggers_file = tmp_path / "_common" / "workflow-triggers.toml"
+        triggers_file.write_text('[triggers.spec]\non_complete = ["dev"]\n')
+        monkeypatch.setenv("LIA_SPECS_DIR", str(tmp_path))
+
+        with patch.object(server, "trigger_manager", TriggerManager(tmp_path)):
+            server._tool_cache.clear()
+            args = {"start_workflow": "spec"}
+            before = asyncio.run(server.call_tool("get_workflow_chain", args))[0].text
+            assert "spec → dev" in before
+
+            triggers_file.write_text('[triggers.spec]\non_complete = ["test"]\n')
+            asyncio.run(server.apply_spec_changes({triggers_file}))
+            after = asyncio.run(server.call_tool("get_workflow_chain", args))[0].text
+            assert "spec → test" in after
+
+    def test_conditional_reads(self):
+        """Test listings carry content hashes that conditional reads accept."""
+        from lia_workflow_mcp.server import spec_collection, list_resources, read_resource, call_tool
+        
+        original_specs = spec_collection.specs
+        
+        try:
+            spec_collection.specs = [
+                WorkflowSpec(
+                    name="hashed",
+                    filename="hashed.toml",
+                    filepath=Path("/tmp/hashed.toml"),
+                    category=SpecCategory.DEVELOPMENT,
+                    description="Hashed workflow",
+                    body="A long prompt",
+                ),
+            ]
+            spec = spec_collection.specs[0]
+            resources = {str(r.uri): r for r in asyncio.run(list_resources())}
+            digest = resources["specs://development/hashed"].meta["content_hash"]
+            assert digest == spec.content_hash
+            
+            index = asyncio.run(read_resource("specs://index")).text
+            assert f'"content_hash": "{digest}"' in index
+            
+            uri = f"specs://development/hashed?if_none_match={digest}"
+            assert '"not_modified":true' in asyncio.run(read_resource(uri)).text
+            stale = asyncio.run(read_resource("specs://development/hashed?if_none_match=old"))
+            assert stale.text == "A long prompt"
+            
+            result = asyncio.run(call_tool(
+                "get_spec_prompt", {"spec_name": "hashed", "if_none_match": digest}
+            ))
+            assert '"not_modified":true' in result[0].text
+        finally:
+            spec_collection.specs = original_specs
+
+
+class TestChangesSince:
+    """Tests for incremental catalogue sync."""
+    
+    def test_changes_since(self):
+        """Test a cursor returns only later changes."""
+        from lia_workflow_mcp.server import spec_collection, changes_since
+        
+        original_specs = spec_collection.specs
+        
+        def make(name, prompt):
+            return WorkflowSpec(
+                name=name,
+                filename=f"{name}.toml",
+                filepath=Path(f"/tmp/{name}.toml"),
+                category=SpecCategory.RESEARCH,
+                description=f"{name} workflow",
+                body=prompt,
+            )
+        
+        try:
+            kept = make("kept", "Prompt")
+            spec_collection.specs = [kept, make("dropped", "Prompt")]
+            full = changes_since(None)
+            assert full["reset"]
+            assert {s["name"] for s in full["added"]} == {"kept", "dropped"}
+            
+            spec_collection.specs = [kept, make("new", "Prompt")]
+            delta = changes_since(full["cursor"])
+            assert not delta["reset"]
+            assert [s["name"] for s in delta["added"]] == ["new"]
+            assert delta["removed"] == ["dropped"]
+            assert delta["modified"] == []
+            assert changes_since(delta["cursor"])["added"] == []
+        finally:
+            spec_collection.specs = original_specs
+
+
+class TestPagination:
+    """Tests for paginated listings and tool results."""
+    
+    def test_resource_pages_and_tool_limit(self):
+        """Test resources are paged by URI and tools accept limit/cursor."""
+        import json
+        from mcp.types import ListResourcesRequest, PaginatedRequestParams
+        from lia_workflow_mcp import server
+        
+        original_specs = server.spec_collection.specs
+        
+        try:
+            server.spec_collection.specs = [
+                WorkflowSpec(
+                    name=f"paged{i}",
+                    filename=f"paged{i}.toml",
+                    filepath=Path(f"/tmp/paged{i}.toml"),
+                    category=SpecCategory.KNOWLEDGE,
+                    description="Paged workflow",
+                    body="Prompt",
+                )
+                for i in range(5)
+            ]
+            
+            uris, cursor = [], None
+            with patch.object(server._paginator, "page_size", 4):
+                while True:
+                    params = PaginatedRequestParams(cursor=cursor) if cursor else None
+                    result = asyncio.run(server.list_resources_page(
+                        ListResourcesRequest(method="resources/list", params=params)
+                    ))
+                    assert len(result.resources) <= 4
+                    uris.extend(str(r.uri) for r in result.resources)
+                    cursor = result.nextCursor
+                    if cursor is None:
+                        break
+            assert uris == sorted(uris)
+            assert len(uris) == len(asyncio.run(server.list_resources()))
+            
+            args = {"category": "knowledge", "fields": ["name"], "compact": True, "limit": 3}
+            first = json.loads(asyncio.run(server.call_tool("list_specs_by_category", args))[0].text)
+            assert [s["name"] for s in first["specs"]] == ["paged0", "paged1", "paged2"]
+            args["cursor"] = first["next_cursor"]
+            second = json.loads(asyncio.run(server.call_tool("list_specs_by_category", args))[0].text)
+            assert [s["name"] for s in second["specs"]] == ["paged3", "paged4"]
+            assert second["next_cursor"] is None
+
+            args = {"category": "knowledge", "fields": [1, 2]}
+            invalid = asyncio.run(server.call_tool("list_specs_by_category", args))
+            assert invalid[0].text == "fields must be a list of field names"
+        finally:
+            server.spec_collection.specs = original_specs
+
+
+class TestBatchRead:
+    """Tests for reading several specs in one call."""
+    
+    def test_batch_read(self):
+        """Test a batch returns each spec once and reports missing names."""
+        from lia_workflow_mcp.server import spec_collection, batch_read
+        
+        original_specs = spec_collection.specs
+        shared = "## Modes\nCollaboration or silent.\n"
+        
+        try:
+            spec_collection.specs = [
+                WorkflowSpec(
+                    name=name,
+                    filename=f"{name}.toml",
+                    filepath=Path(f"/tmp/{name}.toml"),
+                    category=SpecCategory.DEVELOPMENT,
+                    description=f"{name} workflow",
+                    body=f"# {name}\n" + shared,
+                    phases=[WorkflowPhase(number=1, name="Plan", description="")],
+                )
+                for name in ("first", "second")
+            ]
+            
+            result = batch_read(
+                ["first", "second", "first", "first.toml", "absent"], ["prompt", "phases"]
+            )
+            assert [entry["name"] for entry in result["specs"]] == ["first", "second"]
+            assert result["missing"] == ["absent"]
+            assert result["specs"][0]["prompt"].endswith(shared)
+            assert result["specs"][0]["phases"][0]["name"] == "Plan"
+            
+            deduped = batch_read(["first", "second"], ["prompt"], dedupe=True)
+            assert list(deduped["shared_sections"].values()) == [shared]
+            assert "prompt" not in deduped["specs"][0]
+            
+            with pytest.raises(ValueError):
+                batch_read(["first"], "prompt")
+        finally:
+            spec_collection.specs = original_specs
+
+
+class TestBudgetedPrompts:
+    """Tests for delivering starter prompts within a token budget."""
+    
+    def test_start_prompt_max_tokens(self):
+        """Test low-priority sections are dropped to fit the budget."""
+        from lia_workflow_mcp import server
+        from lia_workflow_mcp.sections import estimate_tokens
+        
+        original_specs = server.spec_collection.specs
+        prompt = (
+            "## Goal\nShip it.\n"
+            "## 1. Plan\nPlan the work.\n"
+            "## 2. Build\nBuild the thing.\n"
+            "## Workflow Diagram\n" + "A --> B\n" * 200
+        )
+        
+        try:
+            server.spec_collection.specs = [
+                WorkflowSpec(
+                    name="budget",
+                    filename="budget.toml",
+                    filepath=Path("/tmp/budget.toml"),
+                    category=SpecCategory.DEVELOPMENT,
+                    description="Budget workflow",
+                    body=prompt,
+                )
+            ]
+            
+            full = asyncio.run(server.get_prompt("start-budget", {"task": "t"}))
+            assert prompt in full[0].content.text
+            
+            result = asyncio.run(server.get_prompt(
+                "start-budget", {"task": "t", "max_tokens": "200", "phase": "2"},
+            ))
+            text = result[0].content.text
+            assert estimate_tokens(text) <= 200
+            assert "## 2. Build" in text
+            assert "A --> B" not in text
+            assert "Omitted to fit the token budget: Workflow Diagram" in text
+            assert "Start with Phase 2" in text
+            
+            for max_tokens in ("lots", "0", "-5"):
+                error = asyncio.run(server.get_prompt("start-budget", {"max_tokens": max_tokens}))
+                assert error[0].content.text.startswith("Error:")
+        finally:
+            server.spec_collection.specs = original_specs
+
+
+class TestPromptRendering:
+    """Tests for filling in placeholders in workflow prompts."""
+    
+    def test_start_prompt_rendered(self):
+        """Test task, task name and workspace placeholders are filled in."""
+        from lia_workflow_mcp import server
+        
+        original_specs = server.spec_collection.specs
+        try:
+            server.spec_collection.specs = [
+                WorkflowSpec(
+                    name="render",
+                    filename="render.toml",
+                    filepath=Path("/tmp/render.toml"),
+                    category=SpecCategory.DEVELOPMENT,
+                    description="Render workflow",
+                    body="Save to `.lia/{workflow}/{task_name}/` and read ${WORKSPACE}/docs.",
+                )
+            ]
+            
+            result = asyncio.run(server.get_prompt("start-render", {
+                "task": "t", "task_name": "login", "workspace": "/repo",
+            }))
+            text = result[0].content.text
+            assert "Save to `/repo/.lia/render/login/` and read /repo/docs." in text
+            
+            plain = asyncio.run(server.get_prompt("start-render", {"task": "t"}))
+            assert "`.lia/render/{task_name}/`" in plain[0].content.text
+        finally:
+            server.spec_collection.specs = original_specs
+
+
+class TestSimilarityTools:
+    """Tests for related and near-duplicate spec lookups."""
+    
+    def test_invalid_arguments(self):
+        """Test bad limits and thresholds return an error message."""
+        from lia_workflow_mcp.server import call_tool
+        
+        for limit in ("3", -1, True):
+            result = asyncio.run(call_tool("related_specs", {"spec_name": "dev", "limit": limit}))
+            assert result[0].text == "limit must be a positive integer"
+        for threshold in ("high", -0.1, 1.5):
+            result = asyncio.run(call_tool("find_near_duplicates", {"threshold": threshold}))
+            assert result[0].text == "threshold must be a number between 0 and 1"
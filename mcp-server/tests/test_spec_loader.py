@@ -101,6 +101,281 @@ class TestSpecLoader:
         assert len(by_category) > 0
         assert all(isinstance(v, list) for v in by_category.values())
 
+    def test_discover_skips_common(self, spec_loader, specs_dir):
+        """Test that shared bases are not treated as specs."""
+        if not specs_dir.exists():
+            pytest.skip("Specs directory not found")
+
+        specs = spec_loader.discover_specs()
+        assert not any("_common" in p.parts for p in specs)
+
+    def test_extends_base(self, tmp_path):
+        """Test that specs extending a base get its tables and phases."""
+        (tmp_path / "_common").mkdir()
+        (tmp_path / "_common" / "base.toml").write_text(
+            '[meta]\nversion = "2.0.0"\n\n'
+            '[config]\nresumable = true\n\n'
+            '[[phases]]\nname = "Plan"\n\n'
+            '[[phases]]\nname = "Execute"\n'
+        )
+        (tmp_path / "quality").mkdir()
+        spec_path = tmp_path / "quality" / "child.toml"
+        spec_path.write_text(
+            'extends = "base"\ndescription = "Child"\nprompt = "MUST do it"\n'
+        )
+
+        loader = SpecLoader(tmp_path)
+        assert loader.discover_specs() == [spec_path]
+
+        data = loader.load_spec(spec_path)
+        assert data["config"]["resumable"] is True
+
+        metadata = loader.extract_metadata(spec_path)
+        assert metadata.phases == ["Plan", "Execute"]
+        assert metadata.version == "2.0.0"
+
+    def test_missing_base_keeps_cache(self, tmp_path):
+        """Test that a spec extending a missing base does not clear the cache."""
+        (tmp_path / "quality").mkdir()
+        other = tmp_path / "quality" / "other.toml"
+        other.write_text('description = "Other"\nprompt = "x"\n')
+        spec_path = tmp_path / "quality" / "child.toml"
+        spec_path.write_text('extends = "base"\ndescription = "Child"\nprompt = "x"\n')
+
+        loader = SpecLoader(tmp_path)
+        loader.load_spec(other)
+        loader.load_spec(spec_path)
+        generation = loader.cache_stats()["generation"]
+        for _ in range(3):
+            assert loader.load_spec(spec_path)["description"] == "Child"
+        stats = loader.cache_stats()
+        assert stats["generation"] == generation
+        assert stats["entries"] == 2
+
+        # Creating the base is picked up on the next load
+        (tmp_path / "_common").mkdir()
+        (tmp_path / "_common" / "base.toml").write_text('[config]\nresumable = true\n')
+        assert loader.load_spec(spec_path)["config"]["resumable"] is True
+
+    def test_trigger_graph(self, spec_loader, specs_dir):
+        """Test the compiled trigger graph and its caching."""
+        if not (specs_dir / "_common" / "workflow-triggers.toml").exists():
+            pytest.skip("Trigger definitions not found")
+
+        graph = spec_loader.get_trigger_graph()
+        # Shared definitions fill in specs without their own [triggers] table
+        assert "dev" in graph.nodes["spec"].on_complete
+        # Per-spec tables take precedence
+        assert graph.nodes["learn"].provides == ["competency_assessment", "learning_portfolio"]
+
+        chain = graph.walk("research", 2)
+        assert [(level, node.name) for level, node in chain][:2] == [(0, "research"), (1, "spec")]
+
+        assert spec_loader.get_trigger_graph() is graph
+        spec_loader.clear_cache()
+        assert spec_loader.get_trigger_graph() is not graph
+
+    def test_trigger_graph_reused_beyond_cache_size(self, tmp_path):
+        """Test that an unchanged graph is served without re-parsing the specs."""
+        (tmp_path / "development").mkdir()
+        paths = [tmp_path / "development" / f"spec-{i}.toml" for i in range(6)]
+        for i, path in enumerate(paths):
+            path.write_text(f'prompt = "x"\n\n[triggers]\non_complete = ["spec-{i + 1}"]\n')
+        loader = SpecLoader(tmp_path, cache_size=2)
+        parsed = []
+        parse = loader._parse_file
+        loader._parse_file = lambda path: parsed.append(path) or parse(path)
+
+        graph = loader.get_trigger_graph()
+        assert len(parsed) == len(paths)
+        parsed.clear()
+        assert loader.get_trigger_graph() is graph
+        assert parsed == []
+
+        paths[0].write_text('prompt = "x"\n\n[triggers]\non_complete = ["spec-5"]\n')
+        assert loader.get_trigger_graph().nodes["spec-0"].on_complete == ["spec-5"]
+
+    def test_similarity_index_reused_beyond_cache_size(self, tmp_path):
+        """Test that an unchanged similarity index is served without re-parsing."""
+        (tmp_path / "development").mkdir()
+        paths = [tmp_path / "development" / f"spec-{i}.toml" for i in range(6)]
+        for i, path in enumerate(paths):
+            path.write_text(f'prompt = "Plan the work, then build part {i} of the thing."\n')
+        loader = SpecLoader(tmp_path, cache_size=2)
+        parsed = []
+        parse = loader._parse_file
+        loader._parse_file = lambda path: parsed.append(path) or parse(path)
+
+        index = loader.get_similarity_index()
+        assert len(parsed) == len(paths)
+        parsed.clear()
+        assert loader.get_similarity_index() is index
+        assert parsed == []
+
+        paths[0].unlink()
+        assert "spec-0" not in [name for name, _ in loader.get_similarity_index().related("spec-1", 10)]
+
+    def test_corpus_scans_keep_cache(self, tmp_path):
+        """Test that rebuilding the graph and index does not evict cached specs."""
+        (tmp_path / "development").mkdir()
+        paths = [tmp_path / "development" / f"spec-{i}.toml" for i in range(6)]
+        for i, path in enumerate(paths):
+            path.write_text(f'prompt = "Build part {i}"\n')
+        loader = SpecLoader(tmp_path, cache_size=2)
+        loader.load_spec(paths[0])
+
+        for i in range(3):
+            paths[-1].write_text(f'prompt = "Build part {i}, edited"\n')
+            loader.get_trigger_graph()
+            loader.get_similarity_index()
+        stats = loader.cache_stats()
+        assert stats["evictions"] == 0
+        assert stats["entries"] == 1
+        assert loader.load_spec(paths[0]) is not None
+        assert loader.cache_stats()["hits"] == 1
+
+    def test_cache_picks_up_edits(self, tmp_path):
+        """Test that edited files are reparsed without clearing the cache."""
+        (tmp_path / "development").mkdir()
+        spec_path = tmp_path / "development" / "edit.toml"
+        spec_path.write_text('description = "Before"\nprompt = "x"\n')
+
+        loader = SpecLoader(tmp_path)
+        assert loader.load_spec(spec_path)["description"] == "Before"
+        assert loader.load_spec(spec_path)["description"] == "Before"
+        assert loader.cache_stats()["hits"] == 1
+
+        generation = loader.cache_stats()["generation"]
+        spec_path.write_text('description = "After, longer"\nprompt = "x"\n')
+        assert loader.load_spec(spec_path)["description"] == "After, longer"
+        assert loader.cache_stats()["generation"] > generation
+
+        spec_path.unlink()
+        assert loader.load_spec(spec_path) is None
+
+    def test_content_hash(self, tmp_path):
+        """Test that hashes follow content, not file stats."""
+        import os
+
+        spec_path = tmp_path / "hash.toml"
+        spec_path.write_text('prompt = "x"\n')
+        loader = SpecLoader(tmp_path)
+        digest = loader.content_hash(spec_path)
+        assert loader.extract_metadata(spec_path).content_hash == digest
+
+        os.utime(spec_path, ns=(1, 1))
+        assert loader.content_hash(spec_path) == digest
+        spec_path.write_text('prompt = "y"\n')
+        assert loader.content_hash(spec_path) != digest
+        spec_path.unlink()
+        assert loader.content_hash(spec_path) is None
+
+    def test_refresh_logs_changes(self, tmp_path):
+        """Test that refreshes record added, modified and removed specs."""
+        (tmp_path / "development").mkdir()
+        one = tmp_path / "development" / "one.toml"
+        one.write_text('description = "One"\nprompt = "x"\n')
+        loader = SpecLoader(tmp_path)
+        loader.refresh(force=True)
+        cursor = loader.change_cursor()
+
+        one.write_text('description = "One, edited"\nprompt = "x"\n')
+        (tmp_path / "development" / "two.toml").write_text('description = "Two"\nprompt = "y"\n')
+        loader.refresh(force=True)
+        assert loader.changes.since(cursor) == {"one": "modified", "two": "added"}
+
+    def test_refresh_parses_only_changed_specs(self, tmp_path):
+        """Test that refreshes beyond the cache size re-parse only edited specs."""
+        (tmp_path / "development").mkdir()
+        paths = [tmp_path / "development" / f"spec-{i}.toml" for i in range(4)]
+        for i, path in enumerate(paths):
+            path.write_text(f'description = "Spec {i}"\nprompt = "x"\n')
+        loader = SpecLoader(tmp_path, cache_size=2)
+        parsed = []
+        parse = loader._parse_file
+        loader._parse_file = lambda path: parsed.append(path) or parse(path)
+
+        loader.refresh(force=True)
+        cursor = loader.change_cursor()
+        parsed.clear()
+        loader.refresh(force=True)
+        assert parsed == []
+
+        paths[0].write_text('description = "Spec 0, edited"\nprompt = "x"\n')
+        loader.refresh(force=True)
+        assert parsed == [paths[0]]
+        assert loader.changes.since(cursor) == {"spec-0": "modified"}
+
+    def test_cursor_covers_edits_seen_by_loads(self, tmp_path):
+        """Test that an edit noticed by a load is not hidden behind a later cursor."""
+        (tmp_path / "development").mkdir()
+        one = tmp_path / "development" / "one.toml"
+        one.write_text('description = "One"\nprompt = "x"\n')
+        loader = SpecLoader(tmp_path)
+        loader.refresh(force=True)
+        start = loader.change_cursor()
+
+        one.write_text('description = "One, edited"\nprompt = "x"\n')
+        loader.extract_metadata(one)
+        cursor = loader.change_cursor()
+        assert loader.changes.since(start) == {"one": "modified"}
+        assert loader.changes.since(cursor) == {}
+
+        one.write_text('description = "One, edited again"\nprompt = "x"\n')
+        loader.refresh(force=True)
+        assert loader.changes.since(cursor) == {"one": "modified"}
+
+    def test_cache_is_bounded(self, spec_loader, specs_dir):
+        """Test that the cache evicts beyond its entry limit."""
+        if not specs_dir.exists():
+            pytest.skip("Specs directory not found")
+
+        loader = SpecLoader(specs_dir, cache_size=2)
+        for spec_path in loader.discover_specs()[:4]:
+            loader.load_spec(spec_path)
+        stats = loader.cache_stats()
+        assert stats["entries"] <= 2
+        assert stats["evictions"] >= 1
+
+    def test_discovery_and_metadata_are_cached(self, tmp_path):
+        """Test cached discovery, name lookup and memoised metadata."""
+        (tmp_path / "quality").mkdir()
+        spec_path = tmp_path / "quality" / "one.toml"
+        spec_path.write_text('description = "One"\nprompt = "### 1. Start"\n')
+
+        loader = SpecLoader(tmp_path)
+        assert loader.discover_specs() == [spec_path]
+        assert loader.find_spec("one") == spec_path
+        assert loader.find_spec("one", "quality") == spec_path
+        assert loader.find_spec("one", "development") is None
+
+        metadata = loader.extract_metadata(spec_path)
+        assert loader.extract_metadata(spec_path) is metadata
+
+        # Adding a file changes the directory mtime and triggers a rescan
+        new_path = tmp_path / "quality" / "two.toml"
+        new_path.write_text('description = "Two"\nprompt = "x"\n')
+        assert loader.find_spec("two") == new_path
+
+        spec_path.write_text('description = "One"\nprompt = "### 1. Start\\n### 2. Finish"\n')
+        assert loader.extract_metadata(spec_path).phases == ["Start", "Finish"]
+
+    def test_catalogue_view(self, tmp_path):
+        """Test that catalogue views are rebuilt only after changes."""
+        (tmp_path / "quality").mkdir()
+        spec_path = tmp_path / "quality" / "one.toml"
+        spec_path.write_text('description = "One"\nprompt = "x"\n')
+
+        loader = SpecLoader(tmp_path, refresh_interval=0)
+        view = loader.get_catalogue_view()
+        assert '"one"' in view.category_json["quality"]
+        assert loader.get_catalogue_view() is view
+
+        spec_path.write_text('description = "Edited"\nprompt = "x"\n')
+        view = loader.get_catalogue_view()
+        assert '"Edited"' in view.catalogue_json
+        assert '"spec_count": 1' in view.categories_json
+
 
 class TestSpecMetadata:
     """Tests for SpecMetadata dataclass."""
@@ -0,0 +1,50 @@
+"""
+Tests for the template module.
+"""
+
+from lia_workflow_mcp.template import PromptRenderer, PromptTemplate
+
+PROMPT = (
+    "Work on {task}.\n"
+    "Write to `.lia/{workflow}/{task_name}/0-notepad.md`.\n"
+    "Read ${WORKSPACE}/docs/ and ./docs/.lia/ but not {date}.\n"
+)
+
+
+class TestPromptTemplate:
+    """Tests for PromptTemplate."""
+
+    def test_render(self):
+        template = PromptTemplate(PROMPT)
+        assert template.slot_names == {"task", "task_name", "workflow", "workspace", "lia_dir"}
+
+        rendered = template.render({
+            "task": "auth",
+            "task_name": "login-flow",
+            "workflow": "dev",
+            "workspace": "/work/",
+        })
+        assert rendered == (
+            "Work on auth.\n"
+            "Write to `/work/.lia/dev/login-flow/0-notepad.md`.\n"
+            "Read /work/docs/ and ./docs/.lia/ but not {date}.\n"
+        )
+
+    def test_missing_values_left_as_written(self):
+        template = PromptTemplate(PROMPT)
+        assert template.render({}) == PROMPT
+        assert template.render({"task_name": "x"}) == PROMPT.replace("{task_name}", "x")
+
+
+class TestPromptRenderer:
+    """Tests for PromptRenderer."""
+
+    def test_renders_cached(self):
+        renderer = PromptRenderer()
+        first = renderer.render(PROMPT, {"task": "auth", "workspace": ""})
+        assert renderer.render(PROMPT, {"task": "auth"}) is first
+        assert renderer.render(PROMPT, {"task": "other"}) != first
+
+        stats = renderer.stats()
+        assert stats["templates"]["entries"] == 1
+        assert stats["renders"]["hits"] == 1
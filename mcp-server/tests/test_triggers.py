@@ -0,0 +1,99 @@
+"""
+Tests for the triggers module.
+"""
+
+import pytest
+from pathlib import Path
+
+from lia_workflow_mcp.triggers import TriggerManager, WorkflowTrigger
+
+
+@pytest.fixture
+def trigger_manager():
+    """Create a trigger manager with a small, controlled trigger graph."""
+    manager = TriggerManager()
+    manager.triggers = {
+        "research": WorkflowTrigger(
+            name="research",
+            on_complete=["spec"],
+            typical_outputs=["research_findings"],
+        ),
+        "spec": WorkflowTrigger(
+            name="spec",
+            on_complete=["dev"],
+            can_chain_from=["research"],
+            typical_outputs=["requirements.md", "design.md"],
+        ),
+        "dev": WorkflowTrigger(
+            name="dev",
+            on_complete=["test"],
+            can_chain_from=["spec"],
+            typical_outputs=["implementation", "code"],
+        ),
+        "test": WorkflowTrigger(
+            name="test",
+            can_chain_from=["dev"],
+            typical_outputs=["test_suite", "coverage_report"],
+        ),
+        "docs": WorkflowTrigger(
+            name="docs",
+            typical_outputs=["documentation"],
+        ),
+    }
+    return manager
+
+
+class TestPlanForOutputs:
+    """Tests for goal-directed workflow planning."""
+
+    def test_plan_covers_all_outputs(self, trigger_manager):
+        plan = trigger_manager.plan_for_outputs(
+            ["requirements.md", "implementation", "test-suite"]
+        )
+        assert plan == ["spec", "dev", "test"]
+
+    def test_plan_single_workflow(self, trigger_manager):
+        plan = trigger_manager.plan_for_outputs(["design"])
+        assert plan == ["spec"]
+
+    def test_plan_with_start(self, trigger_manager):
+        plan = trigger_manager.plan_for_outputs(["code"], start="research")
+        assert plan == ["research", "spec", "dev"]
+
+    def test_plan_unreachable(self, trigger_manager):
+        # docs has no chaining edges, so it cannot join the spec → dev chain
+        plan = trigger_manager.plan_for_outputs(["implementation", "documentation"])
+        assert plan is None
+
+    def test_unknown_outputs(self, trigger_manager):
+        assert trigger_manager.plan_for_outputs(["deployment"]) is None
+        assert trigger_manager.unknown_outputs(["code", "deployment"]) == ["deployment"]
+
+    def test_plan_with_real_triggers(self):
+        specs_dir = Path(__file__).parent.parent.parent / "specs"
+        if not (specs_dir / "_common" / "workflow-triggers.toml").exists():
+            pytest.skip("Trigger definitions not found")
+
+        manager = TriggerManager(specs_dir)
+        plan = manager.plan_for_outputs(["requirements.md", "implementation", "test_suite"])
+        assert plan == ["spec", "dev", "test"]
+
+
+class TestReload:
+    """Tests for reloading trigger definitions."""
+
+    def test_reload_replaces_definitions(self, tmp_path):
+        common = tmp_path / "_common"
+        common.mkdir()
+        triggers_file = common / "workflow-triggers.toml"
+        triggers_file.write_text('[triggers.spec]\non_complete = ["dev"]\n')
+
+        manager = TriggerManager(tmp_path)
+        assert manager.get_suggested_next("spec") == ["dev"]
+
+        triggers_file.write_text('[triggers.spec]\non_complete = ["test"]\n')
+        generation = manager.generation
+        manager.reload(tmp_path)
+        assert manager.get_suggested_next("spec") == ["test"]
+        assert manager.generation == generation + 1
+
@@ -0,0 +1,46 @@
+"""
+Tests for the watcher module.
+"""
+
+import asyncio
+
+from lia_workflow_mcp.watcher import SpecWatcher
+
+
+class TestSpecWatcher:
+    """Tests for SpecWatcher."""
+
+    def test_check_reports_changes(self, tmp_path):
+        spec = tmp_path / "dev.toml"
+        spec.write_text('prompt = "a"\n')
+        watcher = SpecWatcher(tmp_path, lambda paths: None, force_polling=True)
+        assert watcher.check() == set()
+
+        spec.write_text('prompt = "changed"\n')
+        added = tmp_path / "new.toml"
+        added.write_text('prompt = "b"\n')
+        (tmp_path / "notes.txt").write_text("ignored")
+        assert watcher.check() == {spec, added}
+
+        spec.unlink()
+        assert watcher.check() == {spec}
+
+    def test_polling_debounces(self, tmp_path):
+        batches = []
+
+        async def scenario():
+            watcher = SpecWatcher(
+                tmp_path, batches.append, debounce=0.05, poll_interval=0.02, force_polling=True
+            )
+            watcher.start()
+            await asyncio.sleep(0.05)
+            for i in range(3):
+                (tmp_path / f"spec{i}.toml").write_text(f'prompt = "{i}"\n')
+                await asyncio.sleep(0.01)
+            await asyncio.sleep(0.3)
+            await watcher.stop()
+
+        asyncio.run(scenario())
+        changed = set().union(*batches)
+        assert {p.name for p in changed} == {"spec0.toml", "spec1.toml", "spec2.toml"}
+        assert len(batches) <= 2